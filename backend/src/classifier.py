@@ -0,0 +1,138 @@
+"""
+Tag Classifier
+Pure auto-tag rules, separated from database and network I/O
+
+classify_game evaluates one game; classify_library evaluates a whole library
+from parallel columns in one call, vectorized with NumPy when it is
+installed and as a plain loop otherwise. Both return integer tag codes
+(see TAG_BY_CODE).
+
+Tag priority:
+1. Mastered: >=85% achievements unlocked
+2. Completed: playtime >= main_story time from HLTB
+3. Dropped: Not played for over 1 year (only if not mastered/completed)
+4. In Progress: playtime >= threshold (default 30 min)
+"""
+
+import time
+from typing import Optional, Sequence, List
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; the pure-Python path covers everything
+    np = None
+
+ONE_YEAR_SECONDS = 365 * 24 * 60 * 60
+MASTERED_PERCENTAGE = 85
+
+# Tag codes
+TAG_SKIP = -1         # manual or hidden game: keep whatever tag it has
+TAG_NONE = 0          # no tag (backlog)
+TAG_COMPLETED = 1
+TAG_IN_PROGRESS = 2
+TAG_MASTERED = 3
+TAG_DROPPED = 4
+
+TAG_BY_CODE = {
+    TAG_NONE: None,
+    TAG_COMPLETED: "completed",
+    TAG_IN_PROGRESS: "in_progress",
+    TAG_MASTERED: "mastered",
+    TAG_DROPPED: "dropped",
+}
+CODE_BY_TAG = {tag: code for code, tag in TAG_BY_CODE.items()}
+
+
+def classify_game(playtime_minutes: float, unlocked_achievements: int, total_achievements: int,
+                  main_story: Optional[float], rt_last_time_played: Optional[int],
+                  in_progress_threshold: float, now: int) -> int:
+    """Tag code for a single game; missing values may be None"""
+    total_achievements = total_achievements or 0
+    if total_achievements > 0:
+        if ((unlocked_achievements or 0) / total_achievements) * 100 >= MASTERED_PERCENTAGE:
+            return TAG_MASTERED
+
+    playtime_minutes = playtime_minutes or 0
+
+    if main_story and playtime_minutes >= main_story * 60:
+        return TAG_COMPLETED
+
+    if rt_last_time_played and rt_last_time_played > 0:
+        if now - rt_last_time_played > ONE_YEAR_SECONDS:
+            return TAG_DROPPED
+
+    if playtime_minutes >= in_progress_threshold:
+        return TAG_IN_PROGRESS
+
+    return TAG_NONE
+
+
+def classify_library(playtime_minutes: Sequence, unlocked_achievements: Sequence,
+                     total_achievements: Sequence, main_story: Sequence,
+                     rt_last_time_played: Sequence, is_manual: Sequence, is_hidden: Sequence,
+                     in_progress_threshold: float = 30, now: Optional[int] = None,
+                     use_numpy: Optional[bool] = None) -> List[int]:
+    """Tag codes for many games given as parallel columns
+
+    Columns may contain None for missing values (no HLTB data, never played).
+    Manual and hidden games get TAG_SKIP.
+
+    use_numpy=None picks NumPy when it is installed and the columns are
+    already arrays. Converting Python lists costs about as much as the loop
+    itself, so lists go through the loop unless use_numpy=True.
+    """
+    if now is None:
+        now = int(time.time())
+
+    if use_numpy is None:
+        use_numpy = np is not None and isinstance(playtime_minutes, np.ndarray)
+    elif use_numpy and np is None:
+        raise RuntimeError("NumPy is not installed")
+
+    if use_numpy:
+        return _classify_numpy(playtime_minutes, unlocked_achievements, total_achievements,
+                               main_story, rt_last_time_played, is_manual, is_hidden,
+                               in_progress_threshold, now)
+
+    classify = classify_game
+    return [
+        TAG_SKIP if manual or hidden
+        else classify(playtime, unlocked, total, story, last_played, in_progress_threshold, now)
+        for playtime, unlocked, total, story, last_played, manual, hidden in zip(
+            playtime_minutes, unlocked_achievements, total_achievements,
+            main_story, rt_last_time_played, is_manual, is_hidden)
+    ]
+
+
+def _column(values: Sequence):
+    # None becomes NaN under a float dtype; treat it as 0 like the scalar rules do
+    return np.nan_to_num(np.asarray(values, dtype=np.float64), nan=0.0)
+
+
+def _classify_numpy(playtime_minutes, unlocked_achievements, total_achievements,
+                    main_story, rt_last_time_played, is_manual, is_hidden,
+                    in_progress_threshold, now) -> List[int]:
+    playtime = _column(playtime_minutes)
+    unlocked = _column(unlocked_achievements)
+    total = _column(total_achievements)
+    story = _column(main_story)
+    last_played = _column(rt_last_time_played)
+
+    # Same arithmetic as classify_game so results match bit for bit
+    with np.errstate(divide='ignore', invalid='ignore'):
+        percentage = np.where(total > 0, (unlocked / total) * 100, 0.0)
+
+    codes = np.select(
+        [
+            percentage >= MASTERED_PERCENTAGE,
+            (story != 0) & (playtime >= story * 60),
+            (last_played > 0) & (now - last_played > ONE_YEAR_SECONDS),
+            playtime >= in_progress_threshold,
+        ],
+        [TAG_MASTERED, TAG_COMPLETED, TAG_DROPPED, TAG_IN_PROGRESS],
+        default=TAG_NONE
+    ).astype(np.int8)
+
+    skip = np.asarray(is_manual, dtype=bool) | np.asarray(is_hidden, dtype=bool)
+    codes[skip] = TAG_SKIP
+    return codes.tolist()
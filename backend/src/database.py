@@ -1,42 +1,468 @@
 """
 Database module for Game Progress Tracker
 Handles SQLite operations for tags, cache, and settings
-Uses standard library sqlite3 with asyncio.to_thread for async operations
+Uses standard library sqlite3 in WAL mode with one dedicated writer thread
+and a small pool of read-only connections
 """
 
 import sqlite3
 import asyncio
+import threading
 import time
+import calendar
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Set, Tuple, Iterable
 
 # Use Decky's built-in logger
 import decky
 logger = decky.logger
 
+from records import TagRecord, StatsRecord, HLTBRecord, has_hltb_times
+from tag_cache import TagCache
+from plugin_settings import SettingsSnapshot, SETTING_DEFAULTS, encode_setting
 
-class Database:
-    def __init__(self, db_path: str):
-        self.db_path = db_path
-        self.connection: Optional[sqlite3.Connection] = None
 
-    def _connect_sync(self):
-        """Synchronous connection for use with to_thread"""
-        # check_same_thread=False allows connection to be used across threads
-        # This is safe because we serialize access through asyncio.to_thread
-        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+# SQL text is kept in module-level constants so every call reuses the same
+# string and hits sqlite3's per-connection statement cache
+SELECT_TAG_SQL = f"SELECT {TagRecord.COLUMNS} FROM game_tags WHERE appid = ?"
+SELECT_ALL_TAGS_SQL = f"SELECT {TagRecord.COLUMNS} FROM game_tags"
+SELECT_TAGS_IN_SQL = f"SELECT {TagRecord.COLUMNS} FROM game_tags WHERE appid IN ({{placeholders}})"
+
+SELECT_STATS_SQL = f"SELECT {StatsRecord.COLUMNS} FROM game_stats WHERE appid = ?"
+SELECT_STATS_IN_SQL = f"SELECT {StatsRecord.COLUMNS} FROM game_stats WHERE appid IN ({{placeholders}})"
+
+SELECT_HLTB_SQL = f"SELECT {HLTBRecord.COLUMNS} FROM hltb_cache WHERE appid = ?"
+SELECT_HLTB_IN_SQL = f"SELECT {HLTBRecord.COLUMNS} FROM hltb_cache WHERE appid IN ({{placeholders}})"
+
+# Entries with data whose cached_at is older than a cutoff (uses idx_hltb_cached_at)
+SELECT_HLTB_STALE_SQL = f"""
+    SELECT {HLTBRecord.COLUMNS} FROM hltb_cache
+    WHERE (cached_at < ? OR cached_at IS NULL)
+      AND (main_story IS NOT NULL OR main_extra IS NOT NULL
+           OR completionist IS NOT NULL OR all_styles IS NOT NULL)
+    ORDER BY cached_at
+    LIMIT ?
+"""
+
+DELETE_TAG_SQL = "DELETE FROM game_tags WHERE appid = ?"
+
+SELECT_ALL_SETTINGS_SQL = "SELECT key, value FROM settings"
+UPSERT_SETTING_SQL = """
+    INSERT INTO settings (key, value)
+    VALUES (?, ?)
+    ON CONFLICT(key) DO UPDATE SET value = excluded.value
+"""
+
+UPSERT_TAG_SQL = """
+    INSERT INTO game_tags (appid, tag, is_manual, last_updated)
+    VALUES (?, ?, ?, ?)
+    ON CONFLICT(appid) DO UPDATE SET
+        tag = excluded.tag,
+        is_manual = excluded.is_manual,
+        last_updated = excluded.last_updated
+"""
+
+UPSERT_HLTB_SQL = """
+    INSERT INTO hltb_cache (
+        appid, game_name, matched_name, similarity_score,
+        main_story, main_extra, completionist, all_styles,
+        hltb_url, cached_at, miss_count
+    )
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 0)
+    ON CONFLICT(appid) DO UPDATE SET
+        game_name = excluded.game_name,
+        matched_name = excluded.matched_name,
+        similarity_score = excluded.similarity_score,
+        main_story = excluded.main_story,
+        main_extra = excluded.main_extra,
+        completionist = excluded.completionist,
+        all_styles = excluded.all_styles,
+        hltb_url = excluded.hltb_url,
+        cached_at = excluded.cached_at,
+        miss_count = 0
+"""
+
+# A miss keeps any completion times already stored for the game
+RECORD_HLTB_MISS_SQL = """
+    INSERT INTO hltb_cache (appid, game_name, cached_at, miss_count)
+    VALUES (?, ?, ?, 1)
+    ON CONFLICT(appid) DO UPDATE SET
+        game_name = excluded.game_name,
+        cached_at = excluded.cached_at,
+        miss_count = hltb_cache.miss_count + 1
+"""
+
+# Offline HLTB dump, searched before the HLTB API (needs SQLite's FTS5 module).
+# Imports fill hltb_offline_import, which replaces hltb_offline once complete
+CREATE_HLTB_OFFLINE_SQL = """
+    CREATE VIRTUAL TABLE IF NOT EXISTS {table} USING fts5(
+        game_name,
+        game_id UNINDEXED,
+        comp_main UNINDEXED,
+        comp_plus UNINDEXED,
+        comp_100 UNINDEXED,
+        comp_all UNINDEXED,
+        release_world UNINDEXED,
+        tokenize = 'unicode61 remove_diacritics 2'
+    )
+"""
+INSERT_HLTB_OFFLINE_SQL = """
+    INSERT INTO hltb_offline_import (game_name, game_id, comp_main, comp_plus, comp_100, comp_all, release_world)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+SEARCH_HLTB_OFFLINE_SQL = """
+    SELECT game_name, game_id, comp_main, comp_plus, comp_100, comp_all, release_world
+    FROM hltb_offline
+    WHERE hltb_offline MATCH ?
+    ORDER BY rank
+    LIMIT ?
+"""
+HLTB_OFFLINE_COLUMNS = ("game_name", "game_id", "comp_main", "comp_plus", "comp_100", "comp_all", "release_world")
+
+UPSERT_STATS_SQL = """
+    INSERT INTO game_stats (
+        appid, game_name, playtime_minutes,
+        total_achievements, unlocked_achievements, is_hidden, rt_last_time_played, fingerprint, last_sync
+    )
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+    ON CONFLICT(appid) DO UPDATE SET
+        game_name = excluded.game_name,
+        playtime_minutes = excluded.playtime_minutes,
+        total_achievements = excluded.total_achievements,
+        unlocked_achievements = excluded.unlocked_achievements,
+        is_hidden = excluded.is_hidden,
+        rt_last_time_played = excluded.rt_last_time_played,
+        fingerprint = excluded.fingerprint,
+        last_sync = CURRENT_TIMESTAMP
+"""
+
+# Stored sync fingerprints with the state they are checked against: the HLTB
+# entry, the current tag, and whether the game is due to become dropped
+SELECT_SYNC_FINGERPRINTS_IN_SQL = """
+    SELECT gs.appid, gs.fingerprint,
+        hc.main_story, hc.main_extra, hc.completionist, hc.all_styles, hc.cached_at, hc.miss_count,
+        gt.tag, gt.is_manual,
+        gs.rt_last_time_played > 0 AND gs.rt_last_time_played < ?
+            AND (gs.is_hidden = 0 OR gs.is_hidden IS NULL)
+            AND (gt.is_manual = 0 OR gt.is_manual IS NULL)
+            AND (gt.tag IS NULL OR gt.tag = 'in_progress')
+    FROM game_stats gs
+    LEFT JOIN hltb_cache hc ON hc.appid = gs.appid
+    LEFT JOIN game_tags gt ON gt.appid = gs.appid
+    WHERE gs.fingerprint IS NOT NULL AND gs.appid IN ({placeholders})
+"""
+
+# Games the daily check moves to dropped: last played before a cutoff, not
+# hidden (NULL counts as visible), not manually tagged, and untagged or still
+# in progress. The IFNULL term matches idx_stats_visible_last_played's WHERE
+# clause, so the planner can use that partial index without ANALYZE
+# statistics, and it keeps idx_stats_hidden out of the running
+DROPPED_CANDIDATES_SQL = """
+    FROM game_stats gs
+    LEFT JOIN game_tags gt ON gt.appid = gs.appid
+    WHERE IFNULL(gs.is_hidden, 0) = 0
+        AND gs.rt_last_time_played > 0
+        AND gs.rt_last_time_played < ?
+        AND (gt.is_manual = 0 OR gt.is_manual IS NULL)
+        AND (gt.tag IS NULL OR gt.tag = 'in_progress')
+"""
+SELECT_DROPPED_CANDIDATES_SQL = "SELECT gs.appid" + DROPPED_CANDIDATES_SQL
+TAG_DROPPED_SQL = """
+    INSERT INTO game_tags (appid, tag, is_manual, last_updated)
+    SELECT gs.appid, 'dropped', 0, ?""" + DROPPED_CANDIDATES_SQL + """
+    ON CONFLICT(appid) DO UPDATE SET
+        tag = excluded.tag,
+        is_manual = 0,
+        last_updated = excluded.last_updated
+"""
+
+CREATE_SCHEDULER_JOBS_SQL = """
+    CREATE TABLE IF NOT EXISTS scheduler_jobs (
+        name TEXT PRIMARY KEY,
+        last_run INTEGER,
+        last_duration_ms REAL,
+        last_error TEXT,
+        run_count INTEGER DEFAULT 0,
+        failure_count INTEGER DEFAULT 0
+    )
+"""
+SELECT_JOB_RUNS_SQL = """
+    SELECT name, last_run, last_duration_ms, last_error, run_count, failure_count FROM scheduler_jobs
+"""
+RECORD_JOB_RUN_SQL = """
+    INSERT INTO scheduler_jobs (name, last_run, last_duration_ms, last_error, run_count, failure_count)
+    VALUES (?, ?, ?, ?, 1, ?)
+    ON CONFLICT(name) DO UPDATE SET
+        last_run = excluded.last_run,
+        last_duration_ms = excluded.last_duration_ms,
+        last_error = excluded.last_error,
+        run_count = run_count + 1,
+        failure_count = failure_count + excluded.failure_count
+"""
+JOB_RUN_COLUMNS = ("last_run", "last_duration_ms", "last_error", "run_count", "failure_count")
+
+# Per-game fields of the library snapshot model (see LibrarySnapshot)
+SELECT_LIBRARY_ROWS_SQL = """
+    SELECT gs.appid, gs.game_name, gs.is_hidden, hc.main_story
+    FROM game_stats gs
+    LEFT JOIN hltb_cache hc ON hc.appid = gs.appid
+"""
+SELECT_LIBRARY_ROWS_IN_SQL = SELECT_LIBRARY_ROWS_SQL + " WHERE gs.appid IN ({placeholders})"
+
+TAG_NAMES = ("completed", "in_progress", "mastered", "dropped")
+
+# Display order for tag lists: completed, mastered, in_progress, dropped, then anything else
+TAG_ORDER_SQL = """
+    CASE gt.tag
+        WHEN 'completed' THEN 0
+        WHEN 'mastered' THEN 1
+        WHEN 'in_progress' THEN 2
+        WHEN 'dropped' THEN 3
+        ELSE 99
+    END
+"""
+
+# Keep IN (...) lists well under SQLite's default host parameter limit (999)
+SQL_IN_CHUNK_SIZE = 500
+
+
+def _chunked(items: List[Any], size: int = SQL_IN_CHUNK_SIZE):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _tuple_cursor(conn: sqlite3.Connection) -> sqlite3.Cursor:
+    """Cursor returning plain tuples, for decoding into record classes"""
+    cursor = conn.cursor()
+    cursor.row_factory = None
+    return cursor
+
+
+def _select_in(cursor, sql: str, appids: List[str]) -> List[tuple]:
+    """Run a SELECT with an {placeholders} IN list once per chunk of appids"""
+    rows = []
+    for chunk in _chunked(appids):
+        cursor.execute(sql.format(placeholders=",".join("?" * len(chunk))), chunk)
+        rows.extend(cursor.fetchall())
+    return rows
+
+
+def _sql_timestamp() -> str:
+    """Current UTC time in SQLite CURRENT_TIMESTAMP format"""
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime())
+
+
+def _tag_records(tag_rows: List[Dict[str, Any]]) -> List[TagRecord]:
+    """Build the records a tag write will commit (and the tag cache will hold)"""
+    timestamp = _sql_timestamp()
+    return [
+        TagRecord.from_row((row["appid"], row["tag"], row.get("is_manual", False), timestamp))
+        for row in tag_rows
+    ]
+
+
+def _tag_params(record: TagRecord) -> tuple:
+    return (record.appid, record.tag, int(record.is_manual), record.last_updated)
+
+
+def _hltb_params(appid: str, data: Dict[str, Any], cached_at: int) -> tuple:
+    return (
+        appid,
+        data.get("game_name"),
+        data.get("matched_name"),
+        data.get("similarity"),
+        data.get("main_story"),
+        data.get("main_extra"),
+        data.get("completionist"),
+        data.get("all_styles"),
+        data.get("hltb_url"),
+        cached_at
+    )
+
+
+def _stats_params(appid: str, stats: Dict[str, Any]) -> tuple:
+    return (
+        appid,
+        stats.get("game_name", ""),
+        stats.get("playtime_minutes", 0),
+        stats.get("total_achievements", 0),
+        stats.get("unlocked_achievements", 0),
+        int(stats.get("is_hidden", False)),
+        stats.get("rt_last_time_played"),
+        stats.get("fingerprint")
+    )
+
+
+def _cached_at_epoch(value: Any) -> Optional[float]:
+    """cached_at as epoch seconds; None for rows without a usable timestamp"""
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return None
+
+
+def _is_hltb_expired(record: HLTBRecord, ttl: Optional[int], current_time: float) -> bool:
+    if ttl is None:
+        return False
+    cached_time = _cached_at_epoch(record.cached_at)
+    return cached_time is None or current_time - cached_time > ttl
+
+
+# Games HLTB doesn't know are retried after 1 day, then 2, 4, ... up to 30 days
+HLTB_MISS_BASE_TTL = 24 * 60 * 60
+HLTB_MISS_MAX_TTL = 30 * 24 * 60 * 60
+
+
+def _hltb_miss_ttl(miss_count: int) -> int:
+    return min(HLTB_MISS_BASE_TTL * 2 ** (max(miss_count, 1) - 1), HLTB_MISS_MAX_TTL)
+
+
+def _is_hltb_miss_active(record: HLTBRecord, current_time: float) -> bool:
+    """True while a recorded miss is inside its backoff window"""
+    if has_hltb_times(record) or not record.miss_count:
+        return False
+    cached_time = _cached_at_epoch(record.cached_at)
+    if cached_time is None:
+        return False
+    return current_time - cached_time < _hltb_miss_ttl(record.miss_count)
+
+
+def _partition_hltb(records: List[HLTBRecord], ttl: Optional[int],
+                    current_time: float) -> Tuple[Dict[str, HLTBRecord], Set[str]]:
+    """Split hltb_cache rows into usable data (keyed by appid) and appids with an active miss"""
+    data = {}
+    misses = set()
+    for record in records:
+        if has_hltb_times(record):
+            if not _is_hltb_expired(record, ttl, current_time):
+                data[record.appid] = record
+        elif _is_hltb_miss_active(record, current_time):
+            misses.add(record.appid)
+    return data, misses
+
+
+# Per-connection prepared statement cache (sqlite3 default is 128)
+STATEMENT_CACHE_SIZE = 256
+
+# Pragmas applied to every connection
+CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous = NORMAL",      # Safe with WAL, avoids an fsync per commit
+    "PRAGMA mmap_size = 67108864",      # 64 MB memory-mapped reads
+    "PRAGMA cache_size = -8192",        # 8 MB page cache per connection
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA busy_timeout = 5000",
+)
+
+
+class ConnectionManager:
+    """Owns all SQLite connections for one database file
+
+    Writes run on a single dedicated writer thread, so they are serialized
+    by its work queue. Reads run on a small pool of read-only connections;
+    with WAL they see the last committed state and never wait behind a
+    long write transaction.
+    """
+
+    def __init__(self, db_path: str, read_pool_size: int = 2):
+        self.db_path = db_path
+        self.read_pool_size = read_pool_size
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        self._writer: Optional[ThreadPoolExecutor] = None
+        self._readers: Optional[ThreadPoolExecutor] = None
+
+    def _open(self, read_only: bool) -> sqlite3.Connection:
+        if read_only:
+            uri = f"{Path(self.db_path).resolve().as_uri()}?mode=ro"
+            conn = sqlite3.connect(uri, uri=True, check_same_thread=False,
+                                   cached_statements=STATEMENT_CACHE_SIZE)
+            conn.execute("PRAGMA query_only = ON")
+        else:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False,
+                                   cached_statements=STATEMENT_CACHE_SIZE)
+            conn.execute("PRAGMA journal_mode = WAL")
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(pragma)
         conn.row_factory = sqlite3.Row
+
+        with self._connections_lock:
+            self._connections.append(conn)
         return conn
 
+    def _init_thread(self, read_only: bool):
+        self._local.conn = self._open(read_only)
+
+    def _call(self, fn, args):
+        return fn(self._local.conn, *args)
+
+    def start_writer(self):
+        """Start the writer thread (creates the database file if needed)"""
+        self._writer = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="db-writer",
+            initializer=self._init_thread, initargs=(False,))
+
+    def start_readers(self):
+        """Start the read-only pool (the database file must already exist)"""
+        self._readers = ThreadPoolExecutor(
+            max_workers=self.read_pool_size, thread_name_prefix="db-reader",
+            initializer=self._init_thread, initargs=(True,))
+
+    async def write(self, fn, *args):
+        """Run fn(conn, *args) on the writer thread"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._writer, self._call, fn, args)
+
+    async def read(self, fn, *args):
+        """Run fn(conn, *args) on a read-only connection"""
+        if self._readers is None:
+            return await self.write(fn, *args)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._readers, self._call, fn, args)
+
+    def close_sync(self):
+        """Stop all threads and close every connection"""
+        for executor in (self._readers, self._writer):
+            if executor:
+                executor.shutdown(wait=True)
+        self._readers = None
+        self._writer = None
+
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            try:
+                conn.close()
+            except Exception as e:
+                logger.error(f"Failed to close database connection: {e}")
+
+
+class Database:
+    def __init__(self, db_path: str, read_pool_size: int = 2):
+        self.db_path = db_path
+        self.read_pool_size = read_pool_size
+        self.connections: Optional[ConnectionManager] = None
+        self.capabilities: Dict[str, Any] = {}
+        self.tag_cache = TagCache()
+        self._settings: Optional[SettingsSnapshot] = None
+        self._settings_generation = 0   # bumped on every settings write
+        # Stats/HLTB writes since LibrarySnapshot last looked; the version
+        # starts from wall-clock milliseconds like the tag cache's
+        self.game_data_version = int(time.time() * 1000)
+        self._changed_games: Set[str] = set()
+
     async def connect(self):
-        """Establish database connection"""
-        self.connection = await asyncio.to_thread(self._connect_sync)
+        """Start the writer thread; readers start once the schema exists"""
+        self.connections = ConnectionManager(self.db_path, self.read_pool_size)
+        self.connections.start_writer()
         logger.info(f"Connected to database: {self.db_path}")
 
     async def close(self):
-        """Close database connection"""
-        if self.connection:
-            await asyncio.to_thread(self.connection.close)
+        """Close database connections"""
+        if self.connections:
+            connections, self.connections = self.connections, None
+            await asyncio.to_thread(connections.close_sync)
             logger.info("Database connection closed")
 
     def _init_schema_sync(self, conn):
@@ -52,8 +478,10 @@ class Database:
             )
         """)
 
+        # Covering index for per-tag counts (replaces the old tag-only index)
+        cursor.execute("DROP INDEX IF EXISTS idx_tags_tag")
         cursor.execute("""
-            CREATE INDEX IF NOT EXISTS idx_tags_tag ON game_tags(tag)
+            CREATE INDEX IF NOT EXISTS idx_tags_tag_appid ON game_tags(tag, appid)
         """)
 
         cursor.execute("""
@@ -71,10 +499,24 @@ class Database:
                 completionist REAL,
                 all_styles REAL,
                 hltb_url TEXT,
-                cached_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                cached_at INTEGER DEFAULT (CAST(strftime('%s', 'now') AS INTEGER)),
+                miss_count INTEGER DEFAULT 0
             )
         """)
 
+        # Migration: Add miss_count column if it doesn't exist
+        cursor.execute("PRAGMA table_info(hltb_cache)")
+        columns = [col[1] for col in cursor.fetchall()]
+        if 'miss_count' not in columns:
+            cursor.execute("ALTER TABLE hltb_cache ADD COLUMN miss_count INTEGER DEFAULT 0")
+
+        # Migration: cached_at used to be CURRENT_TIMESTAMP text; store epoch seconds
+        cursor.execute("""
+            UPDATE hltb_cache
+            SET cached_at = CAST(strftime('%s', cached_at) AS INTEGER)
+            WHERE typeof(cached_at) = 'text'
+        """)
+
         cursor.execute("""
             CREATE INDEX IF NOT EXISTS idx_hltb_cached_at ON hltb_cache(cached_at)
         """)
@@ -88,6 +530,7 @@ class Database:
                 unlocked_achievements INTEGER DEFAULT 0,
                 is_hidden BOOLEAN DEFAULT 0,
                 rt_last_time_played INTEGER,
+                fingerprint INTEGER,
                 last_sync TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
         """)
@@ -99,6 +542,24 @@ class Database:
             cursor.execute("ALTER TABLE game_stats ADD COLUMN is_hidden BOOLEAN DEFAULT 0")
         if 'rt_last_time_played' not in columns:
             cursor.execute("ALTER TABLE game_stats ADD COLUMN rt_last_time_played INTEGER")
+        if 'fingerprint' not in columns:
+            cursor.execute("ALTER TABLE game_stats ADD COLUMN fingerprint INTEGER")
+
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_stats_hidden ON game_stats(is_hidden, appid)
+        """)
+
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_stats_name ON game_stats(game_name COLLATE NOCASE)
+        """)
+
+        # Partial index for the daily dropped check, which only looks at visible
+        # games. It replaces idx_stats_last_played, which left out NULL is_hidden
+        cursor.execute("DROP INDEX IF EXISTS idx_stats_last_played")
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_stats_visible_last_played ON game_stats(rt_last_time_played)
+            WHERE IFNULL(is_hidden, 0) = 0
+        """)
 
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS settings (
@@ -109,67 +570,91 @@ class Database:
 
         # Insert default settings
         # Note: mastered_multiplier is no longer used (mastered = 100% achievements)
-        cursor.execute("""
-            INSERT OR IGNORE INTO settings (key, value) VALUES
-                ('auto_tag_enabled', 'true'),
-                ('in_progress_threshold', '30'),
-                ('cache_ttl', '7200'),
-                ('source_installed', 'true'),
-                ('source_non_steam', 'true'),
-                ('source_all_owned', 'true')
-        """)
+        cursor.executemany(
+            "INSERT OR IGNORE INTO settings (key, value) VALUES (?, ?)",
+            [(key, encode_setting(value)) for key, value in SETTING_DEFAULTS.items()]
+        )
+
+        # cache_ttl used to be seeded as 7200 but never took effect (cached_at
+        # couldn't be parsed); move that untouched default to the new one
+        cursor.execute(
+            "UPDATE settings SET value = ? WHERE key = 'cache_ttl' AND value = '7200'",
+            (encode_setting(SETTING_DEFAULTS["cache_ttl"]),)
+        )
+
+        cursor.execute(CREATE_SCHEDULER_JOBS_SQL)
+
+        try:
+            cursor.execute(CREATE_HLTB_OFFLINE_SQL.format(table="hltb_offline"))
+            # Left behind by an import that never finished
+            cursor.execute("DROP TABLE IF EXISTS hltb_offline_import")
+        except sqlite3.OperationalError as e:
+            logger.warning(f"Offline HLTB index unavailable: {e}")
 
         conn.commit()
+        return self._detect_capabilities_sync(conn)
+
+    def _detect_capabilities_sync(self, conn) -> Dict[str, Any]:
+        """Inspect the migrated schema and SQLite features once
+
+        Record classes select fixed column lists, so a missing column is a
+        schema error here instead of a per-row fallback on every read.
+        """
+        columns = {
+            table: {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+            for table in ("game_tags", "hltb_cache", "game_stats", "settings")
+        }
+        for table, record in (("game_tags", TagRecord), ("game_stats", StatsRecord), ("hltb_cache", HLTBRecord)):
+            missing = {col.strip() for col in record.COLUMNS.split(",")} - columns[table]
+            if missing:
+                raise RuntimeError(f"Table {table} is missing columns: {sorted(missing)}")
+
+        return {
+            "columns": columns,
+            "sqlite_version": sqlite3.sqlite_version,
+            "returning": sqlite3.sqlite_version_info >= (3, 35, 0),
+            "fts5": conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'hltb_offline'"
+            ).fetchone() is not None
+        }
 
     async def init_database(self):
         """Initialize database schema"""
-        if not self.connection:
+        if not self.connections:
             await self.connect()
 
-        await asyncio.to_thread(self._init_schema_sync, self.connection)
-        logger.info("Database schema initialized")
+        self.capabilities = await self.connections.write(self._init_schema_sync)
+        self.connections.start_readers()
+        logger.info(f"Database schema initialized (SQLite {self.capabilities['sqlite_version']})")
 
     # Tag operations
-    def _get_tag_sync(self, conn, appid: str):
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM game_tags WHERE appid = ?", (appid,))
-        return cursor.fetchone()
+    def _get_tag_sync(self, conn, appid: str) -> Optional[TagRecord]:
+        row = _tuple_cursor(conn).execute(SELECT_TAG_SQL, (appid,)).fetchone()
+        return TagRecord.from_row(row) if row else None
 
-    async def get_tag(self, appid: str) -> Optional[Dict[str, Any]]:
+    async def get_tag(self, appid: str) -> Optional[TagRecord]:
         """Get tag for a specific game"""
-        if not self.connection:
+        if self.tag_cache.loaded:
+            return self.tag_cache.get(appid)
+        if not self.connections:
             return None
 
-        row = await asyncio.to_thread(self._get_tag_sync, self.connection, appid)
+        return await self.connections.read(self._get_tag_sync, appid)
 
-        if row:
-            return {
-                "appid": row["appid"],
-                "tag": row["tag"],
-                "is_manual": bool(row["is_manual"]),
-                "last_updated": row["last_updated"]
-            }
-        return None
-
-    def _set_tag_sync(self, conn, appid: str, tag: str, is_manual: bool):
+    def _set_tag_sync(self, conn, record: TagRecord):
         cursor = conn.cursor()
-        cursor.execute("""
-            INSERT INTO game_tags (appid, tag, is_manual, last_updated)
-            VALUES (?, ?, ?, CURRENT_TIMESTAMP)
-            ON CONFLICT(appid) DO UPDATE SET
-                tag = excluded.tag,
-                is_manual = excluded.is_manual,
-                last_updated = CURRENT_TIMESTAMP
-        """, (appid, tag, int(is_manual)))
+        cursor.execute(UPSERT_TAG_SQL, _tag_params(record))
         conn.commit()
 
     async def set_tag(self, appid: str, tag: str, is_manual: bool = False) -> bool:
         """Set or update tag for a game"""
-        if not self.connection:
+        if not self.connections:
             return False
 
         try:
-            await asyncio.to_thread(self._set_tag_sync, self.connection, appid, tag, is_manual)
+            record = _tag_records([{"appid": appid, "tag": tag, "is_manual": is_manual}])[0]
+            await self.connections.write(self._set_tag_sync, record)
+            self.tag_cache.put(record)
             return True
         except Exception as e:
             logger.error(f"Failed to set tag for {appid}: {e}")
@@ -177,203 +662,294 @@ class Database:
 
     def _remove_tag_sync(self, conn, appid: str):
         cursor = conn.cursor()
-        cursor.execute("DELETE FROM game_tags WHERE appid = ?", (appid,))
+        cursor.execute(DELETE_TAG_SQL, (appid,))
         conn.commit()
 
     async def remove_tag(self, appid: str) -> bool:
         """Remove tag from a game"""
-        if not self.connection:
+        if not self.connections:
             return False
 
         try:
-            await asyncio.to_thread(self._remove_tag_sync, self.connection, appid)
+            await self.connections.write(self._remove_tag_sync, appid)
+            self.tag_cache.remove(appid)
             return True
         except Exception as e:
             logger.error(f"Failed to remove tag for {appid}: {e}")
             return False
 
-    def _get_all_tags_sync(self, conn):
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM game_tags")
-        return cursor.fetchall()
+    def _get_all_tags_sync(self, conn) -> List[TagRecord]:
+        from_row = TagRecord.from_row
+        return [from_row(row) for row in _tuple_cursor(conn).execute(SELECT_ALL_TAGS_SQL)]
 
-    async def get_all_tags(self) -> List[Dict[str, Any]]:
+    async def get_all_tags(self) -> List[TagRecord]:
         """Get all game tags"""
-        if not self.connection:
+        if self.tag_cache.loaded:
+            return self.tag_cache.all()
+        if not self.connections:
             return []
 
-        rows = await asyncio.to_thread(self._get_all_tags_sync, self.connection)
+        return await self.connections.read(self._get_all_tags_sync)
+
+    # Tag cache operations
+    async def load_tag_cache(self):
+        """Load the whole game_tags table into the in-memory tag cache"""
+        if not self.connections:
+            return
+
+        records = await self.connections.read(self._get_all_tags_sync)
+        self.tag_cache.load(records)
+        logger.info(f"Tag cache loaded: {len(records)} tags (version {self.tag_cache.version})")
+
+    def _get_cached_tags_many(self, appids: List[str]) -> Dict[str, TagRecord]:
+        get = self.tag_cache.get
+        return {appid: record for appid, record in ((appid, get(appid)) for appid in appids) if record}
 
-        return [
-            {
-                "appid": row["appid"],
-                "tag": row["tag"],
-                "is_manual": bool(row["is_manual"]),
-                "last_updated": row["last_updated"]
-            }
-            for row in rows
-        ]
+    async def get_tags_since(self, version: int) -> Dict[str, Any]:
+        """Get tags set or removed after a tag cache version
+
+        Returns {"version", "full", "tags", "removed"}; see TagCache.changes_since.
+        """
+        if not self.tag_cache.loaded:
+            await self.load_tag_cache()
+        return self.tag_cache.changes_since(version)
+
+    # Library snapshot support
+    def _games_changed(self, appids: Iterable[str]):
+        """Note committed stats or HLTB writes for the library snapshot"""
+        self._changed_games.update(appids)
+        self.game_data_version += 1
+
+    def pop_changed_games(self) -> Set[str]:
+        """Appids whose stats or HLTB data changed since the last call"""
+        changed, self._changed_games = self._changed_games, set()
+        return changed
+
+    def _get_library_rows_sync(self, conn, appids: Optional[List[str]]) -> List[tuple]:
+        if appids is None:
+            return _tuple_cursor(conn).execute(SELECT_LIBRARY_ROWS_SQL).fetchall()
+        return _select_in(_tuple_cursor(conn), SELECT_LIBRARY_ROWS_IN_SQL, appids)
+
+    async def get_library_rows(self, appids: Optional[List[str]] = None) -> List[tuple]:
+        """Get (appid, game_name, is_hidden, main_story) for every game, or only for appids"""
+        if not self.connections:
+            return []
+
+        return await self.connections.read(self._get_library_rows_sync, None if appids is None else list(appids))
 
     # HLTB cache operations
     def _cache_hltb_sync(self, conn, appid: str, data: Dict[str, Any]):
         cursor = conn.cursor()
-        cursor.execute("""
-            INSERT INTO hltb_cache (
-                appid, game_name, matched_name, similarity_score,
-                main_story, main_extra, completionist, all_styles,
-                hltb_url, cached_at
-            )
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-            ON CONFLICT(appid) DO UPDATE SET
-                game_name = excluded.game_name,
-                matched_name = excluded.matched_name,
-                similarity_score = excluded.similarity_score,
-                main_story = excluded.main_story,
-                main_extra = excluded.main_extra,
-                completionist = excluded.completionist,
-                all_styles = excluded.all_styles,
-                hltb_url = excluded.hltb_url,
-                cached_at = CURRENT_TIMESTAMP
-        """, (
-            appid,
-            data.get("game_name"),
-            data.get("matched_name"),
-            data.get("similarity"),
-            data.get("main_story"),
-            data.get("main_extra"),
-            data.get("completionist"),
-            data.get("all_styles"),
-            data.get("hltb_url")
-        ))
+        cursor.execute(UPSERT_HLTB_SQL, _hltb_params(appid, data, int(time.time())))
         conn.commit()
 
     async def cache_hltb_data(self, appid: str, data: Dict[str, Any]) -> bool:
         """Cache HowLongToBeat data"""
-        if not self.connection:
+        if not self.connections:
             return False
 
         try:
-            await asyncio.to_thread(self._cache_hltb_sync, self.connection, appid, data)
+            await self.connections.write(self._cache_hltb_sync, appid, data)
+            self._games_changed((appid,))
             return True
         except Exception as e:
             logger.error(f"Failed to cache HLTB data for {appid}: {e}")
             return False
 
-    def _get_hltb_cache_sync(self, conn, appid: str):
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM hltb_cache WHERE appid = ?", (appid,))
-        return cursor.fetchone()
+    def _get_hltb_cache_sync(self, conn, appid: str) -> Optional[HLTBRecord]:
+        row = _tuple_cursor(conn).execute(SELECT_HLTB_SQL, (appid,)).fetchone()
+        return HLTBRecord.from_row(row) if row else None
+
+    async def get_hltb_cache(self, appid: str, ttl: Optional[int] = None) -> Optional[HLTBRecord]:
+        """Get cached HLTB data (recorded misses are not returned)
 
-    async def get_hltb_cache(self, appid: str, ttl: int = 7200) -> Optional[Dict[str, Any]]:
-        """Get cached HLTB data if not expired"""
-        if not self.connection:
+        With ttl=None entries are returned regardless of age; HLTBRefresher
+        refreshes them in the background, so callers never wait on a refetch.
+        """
+        if not self.connections:
             return None
 
-        row = await asyncio.to_thread(self._get_hltb_cache_sync, self.connection, appid)
+        record = await self.connections.read(self._get_hltb_cache_sync, appid)
 
-        if not row:
+        # Check if cache is a miss or expired
+        if not has_hltb_times(record) or _is_hltb_expired(record, ttl, time.time()):
             return None
 
-        # Check if cache is expired
-        cached_timestamp = row["cached_at"]
-        current_time = time.time()
+        return record
+
+    def _get_hltb_refresh_candidates_sync(self, conn, older_than: int, limit: int) -> List[HLTBRecord]:
+        cursor = _tuple_cursor(conn)
+        cursor.execute(SELECT_HLTB_STALE_SQL, (older_than, limit))
+        return [HLTBRecord.from_row(row) for row in cursor.fetchall()]
+
+    async def get_hltb_refresh_candidates(self, older_than: int, limit: int) -> List[HLTBRecord]:
+        """Get HLTB entries with data cached before `older_than` (epoch seconds), oldest first"""
+        if not self.connections:
+            return []
+
+        return await self.connections.read(self._get_hltb_refresh_candidates_sync, older_than, limit)
+
+    async def is_hltb_miss_active(self, appid: str) -> bool:
+        """True if HLTB recently had no data for this game and it shouldn't be searched yet"""
+        if not self.connections:
+            return False
+
+        record = await self.connections.read(self._get_hltb_cache_sync, appid)
+        return bool(record) and _is_hltb_miss_active(record, time.time())
+
+    def _record_hltb_miss_sync(self, conn, appid: str, game_name: str):
+        cursor = conn.cursor()
+        cursor.execute(RECORD_HLTB_MISS_SQL, (appid, game_name, int(time.time())))
+        conn.commit()
+
+    async def record_hltb_miss(self, appid: str, game_name: str) -> bool:
+        """Remember that HLTB had no data for a game; backs off exponentially per miss"""
+        if not self.connections:
+            return False
 
         try:
-            cached_time = float(cached_timestamp)
-        except (ValueError, TypeError):
-            cached_time = current_time
+            await self.connections.write(self._record_hltb_miss_sync, appid, game_name)
+            return True
+        except Exception as e:
+            logger.error(f"Failed to record HLTB miss for {appid}: {e}")
+            return False
 
-        if current_time - cached_time > ttl:
-            return None
+    # Offline HLTB index operations
+    # An import writes its batches to a staging table and swaps it in at the
+    # end, so searches keep using the old index until then and a failed
+    # import leaves it untouched
+    def _begin_hltb_offline_import_sync(self, conn):
+        conn.execute("DROP TABLE IF EXISTS hltb_offline_import")
+        conn.execute(CREATE_HLTB_OFFLINE_SQL.format(table="hltb_offline_import"))
+        conn.commit()
 
-        return {
-            "appid": row["appid"],
-            "game_name": row["game_name"],
-            "matched_name": row["matched_name"],
-            "similarity": row["similarity_score"],
-            "main_story": row["main_story"],
-            "main_extra": row["main_extra"],
-            "completionist": row["completionist"],
-            "all_styles": row["all_styles"],
-            "hltb_url": row["hltb_url"]
-        }
+    async def begin_hltb_offline_import(self) -> bool:
+        """Start an offline HLTB import with an empty staging table"""
+        if not self.connections or not self.capabilities.get("fts5"):
+            return False
+
+        try:
+            await self.connections.write(self._begin_hltb_offline_import_sync)
+            return True
+        except Exception as e:
+            logger.error(f"Failed to start offline HLTB import: {e}")
+            return False
+
+    def _add_hltb_offline_sync(self, conn, records: List[Dict[str, Any]]):
+        try:
+            conn.executemany(INSERT_HLTB_OFFLINE_SQL, [
+                tuple(record.get(column) for column in HLTB_OFFLINE_COLUMNS) for record in records
+            ])
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+    async def add_hltb_offline(self, records: List[Dict[str, Any]]) -> bool:
+        """Stage a batch of dump records (see hltb_offline) for the running import"""
+        if not self.connections or not self.capabilities.get("fts5"):
+            return False
+
+        try:
+            await self.connections.write(self._add_hltb_offline_sync, records)
+            return True
+        except Exception as e:
+            logger.error(f"Failed to import {len(records)} offline HLTB entries: {e}")
+            return False
+
+    def _finish_hltb_offline_import_sync(self, conn):
+        try:
+            conn.execute("BEGIN")
+            conn.execute("DROP TABLE hltb_offline")
+            conn.execute("ALTER TABLE hltb_offline_import RENAME TO hltb_offline")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+    async def finish_hltb_offline_import(self) -> bool:
+        """Replace the offline HLTB index with the staged import in one transaction"""
+        if not self.connections or not self.capabilities.get("fts5"):
+            return False
+
+        try:
+            await self.connections.write(self._finish_hltb_offline_import_sync)
+            return True
+        except Exception as e:
+            logger.error(f"Failed to replace offline HLTB index: {e}")
+            return False
+
+    def _discard_hltb_offline_import_sync(self, conn):
+        conn.execute("DROP TABLE IF EXISTS hltb_offline_import")
+        conn.commit()
+
+    async def discard_hltb_offline_import(self) -> bool:
+        """Drop a failed import's staging table; the current index is kept"""
+        if not self.connections or not self.capabilities.get("fts5"):
+            return False
+
+        try:
+            await self.connections.write(self._discard_hltb_offline_import_sync)
+            return True
+        except Exception as e:
+            logger.error(f"Failed to discard offline HLTB import: {e}")
+            return False
+
+    def _search_hltb_offline_sync(self, conn, words: List[str], limit: int) -> List[Dict[str, Any]]:
+        cursor = _tuple_cursor(conn)
+        # Quote every word so FTS5 never reads it as query syntax
+        terms = ['"' + word.replace('"', '""') + '"' for word in words]
+        # Entries with all the words first; any shared word only if none do,
+        # since OR on common words has to rank a large part of the table
+        for query in (" ".join(terms), " OR ".join(terms)):
+            rows = cursor.execute(SEARCH_HLTB_OFFLINE_SQL, (query, limit)).fetchall()
+            if rows or len(terms) == 1:
+                break
+        return [dict(zip(HLTB_OFFLINE_COLUMNS, row)) for row in rows]
+
+    async def search_hltb_offline(self, search_name: str, limit: int = 20) -> List[Dict[str, Any]]:
+        """Offline HLTB entries for a sanitized name, best ranked first
+
+        Entries have the same keys as HLTB API results, so they can be
+        matched with hltb_matching.best_match.
+        """
+        if not self.connections or not self.capabilities.get("fts5"):
+            return []
+
+        words = list(dict.fromkeys(search_name.lower().split()))
+        if not words:
+            return []
+        return await self.connections.read(self._search_hltb_offline_sync, words, limit)
 
     # Game stats operations
     def _update_stats_sync(self, conn, appid: str, stats: Dict[str, Any]):
         cursor = conn.cursor()
-        cursor.execute("""
-            INSERT INTO game_stats (
-                appid, game_name, playtime_minutes,
-                total_achievements, unlocked_achievements, is_hidden, rt_last_time_played, last_sync
-            )
-            VALUES (?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-            ON CONFLICT(appid) DO UPDATE SET
-                game_name = excluded.game_name,
-                playtime_minutes = excluded.playtime_minutes,
-                total_achievements = excluded.total_achievements,
-                unlocked_achievements = excluded.unlocked_achievements,
-                is_hidden = excluded.is_hidden,
-                rt_last_time_played = excluded.rt_last_time_played,
-                last_sync = CURRENT_TIMESTAMP
-        """, (
-            appid,
-            stats.get("game_name", ""),
-            stats.get("playtime_minutes", 0),
-            stats.get("total_achievements", 0),
-            stats.get("unlocked_achievements", 0),
-            int(stats.get("is_hidden", False)),
-            stats.get("rt_last_time_played")
-        ))
+        cursor.execute(UPSERT_STATS_SQL, _stats_params(appid, stats))
         conn.commit()
 
     async def update_game_stats(self, appid: str, stats: Dict[str, Any]) -> bool:
         """Update game statistics"""
-        if not self.connection:
+        if not self.connections:
             return False
 
         try:
-            await asyncio.to_thread(self._update_stats_sync, self.connection, appid, stats)
+            await self.connections.write(self._update_stats_sync, appid, stats)
+            self._games_changed((appid,))
             return True
         except Exception as e:
             logger.error(f"Failed to update stats for {appid}: {e}")
             return False
 
-    def _get_stats_sync(self, conn, appid: str):
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM game_stats WHERE appid = ?", (appid,))
-        return cursor.fetchone()
+    def _get_stats_sync(self, conn, appid: str) -> Optional[StatsRecord]:
+        row = _tuple_cursor(conn).execute(SELECT_STATS_SQL, (appid,)).fetchone()
+        return StatsRecord.from_row(row) if row else None
 
-    async def get_game_stats(self, appid: str) -> Optional[Dict[str, Any]]:
+    async def get_game_stats(self, appid: str) -> Optional[StatsRecord]:
         """Get game statistics"""
-        if not self.connection:
+        if not self.connections:
             return None
 
-        row = await asyncio.to_thread(self._get_stats_sync, self.connection, appid)
-
-        if row:
-            # Handle case where is_hidden column might not exist yet (migration)
-            try:
-                is_hidden = bool(row["is_hidden"])
-            except (KeyError, IndexError):
-                is_hidden = False
-
-            # Handle case where rt_last_time_played might not exist yet (migration)
-            try:
-                rt_last_time_played = row["rt_last_time_played"]
-            except (KeyError, IndexError):
-                rt_last_time_played = None
-
-            return {
-                "appid": row["appid"],
-                "game_name": row["game_name"],
-                "playtime_minutes": row["playtime_minutes"],
-                "total_achievements": row["total_achievements"],
-                "unlocked_achievements": row["unlocked_achievements"],
-                "is_hidden": is_hidden,
-                "rt_last_time_played": rt_last_time_played,
-                "last_sync": row["last_sync"]
-            }
-        return None
+        return await self.connections.read(self._get_stats_sync, appid)
 
     def _get_all_game_stats_sync(self, conn, include_hidden: bool = True):
         cursor = conn.cursor()
@@ -385,135 +961,486 @@ class Database:
 
     async def get_all_game_stats(self, include_hidden: bool = True) -> List[Dict[str, Any]]:
         """Get all game statistics records (appid only for counting)"""
-        if not self.connection:
+        if not self.connections:
             return []
 
-        rows = await asyncio.to_thread(self._get_all_game_stats_sync, self.connection, include_hidden)
+        rows = await self.connections.read(self._get_all_game_stats_sync, include_hidden)
         return [{"appid": row["appid"]} for row in rows]
 
-    # Settings operations
-    def _get_setting_sync(self, conn, key: str):
+    def _get_tag_counts_sync(self, conn, include_hidden: bool):
         cursor = conn.cursor()
-        cursor.execute("SELECT value FROM settings WHERE key = ?", (key,))
-        return cursor.fetchone()
+        cursor.execute("""
+            SELECT gt.tag AS tag, COUNT(*) AS count
+            FROM game_tags gt
+            LEFT JOIN game_stats gs ON gs.appid = gt.appid
+            WHERE ? OR gs.is_hidden = 0 OR gs.is_hidden IS NULL
+            GROUP BY gt.tag
+            UNION ALL
+            SELECT NULL AS tag, COUNT(*) AS count
+            FROM game_stats
+            WHERE ? OR is_hidden = 0 OR is_hidden IS NULL
+        """, (int(include_hidden), int(include_hidden)))
+        return cursor.fetchall()
 
-    async def get_setting(self, key: str, default: Any = None) -> Any:
-        """Get a setting value"""
-        if not self.connection:
-            return default
+    async def get_tag_counts(self, include_hidden: bool = False) -> Dict[str, int]:
+        """Get game counts per tag plus backlog and total library size
 
-        row = await asyncio.to_thread(self._get_setting_sync, self.connection, key)
+        Backlog is every counted game without one of the known tags.
+        """
+        counts = {tag: 0 for tag in TAG_NAMES}
+        counts["backlog"] = 0
+        counts["total"] = 0
 
-        if row:
-            value = row["value"]
-            if value.lower() in ('true', 'false'):
-                return value.lower() == 'true'
-            try:
-                return float(value)
-            except ValueError:
-                return value
-        return default
+        if not self.connections:
+            return counts
+
+        rows = await self.connections.read(self._get_tag_counts_sync, include_hidden)
+
+        tagged = 0
+        for row in rows:
+            if row["tag"] is None:
+                counts["total"] = row["count"]
+            elif row["tag"] in TAG_NAMES:
+                counts[row["tag"]] = row["count"]
+                tagged += row["count"]
+
+        counts["backlog"] = counts["total"] - tagged
+        return counts
+
+    def _list_tagged_games_sync(self, conn, tags: Optional[List[str]], offset: int, limit: Optional[int]):
+        # Hidden games are skipped UNLESS they have a manual tag
+        # (user explicitly tagged them, so they want to see them)
+        where = "(gs.is_hidden = 0 OR gs.is_hidden IS NULL OR gt.is_manual = 1)"
+        params: List[Any] = []
+        if tags:
+            where += f" AND gt.tag IN ({','.join('?' * len(tags))})"
+            params.extend(tags)
 
-    def _set_setting_sync(self, conn, key: str, value: str):
+        cursor = conn.cursor()
+        cursor.execute(f"""
+            SELECT COUNT(*)
+            FROM game_tags gt
+            LEFT JOIN game_stats gs ON gs.appid = gt.appid
+            WHERE {where}
+        """, params)
+        total = cursor.fetchone()[0]
+
+        cursor.execute(f"""
+            SELECT gt.appid, gs.game_name, gt.tag, gt.is_manual
+            FROM game_tags gt
+            LEFT JOIN game_stats gs ON gs.appid = gt.appid
+            WHERE {where}
+            ORDER BY {TAG_ORDER_SQL}, gs.game_name COLLATE NOCASE
+            LIMIT ? OFFSET ?
+        """, params + [limit if limit is not None else -1, offset])
+        return cursor.fetchall(), total
+
+    async def list_tagged_games(self, tags: Optional[List[str]] = None, offset: int = 0,
+                                limit: Optional[int] = None) -> Dict[str, Any]:
+        """Get a page of tagged games with names, sorted by tag order then name
+
+        Returns {"games": [...], "total": n} where total ignores offset/limit.
+        """
+        if not self.connections:
+            return {"games": [], "total": 0}
+
+        rows, total = await self.connections.read(self._list_tagged_games_sync, tags, offset, limit)
+        return {
+            "games": [
+                {
+                    "appid": row["appid"],
+                    "game_name": row["game_name"],
+                    "tag": row["tag"],
+                    "is_manual": bool(row["is_manual"])
+                }
+                for row in rows
+            ],
+            "total": total
+        }
+
+    def _list_backlog_games_sync(self, conn, offset: int, limit: Optional[int]):
         cursor = conn.cursor()
         cursor.execute("""
-            INSERT INTO settings (key, value)
-            VALUES (?, ?)
-            ON CONFLICT(key) DO UPDATE SET value = excluded.value
-        """, (key, value))
-        conn.commit()
+            SELECT COUNT(*)
+            FROM game_stats gs
+            LEFT JOIN game_tags gt ON gt.appid = gs.appid
+            WHERE gt.appid IS NULL
+                AND (gs.is_hidden = 0 OR gs.is_hidden IS NULL)
+        """)
+        total = cursor.fetchone()[0]
+
+        cursor.execute("""
+            SELECT gs.appid, gs.game_name
+            FROM game_stats gs
+            LEFT JOIN game_tags gt ON gt.appid = gs.appid
+            WHERE gt.appid IS NULL
+                AND (gs.is_hidden = 0 OR gs.is_hidden IS NULL)
+            ORDER BY gs.game_name COLLATE NOCASE
+            LIMIT ? OFFSET ?
+        """, (limit if limit is not None else -1, offset))
+        return cursor.fetchall(), total
+
+    async def list_backlog_games(self, offset: int = 0, limit: Optional[int] = None) -> Dict[str, Any]:
+        """Get a page of visible games without a tag, sorted by name
+
+        Returns {"games": [...], "total": n} where total ignores offset/limit.
+        """
+        if not self.connections:
+            return {"games": [], "total": 0}
+
+        rows, total = await self.connections.read(self._list_backlog_games_sync, offset, limit)
+        return {
+            "games": [{"appid": row["appid"], "game_name": row["game_name"]} for row in rows],
+            "total": total
+        }
+
+    # Settings operations
+    def _get_all_settings_sync(self, conn):
+        cursor = _tuple_cursor(conn)
+        cursor.execute(SELECT_ALL_SETTINGS_SQL)
+        return cursor.fetchall()
+
+    def _invalidate_settings(self):
+        self._settings_generation += 1
+        self._settings = None
+
+    async def get_settings(self) -> SettingsSnapshot:
+        """Get the typed settings snapshot
+
+        Read from SQLite once and cached until set_setting/set_settings_many
+        invalidates it.
+        """
+        snapshot = self._settings
+        if snapshot is not None:
+            return snapshot
+        if not self.connections:
+            return SettingsSnapshot({})
+
+        generation = self._settings_generation
+        rows = await self.connections.read(self._get_all_settings_sync)
+        snapshot = SettingsSnapshot.from_rows(rows)
+
+        # Don't cache a read that raced with a settings write
+        if generation == self._settings_generation:
+            self._settings = snapshot
+        return snapshot
+
+    async def get_setting(self, key: str, default: Any = None) -> Any:
+        """Get a setting value"""
+        if not self.connections:
+            return default
+
+        settings = await self.get_settings()
+        return settings.get(key, default)
+
+    def _set_settings_sync(self, conn, values: List[tuple]):
+        try:
+            cursor = conn.cursor()
+            cursor.executemany(UPSERT_SETTING_SQL, values)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
 
     async def set_setting(self, key: str, value: Any) -> bool:
         """Set a setting value"""
-        if not self.connection:
+        return await self.set_settings_many({key: value})
+
+    async def set_settings_many(self, settings: Dict[str, Any]) -> bool:
+        """Set several settings in one transaction"""
+        if not self.connections:
             return False
 
         try:
-            str_value = str(value).lower() if isinstance(value, bool) else str(value)
-            await asyncio.to_thread(self._set_setting_sync, self.connection, key, str_value)
+            values = [(key, encode_setting(value)) for key, value in settings.items()]
+            await self.connections.write(self._set_settings_sync, values)
             return True
         except Exception as e:
-            logger.error(f"Failed to set setting {key}: {e}")
+            logger.error(f"Failed to set settings {list(settings)}: {e}")
             return False
-
-    def _get_all_settings_sync(self, conn):
-        cursor = conn.cursor()
-        cursor.execute("SELECT key, value FROM settings")
-        return cursor.fetchall()
+        finally:
+            self._invalidate_settings()
 
     async def get_all_settings(self) -> Dict[str, Any]:
         """Get all settings"""
-        if not self.connection:
+        if not self.connections:
             return {}
 
-        rows = await asyncio.to_thread(self._get_all_settings_sync, self.connection)
+        settings = await self.get_settings()
+        return settings.to_dict()
 
-        settings = {}
-        for row in rows:
-            key = row["key"]
-            value = row["value"]
+    # Bulk operations
+    def _get_tags_many_sync(self, conn, appids: List[str]) -> Dict[str, TagRecord]:
+        from_row = TagRecord.from_row
+        return {row[0]: from_row(row) for row in _select_in(_tuple_cursor(conn), SELECT_TAGS_IN_SQL, appids)}
 
-            if value.lower() in ('true', 'false'):
-                settings[key] = value.lower() == 'true'
-            else:
-                try:
-                    settings[key] = float(value)
-                except ValueError:
-                    settings[key] = value
+    async def get_tags_many(self, appids: List[str]) -> Dict[str, TagRecord]:
+        """Get tags for many games, keyed by appid (untagged games are absent)"""
+        if self.tag_cache.loaded:
+            return self._get_cached_tags_many(appids)
+        if not self.connections or not appids:
+            return {}
 
-        return settings
+        return await self.connections.read(self._get_tags_many_sync, list(appids))
 
-    def _get_games_eligible_for_dropped_sync(self, conn, days_threshold: int):
-        """Get games that should be tagged as dropped (synchronous)"""
-        cursor = conn.cursor()
+    def _get_stats_many_sync(self, conn, appids: List[str]) -> Dict[str, StatsRecord]:
+        from_row = StatsRecord.from_row
+        return {row[0]: from_row(row) for row in _select_in(_tuple_cursor(conn), SELECT_STATS_IN_SQL, appids)}
 
-        # Calculate timestamp threshold (current time - days)
-        import time
-        current_time = int(time.time())
-        threshold_timestamp = current_time - (days_threshold * 24 * 60 * 60)
+    async def get_stats_many(self, appids: List[str]) -> Dict[str, StatsRecord]:
+        """Get statistics for many games, keyed by appid"""
+        if not self.connections or not appids:
+            return {}
 
-        # Query: Find games where:
-        # 1. rt_last_time_played exists and is older than threshold
-        # 2. Game is not hidden
-        # 3. Game is not manually tagged
-        # 4. Game is not completed or mastered (either has no tag, or is in_progress)
-        cursor.execute("""
-            SELECT gs.appid, gs.game_name, gs.rt_last_time_played, gt.tag, gt.is_manual
-            FROM game_stats gs
-            LEFT JOIN game_tags gt ON gs.appid = gt.appid
-            WHERE gs.rt_last_time_played IS NOT NULL
-                AND gs.rt_last_time_played > 0
-                AND gs.rt_last_time_played < ?
-                AND (gs.is_hidden = 0 OR gs.is_hidden IS NULL)
-                AND (gt.is_manual = 0 OR gt.is_manual IS NULL)
-                AND (gt.tag IS NULL OR gt.tag = 'in_progress')
-                AND (gt.tag != 'dropped' OR gt.tag IS NULL)
-        """, (threshold_timestamp,))
+        return await self.connections.read(self._get_stats_many_sync, list(appids))
 
-        return cursor.fetchall()
+    def _get_hltb_state_many_sync(self, conn, appids: List[str],
+                                  ttl: Optional[int]) -> Tuple[Dict[str, HLTBRecord], Set[str]]:
+        from_row = HLTBRecord.from_row
+        records = [from_row(row) for row in _select_in(_tuple_cursor(conn), SELECT_HLTB_IN_SQL, appids)]
+        return _partition_hltb(records, ttl, time.time())
+
+    def _get_hltb_cache_many_sync(self, conn, appids: List[str], ttl: Optional[int]) -> Dict[str, HLTBRecord]:
+        return self._get_hltb_state_many_sync(conn, appids, ttl)[0]
+
+    async def get_hltb_cache_many(self, appids: List[str], ttl: Optional[int] = None) -> Dict[str, HLTBRecord]:
+        """Get HLTB cache entries for many games, keyed by appid (see get_hltb_cache for ttl)"""
+        if not self.connections or not appids:
+            return {}
+
+        return await self.connections.read(self._get_hltb_cache_many_sync, list(appids), ttl)
+
+    def _upsert_stats_many_sync(self, conn, stats_rows: List[Dict[str, Any]]):
+        try:
+            conn.executemany(UPSERT_STATS_SQL, [_stats_params(stats["appid"], stats) for stats in stats_rows])
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+    async def upsert_stats_many(self, stats_rows: List[Dict[str, Any]]) -> bool:
+        """Insert or update statistics for many games in one transaction"""
+        if not self.connections:
+            return False
+        if not stats_rows:
+            return True
+
+        try:
+            await self.connections.write(self._upsert_stats_many_sync, stats_rows)
+            self._games_changed(stats["appid"] for stats in stats_rows)
+            return True
+        except Exception as e:
+            logger.error(f"Failed to update stats for {len(stats_rows)} games: {e}")
+            return False
+
+    def _set_tags_many_sync(self, conn, records: List[TagRecord]):
+        try:
+            conn.executemany(UPSERT_TAG_SQL, [_tag_params(record) for record in records])
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+    async def set_tags_many(self, tag_rows: List[Dict[str, Any]]) -> bool:
+        """Set or update tags for many games in one transaction
+
+        Each row is a dict with appid, tag and optional is_manual.
+        """
+        if not self.connections:
+            return False
+        if not tag_rows:
+            return True
+
+        try:
+            records = _tag_records(tag_rows)
+            await self.connections.write(self._set_tags_many_sync, records)
+            self.tag_cache.put_many(records)
+            return True
+        except Exception as e:
+            logger.error(f"Failed to set tags for {len(tag_rows)} games: {e}")
+            return False
+
+    # Bulk sync operations
+    def _get_sync_snapshot_sync(self, conn, appids: List[str], ttl: Optional[int]):
+        hltb, hltb_misses = self._get_hltb_state_many_sync(conn, appids, ttl)
+        return {
+            "tags": (self._get_cached_tags_many(appids) if self.tag_cache.loaded
+                     else self._get_tags_many_sync(conn, appids)),
+            "stats": self._get_stats_many_sync(conn, appids),
+            "hltb": hltb,
+            "hltb_misses": hltb_misses
+        }
+
+    async def get_sync_snapshot(self, appids: List[str], ttl: Optional[int] = None) -> Dict[str, Any]:
+        """Load tags, stats, HLTB cache and settings for a set of games
+
+        The three table reads share one thread hop and settings come from the
+        cached snapshot. Returns records keyed by appid so a bulk sync can
+        work entirely in memory, plus hltb_misses: appids HLTB recently had
+        no data for, which should not be searched yet.
+        """
+        if not self.connections:
+            return {"tags": {}, "stats": {}, "hltb": {}, "hltb_misses": set(), "settings": SettingsSnapshot({})}
+
+        snapshot = await self.connections.read(self._get_sync_snapshot_sync, list(appids), ttl)
+        snapshot["settings"] = await self.get_settings()
+        return snapshot
+
+    def _get_sync_fingerprints_sync(self, conn, appids: List[str], dropped_before: int):
+        current_time = time.time()
+        cursor = _tuple_cursor(conn)
+        result = {}
+        for chunk in _chunked(appids):
+            cursor.execute(
+                SELECT_SYNC_FINGERPRINTS_IN_SQL.format(placeholders=",".join("?" * len(chunk))),
+                [dropped_before, *chunk]
+            )
+            for (appid, fingerprint, main_story, main_extra, completionist, all_styles,
+                 cached_at, miss_count, tag, is_manual, dropped_due) in cursor:
+                has_times = bool(main_story or main_extra or completionist or all_styles)
+                if not has_times:
+                    # Without HLTB data the game is only settled while a miss backs off
+                    cached_time = _cached_at_epoch(cached_at)
+                    if (not miss_count or cached_time is None
+                            or current_time - cached_time >= _hltb_miss_ttl(miss_count)):
+                        continue
+                result[appid] = (fingerprint, main_story, has_times, tag, bool(is_manual), bool(dropped_due))
+        return result
+
+    async def get_sync_fingerprints(self, appids: List[str], dropped_before: int) -> Dict[str, tuple]:
+        """Get stored sync fingerprints and the state needed to check them
+
+        Returns {appid: (fingerprint, main_story, has_hltb_times, tag,
+        is_manual, dropped_due)}. dropped_due is true for games last played
+        before dropped_before that would now be tagged dropped. Games without
+        a fingerprint, or still waiting on an HLTB search, are absent.
+        """
+        if not self.connections or not appids:
+            return {}
 
-    async def get_games_eligible_for_dropped(self, days_threshold: int = 365) -> List[Dict[str, Any]]:
-        """Get games that should be tagged as dropped
+        return await self.connections.read(self._get_sync_fingerprints_sync, list(appids), dropped_before)
 
-        Returns games that:
-        - Have rt_last_time_played older than days_threshold
-        - Are not hidden
-        - Are not manually tagged
-        - Are not completed/mastered (either no tag or in_progress)
-        - Are not already dropped
+    def _apply_sync_batch_sync(self, conn, stats_rows, hltb_rows, tag_rows, miss_rows):
+        try:
+            cursor = conn.cursor()
+            cursor.executemany(UPSERT_STATS_SQL, [_stats_params(stats["appid"], stats) for stats in stats_rows])
+            cached_at = int(time.time())
+            cursor.executemany(UPSERT_HLTB_SQL, [_hltb_params(appid, data, cached_at) for appid, data in hltb_rows])
+            cursor.executemany(RECORD_HLTB_MISS_SQL, [(appid, name, cached_at) for appid, name in miss_rows])
+            cursor.executemany(UPSERT_TAG_SQL, [_tag_params(record) for record in tag_rows])
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+    async def apply_sync_batch(self, stats_rows: List[Dict[str, Any]],
+                               hltb_rows: List[tuple],
+                               tag_rows: List[Dict[str, Any]],
+                               miss_rows: List[tuple] = ()) -> bool:
+        """Write stats, HLTB cache entries and tags from a bulk sync in one transaction
+
+        hltb_rows is a list of (appid, hltb_data) pairs; miss_rows is a list
+        of (appid, game_name) pairs HLTB had no data for.
         """
-        if not self.connection:
+        if not self.connections:
+            return False
+
+        try:
+            records = _tag_records(tag_rows)
+            await self.connections.write(self._apply_sync_batch_sync, stats_rows, hltb_rows, records, list(miss_rows))
+            self.tag_cache.put_many(records)
+            if stats_rows or hltb_rows:
+                self._games_changed([stats["appid"] for stats in stats_rows] + [appid for appid, _ in hltb_rows])
+            return True
+        except Exception as e:
+            logger.error(f"Failed to apply sync batch ({len(stats_rows)} games): {e}")
+            return False
+
+    def _tag_dropped_sync(self, conn, cutoff: int, timestamp: str) -> List[str]:
+        try:
+            if self.capabilities.get("returning"):
+                appids = [row[0] for row in conn.execute(TAG_DROPPED_SQL + " RETURNING appid", (timestamp, cutoff))]
+            else:
+                # SQLite before 3.35: read the candidates inside the same write transaction
+                appids = [row[0] for row in conn.execute(SELECT_DROPPED_CANDIDATES_SQL, (cutoff,))]
+                if appids:
+                    conn.execute(TAG_DROPPED_SQL, (timestamp, cutoff))
+            conn.commit()
+            return appids
+        except Exception:
+            conn.rollback()
+            raise
+
+    async def tag_dropped_games(self, days_threshold: int = 365) -> List[str]:
+        """Tag every game not played in days_threshold days as dropped
+
+        One INSERT ... SELECT moves all eligible games (not hidden, not
+        manually tagged, untagged or in progress) to dropped. Returns the
+        appids that were tagged; raises if the write fails.
+        """
+        if not self.connections:
             return []
 
-        rows = await asyncio.to_thread(self._get_games_eligible_for_dropped_sync, self.connection, days_threshold)
-
-        return [
-            {
-                "appid": row["appid"],
-                "game_name": row["game_name"],
-                "rt_last_time_played": row["rt_last_time_played"],
-                "current_tag": row["tag"] if len(row) > 3 else None,
-                "is_manual": bool(row["is_manual"]) if len(row) > 4 else False
-            }
-            for row in rows
-        ]
+        cutoff = int(time.time()) - days_threshold * 24 * 60 * 60
+        timestamp = _sql_timestamp()
+        appids = await self.connections.write(self._tag_dropped_sync, cutoff, timestamp)
+        if appids:
+            self.tag_cache.put_many(
+                TagRecord.from_row((appid, "dropped", False, timestamp)) for appid in appids
+            )
+        return appids
+
+    # Scheduler and maintenance
+    def _get_job_runs_sync(self, conn) -> Dict[str, Dict[str, Any]]:
+        return {
+            row[0]: dict(zip(JOB_RUN_COLUMNS, row[1:]))
+            for row in _tuple_cursor(conn).execute(SELECT_JOB_RUNS_SQL)
+        }
+
+    async def get_job_runs(self) -> Dict[str, Dict[str, Any]]:
+        """Get the persisted run history of scheduled jobs, keyed by job name"""
+        if not self.connections:
+            return {}
+
+        return await self.connections.read(self._get_job_runs_sync)
+
+    def _record_job_run_sync(self, conn, name: str, started_at: int, duration_ms: float, error: Optional[str]):
+        try:
+            conn.execute(RECORD_JOB_RUN_SQL, (name, started_at, duration_ms, error, int(error is not None)))
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+    async def record_job_run(self, name: str, started_at: int, duration_ms: float,
+                             error: Optional[str] = None) -> bool:
+        """Store one run of a scheduled job; error is None for a successful run"""
+        if not self.connections:
+            return False
+
+        try:
+            await self.connections.write(self._record_job_run_sync, name, started_at, duration_ms, error)
+            return True
+        except Exception as e:
+            logger.error(f"Failed to record run of job {name}: {e}")
+            return False
+
+    def _run_maintenance_sync(self, conn) -> Dict[str, Any]:
+        # Refresh planner statistics for tables whose size changed noticeably
+        conn.execute("PRAGMA optimize")
+        if self.capabilities.get("fts5"):
+            # Merge the offline index's b-trees left behind by batched imports
+            conn.execute("INSERT INTO hltb_offline(hltb_offline) VALUES('optimize')")
+            conn.commit()
+        # Fold the WAL back into the database file and truncate it
+        busy, wal_pages, checkpointed = conn.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchone()
+        return {"wal_pages": wal_pages, "checkpointed": checkpointed, "busy": bool(busy)}
+
+    async def run_maintenance(self) -> Dict[str, Any]:
+        """Periodic upkeep: planner statistics, FTS merge and WAL checkpoint"""
+        if not self.connections:
+            return {}
+
+        result = await self.connections.write(self._run_maintenance_sync)
+        logger.info(f"Database maintenance: {result}")
+        return result
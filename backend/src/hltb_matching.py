@@ -0,0 +1,145 @@
+"""
+HLTB Matching
+Title normalization and candidate scoring for HLTB search results
+
+Patterns are compiled once and normalized titles are memoized, since the
+same Steam names are searched and compared on every sync. Candidates are
+pruned cheaply before SequenceMatcher runs:
+1. Exact match on the normalized title, on the title without edition
+   suffixes (GOTY, Definitive Edition, ...) or on either without spaces
+   ("Portal2") scores 1.0 straight away
+2. SequenceMatcher's real_quick_ratio/quick_ratio upper bounds skip
+   candidates that cannot beat the best score so far or reach the threshold
+Both only skip work, so the pick is the same as scoring every candidate.
+A release year in the Steam title, such as "DOOM (2016)", breaks ties
+between same-named candidates using HLTB's release_world year.
+"""
+
+import re
+from difflib import SequenceMatcher
+from functools import lru_cache
+from typing import Optional, Dict, Any, List, Tuple
+
+# Suffixes removed before searching; they rarely appear in HLTB titles
+_SEARCH_SUFFIXES = re.compile(
+    r'\s*-\s*(?:Steam Special Edition|Special Edition|Enhanced Edition|Game of the Year'
+    r'|GOTY|Anniversary Edition|Definitive Edition)'
+    r'|\s*\(\d{4}\)',   # Year in parentheses like (2008)
+    re.IGNORECASE
+)
+_SEPARATORS = re.compile(r'[-:]+')
+_NON_WORD = re.compile(r'[^\w\s]')
+_WHITESPACE = re.compile(r'\s+')
+
+_YEAR = re.compile(r'\((\d{4})\)')
+_TRADEMARKS = re.compile(r'[™®©]')
+# Edition markers compared away on both sides; remasters and director's cuts
+# are separate HLTB entries, so they are deliberately not listed
+_EDITION = re.compile(
+    r'\b(?:(?:steam\s+)?(?:special|enhanced|definitive|anniversary|complete|deluxe|'
+    r'digital\s+deluxe|gold|ultimate|collector\'?s|game\s+of\s+the\s+year|goty)\s+edition'
+    r'|game\s+of\s+the\s+year|goty)\b',
+    re.IGNORECASE
+)
+
+# Small adjustment when both sides carry a release year
+YEAR_MATCH_BONUS = 0.05
+
+
+@lru_cache(maxsize=8192)
+def sanitize_game_name(game_name: str) -> str:
+    """Sanitize game name for better HLTB search matching.
+    Removes special characters that can interfere with search."""
+    result = _SEARCH_SUFFIXES.sub('', game_name)
+    # Replace hyphens and colons with spaces (e.g., "Brothers - A Tale" -> "Brothers A Tale")
+    result = _SEPARATORS.sub(' ', result)
+    # Remove other special characters but keep alphanumeric and spaces
+    result = _NON_WORD.sub('', result)
+    # Collapse multiple spaces
+    return _WHITESPACE.sub(' ', result).strip()
+
+
+def _clean(text: str) -> str:
+    text = _NON_WORD.sub(' ', text.replace('&', ' and ').replace('_', ' '))
+    return _WHITESPACE.sub(' ', text).strip()
+
+
+@lru_cache(maxsize=16384)
+def normalize_title(title: str) -> Tuple[str, str, Optional[int]]:
+    """Normalize a title for comparison
+
+    Returns (normalized, base, year): the lower-cased title without
+    punctuation or trademark signs, the same without edition markers, and
+    a "(YYYY)" year if the title has one.
+    """
+    year_match = _YEAR.search(title)
+    year = int(year_match.group(1)) if year_match else None
+
+    text = _TRADEMARKS.sub('', _YEAR.sub(' ', title)).lower()
+    normalized = _clean(text)
+    base = _clean(_EDITION.sub(' ', text)) or normalized
+    return normalized, base, year
+
+
+def title_similarity(str1: str, str2: str) -> float:
+    """Similarity of two titles in [0, 1] after normalization"""
+    norm1, base1, _ = normalize_title(str1)
+    norm2, base2, _ = normalize_title(str2)
+    if norm1 == norm2 or base1 == base2 or base1.replace(' ', '') == base2.replace(' ', ''):
+        return 1.0
+    return SequenceMatcher(None, base1, base2).ratio()
+
+
+def best_match(game_name: str, candidates: List[Dict[str, Any]],
+               min_similarity: float) -> Tuple[Optional[Dict[str, Any]], float]:
+    """Pick the HLTB candidate that best matches game_name
+
+    Candidates below min_similarity never win, even with a year bonus.
+    Returns (candidate, similarity), or (None, 0.0) when no candidate
+    reaches min_similarity.
+    """
+    norm, base, year = normalize_title(game_name)
+    compact = base.replace(' ', '')
+    # Same arguments as title_similarity: ratio() is not symmetric
+    matcher = SequenceMatcher(None)
+    matcher.set_seq1(base)
+    # Most a candidate's score can exceed its similarity by
+    max_bonus = YEAR_MATCH_BONUS if year is not None else 0.0
+
+    best = None
+    best_similarity = 0.0
+    best_score = -1.0
+
+    for candidate in candidates:
+        cand_norm, cand_base, _ = normalize_title(candidate.get("game_name") or "")
+        if not cand_base:
+            continue
+
+        if cand_norm == norm or cand_base == base or cand_base.replace(' ', '') == compact:
+            similarity = 1.0
+        else:
+            matcher.set_seq2(cand_base)
+            # Upper bounds first; skip candidates that can't beat the best or qualify
+            bound = best_score - max_bonus
+            upper = matcher.real_quick_ratio()
+            if upper <= bound or upper < min_similarity:
+                continue
+            upper = matcher.quick_ratio()
+            if upper <= bound or upper < min_similarity:
+                continue
+            similarity = matcher.ratio()
+            if similarity < min_similarity:
+                continue
+
+        score = similarity
+        if year is not None:
+            candidate_year = candidate.get("release_world")
+            if candidate_year:
+                score += YEAR_MATCH_BONUS if candidate_year == year else -YEAR_MATCH_BONUS
+
+        if score > best_score:
+            best, best_score, best_similarity = candidate, score, similarity
+
+    if best is None:
+        return None, 0.0
+    return best, best_similarity
@@ -0,0 +1,109 @@
+"""
+HLTB Offline Dump
+Streaming reader for bulk HowLongToBeat dumps
+
+A dump is a CSV file, a JSON array or JSON lines with one game per record:
+game_id, name, comp_main, comp_plus, comp_100, comp_all (seconds, like the
+HLTB API) and optionally release_world. Records are read incrementally so
+a large dump never has to fit in memory; Database stores them in an FTS5
+table that HLTBService searches before going to the network.
+"""
+
+import csv
+import json
+from typing import Optional, Dict, Any, Iterator, List
+
+TIME_FIELDS = ("comp_main", "comp_plus", "comp_100", "comp_all")
+
+_READ_CHUNK = 64 * 1024
+
+
+def _to_number(value: Any) -> Optional[float]:
+    if value is None or value == "":
+        return None
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return number if number > 0 else None
+
+
+def normalize_dump_record(raw: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Validate one dump record; None if it has no id or name"""
+    name = raw.get("name") or raw.get("game_name")
+    try:
+        game_id = int(raw.get("game_id"))
+    except (TypeError, ValueError):
+        return None
+    if not name:
+        return None
+
+    record = {"game_id": game_id, "game_name": str(name).strip()}
+    for field in TIME_FIELDS:
+        record[field] = _to_number(raw.get(field))
+    year = _to_number(raw.get("release_world"))
+    record["release_world"] = int(year) if year else None
+    return record
+
+
+def _iter_json_array(handle) -> Iterator[Dict[str, Any]]:
+    """Yield the objects of a top-level JSON array without reading it all"""
+    decoder = json.JSONDecoder()
+    buffer = handle.read(_READ_CHUNK).lstrip()
+    if not buffer.startswith("["):
+        raise ValueError("Expected a JSON array")
+    buffer = buffer[1:]
+
+    while True:
+        buffer = buffer.lstrip().lstrip(",").lstrip()
+        if buffer.startswith("]"):
+            return
+        try:
+            obj, end = decoder.raw_decode(buffer)
+        except json.JSONDecodeError:
+            # Object continues past the buffer; read more and retry
+            chunk = handle.read(_READ_CHUNK)
+            if not chunk:
+                if buffer.strip():
+                    raise
+                return
+            buffer += chunk
+            continue
+        yield obj
+        buffer = buffer[end:]
+        if len(buffer) < _READ_CHUNK:
+            buffer += handle.read(_READ_CHUNK)
+
+
+def iter_dump_records(path: str) -> Iterator[Dict[str, Any]]:
+    """Yield normalized records from a CSV, JSON array or JSON lines dump"""
+    with open(path, "r", encoding="utf-8", newline="") as handle:
+        if path.lower().endswith(".csv"):
+            raw_records = csv.DictReader(handle)
+        else:
+            first = handle.read(1)
+            while first and first.isspace():
+                first = handle.read(1)
+            handle.seek(0)
+            if first == "[":
+                raw_records = _iter_json_array(handle)
+            else:
+                raw_records = (json.loads(line) for line in handle if line.strip())
+
+        for raw in raw_records:
+            if isinstance(raw, dict):
+                record = normalize_dump_record(raw)
+                if record:
+                    yield record
+
+
+def iter_dump_batches(path: str, batch_size: int = 2000) -> Iterator[List[Dict[str, Any]]]:
+    """Group dump records into lists for batched inserts"""
+    batch = []
+    for record in iter_dump_records(path):
+        batch.append(record)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
@@ -0,0 +1,89 @@
+"""
+HLTB Fetch Pipeline
+Concurrent HLTB lookups with a bounded worker pool and token-bucket rate limiting
+
+TokenBucket limits the request rate across every caller of HLTBService.
+HLTBFetchPipeline runs many lookups through a fixed number of workers and
+hands each result to a callback as soon as it arrives, so callers can
+write results incrementally instead of waiting for the whole batch.
+"""
+
+import asyncio
+import time
+from typing import Optional, Dict, Any, List, Tuple, Callable, Awaitable
+
+# Use Decky's built-in logger
+import decky
+logger = decky.logger
+
+
+class TokenBucket:
+    """Async token bucket: `rate` tokens per second, bursts up to `capacity`"""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self):
+        """Wait until a token is available and take it"""
+        # The lock queues waiters so tokens are handed out in arrival order
+        async with self._lock:
+            self._refill()
+            if self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= 1
+
+
+ResultCallback = Callable[[str, Optional[Dict[str, Any]]], Awaitable[None]]
+
+
+class HLTBFetchPipeline:
+    """Run HLTB searches for (appid, game_name) jobs through a bounded worker pool
+
+    Rate limiting and retries happen inside HLTBService.search_game, so they
+    also apply to lookups made outside the pipeline. A failed search skips
+    on_result and only counts as an error, so it is never recorded as a miss.
+    """
+
+    def __init__(self, hltb_service, workers: int = 4):
+        self.hltb_service = hltb_service
+        self.workers = workers
+
+    async def run(self, jobs: List[Tuple[str, str]], on_result: ResultCallback) -> Dict[str, int]:
+        """Search every job; on_result(appid, data_or_None) is awaited per finished job
+
+        Returns counters: requests made and callback errors.
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        for job in jobs:
+            queue.put_nowait(job)
+
+        counters = {"requests": 0, "errors": 0}
+
+        async def worker():
+            while True:
+                try:
+                    appid, game_name = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                try:
+                    counters["requests"] += 1
+                    data = await self.hltb_service.search_game(game_name)
+                    await on_result(appid, data)
+                except Exception as e:
+                    counters["errors"] += 1
+                    logger.error(f"HLTB pipeline failed for {appid} ({game_name}): {e}")
+
+        worker_count = min(self.workers, len(jobs))
+        if worker_count:
+            await asyncio.gather(*(worker() for _ in range(worker_count)))
+        return counters
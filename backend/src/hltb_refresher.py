@@ -0,0 +1,86 @@
+"""
+HLTB Refresher
+Background refresh-ahead for the HLTB cache
+
+Syncs use cached HLTB data regardless of age, so they never wait on a
+refetch. This task refreshes entries approaching the cache_ttl setting in
+small batches while no sync is running, and re-evaluates tags for games
+whose main_story time changed. JobScheduler runs one batch per pass.
+"""
+
+import time
+from typing import List, Callable, Awaitable
+
+# Use Decky's built-in logger
+import decky
+logger = decky.logger
+
+from records import has_hltb_times
+from hltb_service import HLTBSearchError
+
+# Never refresh more often than this, whatever cache_ttl says
+MIN_REFRESH_TTL = 60 * 60
+
+
+class HLTBRefresher:
+    def __init__(self, db, hltb_service,
+                 is_busy: Callable[[], bool],
+                 retag: Callable[[List[str]], Awaitable[None]],
+                 batch_size: int = 10, batch_delay: float = 60,
+                 idle_interval: float = 15 * 60, refresh_ahead: float = 0.1):
+        self.db = db
+        self.hltb_service = hltb_service
+        self.is_busy = is_busy
+        self.retag = retag
+        self.batch_size = batch_size
+        self.batch_delay = batch_delay          # pause between batches while work remains
+        self.idle_interval = idle_interval      # pause when nothing is due
+        self.refresh_ahead = refresh_ahead      # refresh this fraction of the TTL before expiry
+
+    async def refresh_batch(self) -> int:
+        """Refresh up to batch_size entries nearing expiry; returns how many were searched"""
+        if self.is_busy():
+            return 0
+
+        settings = await self.db.get_settings()
+        ttl = max(settings.cache_ttl, MIN_REFRESH_TTL)
+        older_than = int(time.time()) - int(ttl * (1 - self.refresh_ahead))
+
+        candidates = await self.db.get_hltb_refresh_candidates(older_than, self.batch_size)
+        if not candidates:
+            return 0
+
+        hltb_rows = []
+        miss_rows = []
+        retag_appids = []
+        searched = 0
+
+        for record in candidates:
+            if self.is_busy():
+                break  # A sync started; pick up the rest next time
+            searched += 1
+            try:
+                hltb_data = await self.hltb_service.search_game(record.game_name)
+            except HLTBSearchError:
+                continue  # Not a miss; keep the stored times and retry next pass
+            if has_hltb_times(hltb_data):
+                hltb_rows.append((record.appid, hltb_data))
+                if hltb_data.get('main_story') != record.main_story:
+                    retag_appids.append(record.appid)
+            else:
+                # Keeps the stored times and restarts the entry's TTL
+                miss_rows.append((record.appid, record.game_name))
+
+        if hltb_rows or miss_rows:
+            await self.db.apply_sync_batch([], hltb_rows, [], miss_rows)
+        if retag_appids:
+            await self.retag(retag_appids)
+
+        logger.info(f"HLTB refresh: {searched} searched, {len(hltb_rows)} updated, "
+                    f"{len(retag_appids)} re-tagged")
+        return searched
+
+    async def run_job(self) -> float:
+        """One scheduled refresh pass; returns the delay until the next pass"""
+        searched = await self.refresh_batch()
+        return self.batch_delay if searched else self.idle_interval
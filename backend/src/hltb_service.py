@@ -4,13 +4,13 @@ Fetches game completion times from HowLongToBeat using standard library only
 """
 
 import asyncio
+import http.client
 import json
+import random
 import ssl
+import threading
 import time
-import urllib.request
-import urllib.error
-from typing import Optional, Dict, Any, List
-from difflib import SequenceMatcher
+from typing import Optional, Dict, Any, List, Callable, Awaitable
 
 # Create SSL context that doesn't verify certificates (Steam Deck may have cert issues)
 SSL_CONTEXT = ssl.create_default_context()
@@ -21,24 +21,79 @@ SSL_CONTEXT.verify_mode = ssl.CERT_NONE
 import decky
 logger = decky.logger
 
+from http_pool import ConnectionPool, HTTPStatusError
+from hltb_pipeline import TokenBucket
+from hltb_matching import sanitize_game_name, title_similarity, best_match as find_best_match
+
+# Responses worth retrying: rate limited or a temporary server-side failure
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+
+class HLTBSearchError(Exception):
+    """HLTB search failed (network, auth, retries exhausted); not a miss for the game"""
+
+
+class HLTBRetryableError(HLTBSearchError):
+    """Transient HLTB failure (rate limited, server error, network)"""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def _as_retryable(error: Exception) -> Optional[HLTBRetryableError]:
+    """Wrap transient request errors; None for errors a retry won't fix"""
+    if isinstance(error, HTTPStatusError):
+        if error.status not in RETRYABLE_STATUS:
+            return None
+        try:
+            retry_after = float(error.retry_after) if error.retry_after else None
+        except ValueError:
+            retry_after = None  # HTTP-date form; fall back to backoff
+        return HLTBRetryableError(str(error), retry_after)
+    if isinstance(error, (OSError, http.client.HTTPException)):
+        return HLTBRetryableError(str(error))
+    return None
+
 
 class HLTBService:
-    def __init__(self):
+    def __init__(self, rate_limit: float = 2.0, burst: int = 5,
+                 max_retries: int = 3, backoff_base: float = 1.0, backoff_max: float = 30.0,
+                 negative_ttl: float = 900):
         self.min_similarity = 0.7  # Minimum similarity threshold
         self.base_url = "https://howlongtobeat.com"
         self.user_agent = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
         self.auth_token = None
         self.token_timestamp = 0
+        self._token_lock = threading.Lock()
+        # Shared by every search, including concurrent pipeline workers
+        self.rate_limiter = TokenBucket(rate_limit, burst)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        # Single-flight: one search per sanitized name, shared by concurrent callers
+        self._inflight: Dict[str, asyncio.Task] = {}
+        # Sanitized names that recently had no match -> monotonic expiry time
+        self._negative_cache: Dict[str, float] = {}
+        self.negative_ttl = negative_ttl
+        # Keep-alive connections shared by all searches
+        self.http = ConnectionPool(self.base_url, context=SSL_CONTEXT)
+        # Optional offline dump search (sanitized name -> candidates), tried before the API
+        self.offline_lookup: Optional[Callable[[str], Awaitable[List[Dict[str, Any]]]]] = None
+
+    def close(self):
+        """Close pooled HTTP connections"""
+        self.http.close()
 
     def _calculate_similarity(self, str1: str, str2: str) -> float:
-        """Calculate string similarity using SequenceMatcher"""
-        return SequenceMatcher(None, str1.lower(), str2.lower()).ratio()
+        """Calculate title similarity after normalization"""
+        return title_similarity(str1, str2)
 
     def _get_auth_token_sync(self) -> Optional[str]:
         """Get auth token from HLTB finder/init endpoint"""
         try:
             timestamp = int(time.time() * 1000)
-            init_url = f"{self.base_url}/api/finder/init?t={timestamp}"
+            init_path = f"/api/finder/init?t={timestamp}"
 
             headers = {
                 "User-Agent": self.user_agent,
@@ -47,59 +102,37 @@ class HLTBService:
                 "Accept": "application/json",
             }
 
-            req = urllib.request.Request(init_url, headers=headers)
-
-            with urllib.request.urlopen(req, timeout=10, context=SSL_CONTEXT) as response:
-                result = json.loads(response.read().decode('utf-8'))
-                token = result.get('token')
-                if token:
-                    return token
+            _, body = self.http.request("GET", init_path, headers=headers, timeout=10)
+            result = json.loads(body.decode('utf-8'))
+            token = result.get('token')
+            if token:
+                return token
 
         except Exception as e:
+            retryable = _as_retryable(e)
+            if retryable:
+                raise retryable from e
             logger.error(f"Failed to get HLTB auth token: {e}")
 
         return None
 
     def _sanitize_game_name(self, game_name: str) -> str:
-        """Sanitize game name for better HLTB search matching.
-        Removes special characters that can interfere with search."""
-        import re
-        # Remove common suffixes that don't help with matching
-        suffixes_to_remove = [
-            r'\s*-\s*Steam Special Edition',
-            r'\s*-\s*Special Edition',
-            r'\s*-\s*Enhanced Edition',
-            r'\s*-\s*Game of the Year',
-            r'\s*-\s*GOTY',
-            r'\s*-\s*Anniversary Edition',
-            r'\s*-\s*Definitive Edition',
-            r'\s*\([\d]{4}\)',  # Year in parentheses like (2008)
-        ]
-        result = game_name
-        for suffix in suffixes_to_remove:
-            result = re.sub(suffix, '', result, flags=re.IGNORECASE)
-
-        # Replace hyphens and colons with spaces (e.g., "Brothers - A Tale" -> "Brothers A Tale")
-        result = re.sub(r'[-:]+', ' ', result)
-        # Remove other special characters but keep alphanumeric and spaces
-        result = re.sub(r'[^\w\s]', '', result)
-        # Collapse multiple spaces
-        result = re.sub(r'\s+', ' ', result).strip()
-
-        return result
+        """Sanitize game name for better HLTB search matching"""
+        return sanitize_game_name(game_name)
 
     def _search_sync(self, game_name: str) -> Optional[Dict[str, Any]]:
         """Synchronous HLTB search"""
         try:
             # Get fresh auth token (tokens may expire)
-            current_time = time.time()
-            if not self.auth_token or (current_time - self.token_timestamp) > 300:  # Refresh every 5 min
-                self.auth_token = self._get_auth_token_sync()
-                self.token_timestamp = current_time
+            with self._token_lock:
+                current_time = time.time()
+                if not self.auth_token or (current_time - self.token_timestamp) > 300:  # Refresh every 5 min
+                    self.auth_token = self._get_auth_token_sync()
+                    self.token_timestamp = current_time
 
             if not self.auth_token:
-                logger.error("Could not get HLTB auth token")
-                return None
+                # Not a miss for this game; let search_game retry and skip the negative cache
+                raise HLTBRetryableError("Could not get HLTB auth token")
 
             # Build headers - Accept: application/json is important!
             headers = {
@@ -140,55 +173,66 @@ class HLTBService:
             }
 
             data = json.dumps(payload).encode('utf-8')
-            url = f"{self.base_url}/api/finder"
 
-            req = urllib.request.Request(url, data=data, headers=headers, method='POST')
-
-            with urllib.request.urlopen(req, timeout=15, context=SSL_CONTEXT) as response:
-                result = json.loads(response.read().decode('utf-8'))
+            _, body = self.http.request("POST", "/api/finder", body=data, headers=headers, timeout=15)
+            result = json.loads(body.decode('utf-8'))
 
             games = result.get("data", [])
             if not games:
                 return None
 
-            # Find best match by name similarity
-            best_match = None
-            best_similarity = 0.0
-
-            for game in games:
-                game_title = game.get("game_name", "")
-                similarity = self._calculate_similarity(game_name, game_title)
-
-                if similarity > best_similarity:
-                    best_similarity = similarity
-                    best_match = game
-
-            if not best_match or best_similarity < self.min_similarity:
+            # Find best match by name similarity (and release year, if the name has one)
+            best_match, best_similarity = find_best_match(game_name, games, self.min_similarity)
+            if not best_match:
                 return None
 
-            # Extract times (convert from seconds to hours)
-            def to_hours(seconds):
-                if seconds and seconds > 0:
-                    return round(seconds / 3600, 1)
-                return None
+            return self._build_result(game_name, best_match, best_similarity)
 
-            return {
-                "game_name": game_name,
-                "matched_name": best_match.get("game_name"),
-                "similarity": round(best_similarity, 2),
-                "main_story": to_hours(best_match.get("comp_main")),
-                "main_extra": to_hours(best_match.get("comp_plus")),
-                "completionist": to_hours(best_match.get("comp_100")),
-                "all_styles": to_hours(best_match.get("comp_all")),
-                "hltb_url": f"https://howlongtobeat.com/game/{best_match.get('game_id')}"
-            }
+        except HLTBRetryableError:
+            raise
+        except Exception as e:
+            retryable = _as_retryable(e)
+            if retryable:
+                raise retryable from e
+            raise HLTBSearchError(f"HLTB search error: {e}") from e
+
+    def _build_result(self, game_name: str, match: Dict[str, Any], similarity: float) -> Dict[str, Any]:
+        """Search result for a matched HLTB entry (times converted from seconds to hours)"""
+        def to_hours(seconds):
+            if seconds and seconds > 0:
+                return round(seconds / 3600, 1)
+            return None
 
+        return {
+            "game_name": game_name,
+            "matched_name": match.get("game_name"),
+            "similarity": round(similarity, 2),
+            "main_story": to_hours(match.get("comp_main")),
+            "main_extra": to_hours(match.get("comp_plus")),
+            "completionist": to_hours(match.get("comp_100")),
+            "all_styles": to_hours(match.get("comp_all")),
+            "hltb_url": f"https://howlongtobeat.com/game/{match.get('game_id')}"
+        }
+
+    async def _search_offline(self, game_name: str) -> Optional[Dict[str, Any]]:
+        """Match game_name against the offline dump; None on a miss"""
+        try:
+            candidates = await self.offline_lookup(self._sanitize_game_name(game_name))
         except Exception as e:
-            logger.error(f"HLTB search error: {e}")
+            logger.error(f"Offline HLTB search failed for {game_name}: {e}")
+            return None
+
+        match, similarity = find_best_match(game_name, candidates, self.min_similarity)
+        if not match:
             return None
+        return self._build_result(game_name, match, similarity)
 
     async def search_game(self, game_name: str) -> Optional[Dict[str, Any]]:
-        """Search HLTB for game completion times"""
+        """Search HLTB for game completion times
+
+        Returns None when HLTB has no match. Raises HLTBSearchError when the
+        search itself failed, so callers don't record it as a miss.
+        """
         if not game_name or game_name.startswith("Unknown"):
             return None
 
@@ -202,16 +246,79 @@ class HLTBService:
             if pattern in name_lower:
                 return None
 
-        try:
-            # Run sync request in thread pool
-            result = await asyncio.to_thread(self._search_sync, game_name)
+        key = self._sanitize_game_name(game_name).lower()
+        if not key:
+            return None
+
+        expires = self._negative_cache.get(key)
+        if expires is not None:
+            if expires > time.monotonic():
+                return None
+            del self._negative_cache[key]
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._search_with_retries(key, game_name))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._search_done(key, done))
+
+        # Shield so one caller being cancelled doesn't cancel the shared search
+        result = await asyncio.shield(task)
+
+        if result and result["game_name"] != game_name:
+            # Coalesced with a differently spelled name; report the caller's name
+            result = dict(result, game_name=game_name)
+        return result
+
+    def _search_done(self, key: str, task: asyncio.Task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Retrieve the exception even if every waiter was cancelled, so asyncio
+        # doesn't log "Task exception was never retrieved" (already logged)
+        if not task.cancelled():
+            task.exception()
+
+    def _remember_miss(self, key: str):
+        now = time.monotonic()
+        if len(self._negative_cache) >= 10000:
+            self._negative_cache = {k: v for k, v in self._negative_cache.items() if v > now}
+        self._negative_cache[key] = now + self.negative_ttl
+
+    async def _search_with_retries(self, key: str, game_name: str) -> Optional[Dict[str, Any]]:
+        if self.offline_lookup:
+            result = await self._search_offline(game_name)
+            if result:
+                logger.info(f"HLTB (offline): {result['matched_name']} (similarity: {result['similarity']:.2f})")
+                return result
+
+        for attempt in range(self.max_retries + 1):
+            await self.rate_limiter.acquire()
+            try:
+                # Run sync request in thread pool
+                result = await asyncio.to_thread(self._search_sync, game_name)
+
+            except HLTBRetryableError as e:
+                if attempt == self.max_retries:
+                    logger.error(f"HLTB search failed for {game_name} after {attempt + 1} attempts: {e}")
+                    raise
+                # Honor Retry-After, otherwise exponential backoff with jitter
+                if e.retry_after is not None:
+                    delay = min(e.retry_after, self.backoff_max)
+                else:
+                    delay = min(self.backoff_base * (2 ** attempt), self.backoff_max) * random.uniform(0.5, 1.0)
+                logger.warning(f"HLTB search for {game_name} failed ({e}), retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+                continue
+
+            except Exception as e:
+                logger.error(f"HLTB search failed for {game_name}: {e}")
+                if isinstance(e, HLTBSearchError):
+                    raise
+                raise HLTBSearchError(str(e)) from e
 
             if result:
                 logger.info(f"HLTB: {result['matched_name']} (similarity: {result['similarity']:.2f})")
+            else:
+                self._remember_miss(key)
 
             return result
-
-        except Exception as e:
-            logger.error(f"HLTB search failed for {game_name}: {e}")
-            return None
-
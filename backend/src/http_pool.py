@@ -0,0 +1,132 @@
+"""
+HTTP Connection Pool
+Keep-alive connections to a single host using only the standard library
+
+urllib.request.urlopen opens a new TCP and TLS connection for every request.
+ConnectionPool keeps idle http.client connections around and reuses them, so
+a burst of requests to one host pays for the handshake once. It is safe to
+use from several threads; each request holds its own connection.
+"""
+
+import http.client
+import ssl
+import threading
+from typing import Optional, Dict, List, Tuple
+from urllib.parse import urlsplit
+
+# Errors that mean a reused keep-alive connection was closed by the server
+_STALE_CONNECTION_ERRORS = (
+    http.client.RemoteDisconnected,
+    http.client.BadStatusLine,
+    http.client.CannotSendRequest,
+    http.client.ResponseNotReady,
+    ConnectionResetError,
+    ConnectionAbortedError,
+    BrokenPipeError,
+    ssl.SSLEOFError,
+)
+
+
+class HTTPStatusError(Exception):
+    """Non-2xx response; carries the status code and Retry-After header"""
+
+    def __init__(self, status: int, reason: str, retry_after: Optional[str] = None):
+        super().__init__(f"HTTP Error {status}: {reason}")
+        self.status = status
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class ConnectionPool:
+    def __init__(self, base_url: str, context: Optional[ssl.SSLContext] = None,
+                 max_idle: int = 4, timeout: float = 15):
+        parts = urlsplit(base_url)
+        self.scheme = parts.scheme
+        self.host = parts.hostname
+        self.port = parts.port
+        self.context = context
+        self.max_idle = max_idle
+        self.timeout = timeout
+        self._idle: List[http.client.HTTPConnection] = []
+        self._lock = threading.Lock()
+        self._closed = False
+
+        # Counters for logging and diagnostics
+        self.connections_opened = 0
+        self.requests_sent = 0
+
+    def _new_connection(self, timeout: float) -> http.client.HTTPConnection:
+        with self._lock:
+            self.connections_opened += 1
+        if self.scheme == "https":
+            return http.client.HTTPSConnection(self.host, self.port, timeout=timeout, context=self.context)
+        return http.client.HTTPConnection(self.host, self.port, timeout=timeout)
+
+    def _acquire(self) -> Optional[http.client.HTTPConnection]:
+        with self._lock:
+            return self._idle.pop() if self._idle else None
+
+    def _release(self, conn: http.client.HTTPConnection):
+        with self._lock:
+            if not self._closed and len(self._idle) < self.max_idle:
+                self._idle.append(conn)
+                return
+        conn.close()
+
+    def request(self, method: str, path: str, body: Optional[bytes] = None,
+                headers: Optional[Dict[str, str]] = None,
+                timeout: Optional[float] = None) -> Tuple[int, bytes]:
+        """Send a request and return (status, body)
+
+        Raises HTTPStatusError for non-2xx responses. A request that fails on
+        a reused connection because the server closed it is retried once on a
+        fresh connection.
+        """
+        timeout = timeout if timeout is not None else self.timeout
+        conn = self._acquire()
+        reused = conn is not None
+
+        while True:
+            if conn is None:
+                conn = self._new_connection(timeout)
+            else:
+                conn.timeout = timeout
+                if conn.sock is not None:
+                    conn.sock.settimeout(timeout)
+
+            try:
+                conn.request(method, path, body=body, headers=headers or {})
+                response = conn.getresponse()
+                data = response.read()
+            except _STALE_CONNECTION_ERRORS:
+                conn.close()
+                if not reused:
+                    raise
+                # Server dropped the idle connection; retry once on a new one
+                conn = None
+                reused = False
+                continue
+            except (OSError, http.client.HTTPException):
+                conn.close()
+                raise
+
+            with self._lock:
+                self.requests_sent += 1
+
+            if response.will_close:
+                conn.close()
+            else:
+                self._release(conn)
+
+            if not 200 <= response.status < 300:
+                raise HTTPStatusError(response.status, response.reason,
+                                      response.getheader("Retry-After"))
+            return response.status, data
+
+    def close(self):
+        """Close all idle connections; in-flight requests close theirs on return"""
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
@@ -0,0 +1,140 @@
+"""
+Library Snapshot
+In-memory model of the whole library, served to the frontend in one call
+
+The model holds each game's name, HLTB main story hours, visibility, tag
+and manual flag. It is loaded once and then kept current incrementally:
+tags through TagCache deltas, names and HLTB hours by re-reading only the
+games Database reports as written since the last request.
+
+The payload is columnar (parallel arrays of appids, tag codes, manual
+flags, names and hours) plus the tag counts, and is rebuilt only when the
+model changed. Its version combines the tag cache and game data versions,
+so a client passing back the version it has gets a tiny "unchanged" reply.
+"""
+
+import asyncio
+from typing import Optional, Dict, Any, List
+
+from classifier import CODE_BY_TAG, TAG_BY_CODE, TAG_NONE
+
+TAG_NAMES = ("completed", "in_progress", "mastered", "dropped")
+
+
+class _Game:
+    __slots__ = ("name", "hours", "hidden", "tag", "manual")
+
+    def __init__(self):
+        self.name: Optional[str] = None
+        self.hours: Optional[float] = None
+        self.hidden: Optional[bool] = None      # None: tagged game without stats
+        self.tag: Optional[str] = None
+        self.manual = False
+
+
+class LibrarySnapshot:
+    def __init__(self, db):
+        self.db = db
+        self._games: Dict[str, _Game] = {}
+        self._tag_version: Optional[int] = None
+        self._payload: Optional[Dict[str, Any]] = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def version(self) -> str:
+        return f"{self.db.tag_cache.version}.{self.db.game_data_version}"
+
+    async def get(self, known_version: Optional[str] = None) -> Dict[str, Any]:
+        """Current snapshot payload, or {"version", "unchanged": True} if known_version is current"""
+        async with self._lock:
+            await self._refresh()
+            payload = self._payload
+        if known_version and known_version == payload["version"]:
+            return {"version": payload["version"], "unchanged": True}
+        return payload
+
+    async def _refresh(self):
+        # Read the versions first: writes landing during the refresh bump
+        # them again, so the next request picks those up
+        version = self.version
+        if self._payload is not None and self._payload["version"] == version:
+            return
+
+        if not self.db.tag_cache.loaded:
+            await self.db.load_tag_cache()
+
+        if self._tag_version is None:
+            self.db.pop_changed_games()
+            rows = await self.db.get_library_rows()
+            self._games = {}
+            self._apply_rows(rows)
+        else:
+            changed = self.db.pop_changed_games()
+            if changed:
+                rows = await self.db.get_library_rows(list(changed))
+                self._apply_rows(rows)
+
+        changes = self.db.tag_cache.changes_since(self._tag_version or 0)
+        if changes["full"]:
+            for game in self._games.values():
+                game.tag, game.manual = None, False
+        for record in changes["tags"]:
+            game = self._game(record.appid)
+            game.tag, game.manual = record.tag, bool(record.is_manual)
+        for appid in changes["removed"]:
+            game = self._games.get(appid)
+            if game:
+                game.tag, game.manual = None, False
+        self._tag_version = changes["version"]
+
+        self._payload = self._build_payload(version)
+
+    def _game(self, appid: str) -> _Game:
+        game = self._games.get(appid)
+        if game is None:
+            game = self._games[appid] = _Game()
+        return game
+
+    def _apply_rows(self, rows: List[tuple]):
+        for appid, name, is_hidden, main_story in rows:
+            game = self._game(appid)
+            game.name = name
+            game.hidden = bool(is_hidden)
+            game.hours = round(main_story, 1) if main_story else None
+
+    def _build_payload(self, version: str) -> Dict[str, Any]:
+        # Visibility follows the list endpoints: hidden games only show when
+        # manually tagged, and counts follow get_tag_counts
+        counts = {tag: 0 for tag in TAG_NAMES}
+        total = 0
+        visible = []
+        stale = []
+        for appid, game in self._games.items():
+            has_stats = game.hidden is not None
+            if has_stats and not game.hidden:
+                total += 1
+            if game.tag in counts and not game.hidden:
+                counts[game.tag] += 1
+            if (has_stats and not game.hidden) or (game.tag and (not has_stats or game.manual)):
+                visible.append((appid, game))
+            elif not has_stats and not game.tag:
+                stale.append(appid)   # Tag removed from a game without stats
+        for appid in stale:
+            del self._games[appid]
+
+        visible.sort(key=lambda item: ((item[1].name or "").casefold(), item[0]))
+        counts["backlog"] = total - sum(counts[tag] for tag in TAG_NAMES)
+        counts["total"] = total
+
+        return {
+            "version": version,
+            "unchanged": False,
+            "count": len(visible),
+            "tag_names": {code: tag for code, tag in TAG_BY_CODE.items() if tag},
+            "stats": counts,
+            "appids": [appid for appid, _ in visible],
+            "tags": [CODE_BY_TAG.get(game.tag, TAG_NONE) for _, game in visible],
+            "manual": [int(game.manual) for _, game in visible],
+            "names": [game.name for _, game in visible],
+            "hltb_hours": [game.hours for _, game in visible]
+        }
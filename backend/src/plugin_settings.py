@@ -0,0 +1,106 @@
+"""
+Plugin Settings
+Typed snapshot of the settings table
+
+Values are stored as text in SQLite. They are decoded once per key type when
+the snapshot is built, so callers get real ints and bools instead of
+re-parsing strings on every read. Database caches the snapshot until a
+setting is written.
+"""
+
+from typing import Any, Dict, Iterable, Tuple
+
+# Known settings with their defaults; the default's type is the setting's type
+SETTING_DEFAULTS: Dict[str, Any] = {
+    "auto_tag_enabled": True,
+    "in_progress_threshold": 30,    # minutes
+    "cache_ttl": 7 * 24 * 60 * 60,  # seconds before HLTB data is refreshed in the background
+    "source_installed": True,
+    "source_non_steam": True,
+    "source_all_owned": True,
+}
+
+
+def _parse_bool(value: str) -> bool:
+    value = value.strip().lower()
+    if value in ('true', '1', 'yes'):
+        return True
+    if value in ('false', '0', 'no'):
+        return False
+    raise ValueError(f"not a boolean: {value!r}")
+
+
+def _parse_int(value: str) -> int:
+    # Older builds stored numbers through float(), e.g. '30.0'
+    return int(float(value))
+
+
+def _parse_untyped(value: str) -> Any:
+    if value.lower() in ('true', 'false'):
+        return value.lower() == 'true'
+    try:
+        return float(value)
+    except ValueError:
+        return value
+
+
+_PARSERS = {bool: _parse_bool, int: _parse_int, float: float, str: str}
+
+
+def decode_setting(key: str, value: str) -> Any:
+    """Decode a stored setting using its key's type, falling back to the default"""
+    if key not in SETTING_DEFAULTS:
+        return _parse_untyped(value)
+    default = SETTING_DEFAULTS[key]
+    try:
+        return _PARSERS[type(default)](value)
+    except (ValueError, TypeError):
+        return default
+
+
+def encode_setting(value: Any) -> str:
+    """Encode a setting value for the settings table"""
+    return str(value).lower() if isinstance(value, bool) else str(value)
+
+
+class SettingsSnapshot:
+    """Immutable, typed view of all settings
+
+    Known settings are attributes (settings.in_progress_threshold); unknown
+    keys stored by older or newer builds are still available through get().
+    """
+
+    __slots__ = tuple(SETTING_DEFAULTS) + ("_values",)
+
+    auto_tag_enabled: bool
+    in_progress_threshold: int
+    cache_ttl: int
+    source_installed: bool
+    source_non_steam: bool
+    source_all_owned: bool
+
+    def __init__(self, values: Dict[str, Any]):
+        merged = dict(SETTING_DEFAULTS)
+        merged.update(values)
+        object.__setattr__(self, "_values", merged)
+        for key in SETTING_DEFAULTS:
+            object.__setattr__(self, key, merged[key])
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Tuple[str, str]]) -> "SettingsSnapshot":
+        return cls({key: decode_setting(key, value) for key, value in rows})
+
+    def __setattr__(self, name, value):
+        raise AttributeError("SettingsSnapshot is read-only")
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self._values.get(key, default)
+
+    def __getitem__(self, key: str) -> Any:
+        return self._values[key]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(self._values)
+
+    def __repr__(self) -> str:
+        return f"SettingsSnapshot({self._values})"
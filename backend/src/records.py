@@ -0,0 +1,95 @@
+"""
+Record types for Game Progress Tracker
+Lightweight __slots__ classes decoded straight from SQLite row tuples
+
+Each record's SELECT column list lives next to its fields, so row positions
+are fixed and decoding is a single tuple unpack. Records support .get() and
+[] like the dicts they replace; use to_dict() before returning to the frontend.
+"""
+
+from typing import Any, Dict, Optional
+
+# Completion time fields; an HLTB entry with none of them set is a miss
+HLTB_TIME_FIELDS = ("main_story", "main_extra", "completionist", "all_styles")
+
+
+def has_hltb_times(data: Optional[Any]) -> bool:
+    """True if an HLTB record or search result has at least one completion time"""
+    return bool(data) and any(data.get(field) for field in HLTB_TIME_FIELDS)
+
+
+class _Record:
+    __slots__ = ()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key, default)
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.__slots__
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_dict()})"
+
+
+class TagRecord(_Record):
+    __slots__ = ("appid", "tag", "is_manual", "last_updated")
+
+    COLUMNS = "appid, tag, is_manual, last_updated"
+
+    @classmethod
+    def from_row(cls, row: tuple) -> "TagRecord":
+        rec = cls.__new__(cls)
+        rec.appid, rec.tag, is_manual, rec.last_updated = row
+        rec.is_manual = bool(is_manual)
+        return rec
+
+
+class StatsRecord(_Record):
+    __slots__ = (
+        "appid", "game_name", "playtime_minutes",
+        "total_achievements", "unlocked_achievements",
+        "is_hidden", "rt_last_time_played", "last_sync"
+    )
+
+    COLUMNS = (
+        "appid, game_name, playtime_minutes, total_achievements, unlocked_achievements, "
+        "is_hidden, rt_last_time_played, last_sync"
+    )
+
+    @classmethod
+    def from_row(cls, row: tuple) -> "StatsRecord":
+        rec = cls.__new__(cls)
+        (rec.appid, rec.game_name, rec.playtime_minutes, rec.total_achievements,
+         rec.unlocked_achievements, is_hidden, rec.rt_last_time_played, rec.last_sync) = row
+        rec.is_hidden = bool(is_hidden)
+        return rec
+
+
+class HLTBRecord(_Record):
+    __slots__ = (
+        "appid", "game_name", "matched_name", "similarity",
+        "main_story", "main_extra", "completionist", "all_styles",
+        "hltb_url", "cached_at", "miss_count"
+    )
+
+    COLUMNS = (
+        "appid, game_name, matched_name, similarity_score, main_story, main_extra, "
+        "completionist, all_styles, hltb_url, cached_at, miss_count"
+    )
+
+    @classmethod
+    def from_row(cls, row: tuple) -> "HLTBRecord":
+        rec = cls.__new__(cls)
+        (rec.appid, rec.game_name, rec.matched_name, rec.similarity, rec.main_story,
+         rec.main_extra, rec.completionist, rec.all_styles, rec.hltb_url, rec.cached_at,
+         rec.miss_count) = row
+        return rec
@@ -0,0 +1,200 @@
+"""
+Job Scheduler
+Persistent scheduler for the plugin's periodic background jobs
+
+Each job's last run is stored in SQLite, so a plugin reload keeps the
+schedule instead of restarting every timer. Deadlines are wall-clock
+times and the loop never sleeps longer than one tick: asyncio's clock
+stops while the Deck is suspended, so a long sleep would push jobs back by
+every suspend, while a short one notices overdue jobs right after a wake.
+Runs get random jitter, a job never overlaps itself, and a semaphore caps
+how many jobs run at once. Per-job run times are kept as metrics.
+"""
+
+import asyncio
+import random
+import time
+from typing import Optional, Dict, Any, Callable, Awaitable
+
+# Use Decky's built-in logger
+import decky
+logger = decky.logger
+
+# Longest single sleep of the scheduler loop
+SCHEDULER_TICK = 60
+
+# A loop iteration this much later than planned means the Deck was suspended
+WAKE_THRESHOLD = 3 * SCHEDULER_TICK
+
+JobFunction = Callable[[], Awaitable[Any]]
+
+
+class ScheduledJob:
+    """A registered job with its schedule and run metrics"""
+
+    def __init__(self, name: str, fn: JobFunction, interval: float,
+                 startup_delay: float, jitter: float, retry_delay: float, adaptive: bool):
+        self.name = name
+        self.fn = fn
+        self.interval = interval
+        self.adaptive = adaptive                # fn returns the seconds until its next run
+        self.startup_delay = startup_delay      # earliest first run after start
+        self.jitter = jitter                    # random extra delay, as a fraction of the delay
+        self.retry_delay = retry_delay          # delay after a failed run
+        self.next_run = 0.0
+        self.task: Optional[asyncio.Task] = None
+
+        self.last_run: Optional[int] = None
+        self.last_duration_ms: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self.run_count = 0
+        self.failure_count = 0
+        self.session_runs = 0                   # runs since the plugin loaded
+        self.total_duration_ms = 0.0            # sum over session runs
+        self.max_duration_ms = 0.0
+
+    def schedule(self, delay: float, now: float):
+        self.next_run = now + delay + random.uniform(0, delay * self.jitter)
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "interval": self.interval,
+            "running": self.task is not None,
+            "next_run": int(self.next_run),
+            "last_run": self.last_run,
+            "last_duration_ms": self.last_duration_ms,
+            "avg_duration_ms": (round(self.total_duration_ms / self.session_runs, 1)
+                                if self.session_runs else None),
+            "max_duration_ms": self.max_duration_ms if self.session_runs else None,
+            "last_error": self.last_error,
+            "run_count": self.run_count,
+            "failure_count": self.failure_count
+        }
+
+
+class JobScheduler:
+    """Runs registered jobs on persisted wall-clock schedules
+
+    Register jobs, then start(); stop() cancels the loop and any running job.
+    """
+
+    def __init__(self, db, max_concurrent: int = 2):
+        self.db = db
+        self.jobs: Dict[str, ScheduledJob] = {}
+        self._limit = asyncio.Semaphore(max_concurrent)
+        self._wake = asyncio.Event()
+        self._loop_task: Optional[asyncio.Task] = None
+
+    def register(self, name: str, fn: JobFunction, interval: float,
+                 startup_delay: float = 0, jitter: float = 0.05,
+                 retry_delay: Optional[float] = None, adaptive: bool = False):
+        """Add a job that runs every interval seconds
+
+        The first run happens once the persisted last run is an interval old
+        (retry_delay if it failed), but never before startup_delay. Failed
+        runs are retried after retry_delay (default: an hour, or the
+        interval if shorter). An adaptive job's fn returns the seconds until
+        its next run instead.
+        """
+        if retry_delay is None:
+            retry_delay = min(interval, 60 * 60)
+        self.jobs[name] = ScheduledJob(name, fn, interval, startup_delay, jitter, retry_delay, adaptive)
+
+    async def start(self):
+        """Load run history and start the scheduler loop"""
+        history = await self.db.get_job_runs()
+        now = time.time()
+        for job in self.jobs.values():
+            record = history.get(job.name)
+            if record:
+                job.last_run = record["last_run"]
+                job.last_duration_ms = record["last_duration_ms"]
+                job.last_error = record["last_error"]
+                job.run_count = record["run_count"] or 0
+                job.failure_count = record["failure_count"] or 0
+            # A failed last run is retried after retry_delay, as it would have
+            # been had the plugin kept running
+            due = (job.last_run or 0) + (job.retry_delay if job.last_error else job.interval)
+            job.next_run = max(due, now + job.startup_delay)
+
+        self._loop_task = asyncio.create_task(self._run_loop())
+        logger.info(f"Job scheduler started: {', '.join(self.jobs)}")
+
+    async def stop(self):
+        """Cancel the scheduler loop and wait for running jobs to stop"""
+        tasks = [job.task for job in self.jobs.values() if job.task]
+        if self._loop_task:
+            tasks.append(self._loop_task)
+            self._loop_task = None
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        logger.info("Job scheduler stopped")
+
+    def run_now(self, name: str) -> bool:
+        """Make a job due immediately; False if unknown or already running"""
+        job = self.jobs.get(name)
+        if job is None or job.task is not None:
+            return False
+        job.next_run = 0.0
+        self._wake.set()
+        return True
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Schedule and run-time metrics for every job, keyed by name"""
+        return {name: job.metrics() for name, job in self.jobs.items()}
+
+    async def _run_loop(self):
+        planned_wake = time.time()
+        while True:
+            now = time.time()
+            if now - planned_wake > WAKE_THRESHOLD:
+                logger.info(f"Scheduler woke {now - planned_wake:.0f}s late, catching up on due jobs")
+
+            for job in self.jobs.values():
+                if job.task is None and job.next_run <= now:
+                    job.task = asyncio.create_task(self._run_job(job))
+
+            idle = [job.next_run for job in self.jobs.values() if job.task is None]
+            delay = min([SCHEDULER_TICK] + [max(next_run - now, 0) for next_run in idle])
+            planned_wake = now + delay
+            self._wake.clear()
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _run_job(self, job: ScheduledJob):
+        next_delay = job.interval
+        error = None
+        try:
+            async with self._limit:
+                started_at = int(time.time())
+                start = time.perf_counter()
+                try:
+                    result = await job.fn()
+                    if job.adaptive and result is not None:
+                        next_delay = max(float(result), 1.0)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    error = str(e) or type(e).__name__
+                    next_delay = job.retry_delay
+                    logger.error(f"Scheduled job {job.name} failed: {e}")
+                    import traceback
+                    logger.error(traceback.format_exc())
+                duration_ms = round((time.perf_counter() - start) * 1000, 1)
+
+            job.last_run = started_at
+            job.last_duration_ms = duration_ms
+            job.last_error = error
+            job.run_count += 1
+            job.failure_count += error is not None
+            job.session_runs += 1
+            job.total_duration_ms += duration_ms
+            job.max_duration_ms = max(job.max_duration_ms, duration_ms)
+            await self.db.record_job_run(job.name, started_at, duration_ms, error)
+        finally:
+            job.schedule(next_delay, time.time())
+            job.task = None
+            self._wake.set()
@@ -4,69 +4,80 @@ Parses Steam VDF files to extract game information, playtime, and achievements
 Uses only standard library - no external vdf package
 """
 
+import asyncio
 import os
-import re
+import time
 from pathlib import Path
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple
 
 # Use Decky's built-in logger
 import decky
 logger = decky.logger
 
+from vdf_parser import parse_vdf_bytes, parse_binary_vdf, load_vdf, PathFilter
+
 
 def parse_vdf(content: str) -> Dict[str, Any]:
-    """
-    Simple VDF parser using only standard library.
-    VDF format is similar to JSON but with different syntax.
-    """
-    result = {}
-    stack = [result]
-    current_key = None
-
-    # Tokenize - handle quoted strings and bare words
-    token_pattern = re.compile(r'"([^"\\]*(?:\\.[^"\\]*)*)"|(\{)|(\})|(\S+)')
-
-    for match in token_pattern.finditer(content):
-        quoted, open_brace, close_brace, bare = match.groups()
-
-        token = quoted if quoted is not None else bare
-
-        if open_brace:
-            # Start new dict
-            new_dict = {}
-            if current_key is not None:
-                stack[-1][current_key] = new_dict
-                stack.append(new_dict)
-                current_key = None
-        elif close_brace:
-            # End current dict
-            if len(stack) > 1:
-                stack.pop()
-        elif token is not None:
-            if current_key is None:
-                current_key = token
-            else:
-                stack[-1][current_key] = token
-                current_key = None
-
-    return result
-
-
-def load_vdf_file(filepath: Path) -> Dict[str, Any]:
-    """Load and parse a VDF file"""
+    """Parse VDF text; see vdf_parser for the format details"""
+    return parse_vdf_bytes(content.encode('utf-8'))
+
+
+def load_vdf_file(filepath: Path, path_filter: PathFilter = None) -> Dict[str, Any]:
+    """Load and parse a VDF file, optionally keeping only keys matching path_filter"""
     try:
-        with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
-            content = f.read()
-        return parse_vdf(content)
+        return load_vdf(filepath, path_filter)
     except Exception as e:
         logger.error(f"Failed to parse VDF file {filepath}: {e}")
         return {}
 
 
+def _mtime(path: Path) -> Optional[int]:
+    """File or directory mtime in ns, None if it doesn't exist"""
+    try:
+        return path.stat().st_mtime_ns
+    except OSError:
+        return None
+
+
+def _file_key(path: Path) -> Optional[Tuple[int, int]]:
+    """(mtime_ns, size) of a file, None if it doesn't exist"""
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+# Per-app playtime keys seen in localconfig.vdf, in order of preference
+PLAYTIME_FIELDS = ("Playtime", "playtime", "PlaytimeForever", "playtime_forever",
+                   "TotalPlayTime", "totalplaytime", "playtime2", "Playtime2")
+
+# Only the per-app fields get_playtime_index reads are extracted from localconfig.vdf
+PLAYTIME_FILTER = tuple(f"*/Software/Valve/Steam/apps/*/{field}"
+                        for field in PLAYTIME_FIELDS + ("LastPlayed",))
+
+# How long a validated name index is trusted before its files are stat()ed again
+NAME_INDEX_RECHECK = 2.0
+
+
 class SteamDataService:
     def __init__(self):
         self.steam_path = self._find_steam_path()
         self.user_id = None
+        # libraryfolders.vdf mtime -> parsed library folders
+        self._library_folders: Optional[Tuple[Optional[int], List[Path]]] = None
+        # appid -> name for installed and non-Steam games, see _get_name_index
+        self._name_index: Dict[str, str] = {}
+        self._name_index_key: Optional[tuple] = None
+        self._name_index_checked = 0.0
+        # Rebuild in progress on a worker thread, shared by concurrent lookups
+        self._name_index_task: Optional[asyncio.Future] = None
+        # Per-source parts of the name index, each with the mtime it was built at
+        self._manifest_names: Dict[Path, Tuple[Optional[int], Dict[str, str]]] = {}
+        # shortcuts.vdf (mtime, size) -> decoded non-Steam games
+        self._shortcuts: Tuple[Optional[Tuple[int, int]], List[Dict[str, Any]]] = (None, [])
+        # Config file -> ((mtime, size), appid -> (playtime_minutes, last_played))
+        self._playtime_files: Dict[Path, Tuple[Optional[Tuple[int, int]], Dict[str, Tuple[int, int]]]] = {}
 
     def _find_steam_path(self) -> Optional[Path]:
         """Find Steam installation path"""
@@ -112,9 +123,18 @@ class SteamDataService:
 
     async def get_game_playtime(self, appid: str) -> int:
         """Get playtime in minutes from localconfig.vdf or config.vdf"""
+        entry = (await self.get_playtime_index()).get(appid)
+        return entry[0] if entry else 0
+
+    async def get_playtime_index(self) -> Dict[str, Tuple[int, int]]:
+        """appid -> (playtime_minutes, last_played) for every app in localconfig.vdf
+
+        Each config file is parsed once and re-parsed only when its mtime or
+        size changes. last_played is a Unix timestamp, 0 if unknown.
+        """
         user_id = await self.get_steam_user_id()
         if not user_id or not self.steam_path:
-            return 0
+            return {}
 
         # Try multiple config file locations
         config_paths = [
@@ -122,24 +142,31 @@ class SteamDataService:
             self.steam_path / "userdata" / user_id / "localconfig.vdf",
         ]
 
+        index: Dict[str, Tuple[int, int]] = {}
         for config_path in config_paths:
-            if config_path.exists():
-                playtime = await self._extract_playtime_from_config(config_path, appid)
-                if playtime > 0:
-                    return playtime
-
-        return 0
-
-    async def _extract_playtime_from_config(self, config_path: Path, appid: str) -> int:
-        """Extract playtime from a config file"""
+            key = _file_key(config_path)
+            if key is None:
+                continue
+            cached = self._playtime_files.get(config_path)
+            if not cached or cached[0] != key:
+                cached = (key, self._read_playtime_config(config_path))
+                self._playtime_files[config_path] = cached
+            for appid, entry in cached[1].items():
+                # The first file with playtime for an app wins
+                if appid not in index or (index[appid][0] <= 0 < entry[0]):
+                    index[appid] = entry
+        return index
+
+    def _read_playtime_config(self, config_path: Path) -> Dict[str, Tuple[int, int]]:
+        """Parse a config file into appid -> (playtime_minutes, last_played)"""
         try:
-            data = load_vdf_file(config_path)
+            data = load_vdf_file(config_path, PLAYTIME_FILTER)
 
             # Navigate through possible structures
             user_config = data.get("UserLocalConfigStore", data.get("UserRoamingConfigStore", {}))
 
             if not user_config:
-                return 0
+                return {}
 
             software = user_config.get("Software", user_config.get("software", {}))
             valve = software.get("Valve", software.get("valve", {}))
@@ -148,55 +175,112 @@ class SteamDataService:
             # Try both 'apps' and 'Apps'
             apps = steam.get("apps", steam.get("Apps", {}))
 
-            if not apps:
-                return 0
+            index = {}
+            for appid, app_data in apps.items():
+                if not isinstance(app_data, dict):
+                    continue
+
+                playtime = 0
+                for field in PLAYTIME_FIELDS:
+                    if field in app_data:
+                        try:
+                            playtime = int(app_data[field])
+                            break
+                        except (ValueError, TypeError):
+                            pass
 
-            if appid in apps:
-                app_data = apps[appid]
+                try:
+                    last_played = int(app_data.get("LastPlayed", 0))
+                except (ValueError, TypeError):
+                    last_played = 0
 
-                if isinstance(app_data, dict):
-                    # Try all known playtime field names
-                    for field in ["Playtime", "playtime", "PlaytimeForever", "playtime_forever",
-                                  "TotalPlayTime", "totalplaytime", "playtime2", "Playtime2"]:
-                        if field in app_data:
-                            try:
-                                return int(app_data[field])
-                            except (ValueError, TypeError):
-                                pass
+                index[appid] = (playtime, last_played)
 
-            return 0
+            logger.info(f"Parsed playtime for {len(index)} apps from {config_path.name}")
+            return index
 
         except Exception as e:
             logger.error(f"Failed to parse config file: {e}")
-            return 0
+            return {}
 
     async def get_game_name(self, appid: str) -> str:
         """Get game name from appmanifest files or shortcuts.vdf for non-Steam games"""
         if not self.steam_path:
             return f"Unknown Game ({appid})"
 
-        # Check common steam library locations for Steam games
-        library_folders = await self.get_library_folders()
-
-        for library_path in library_folders:
-            appmanifest_path = library_path / "steamapps" / f"appmanifest_{appid}.acf"
-
-            if appmanifest_path.exists():
-                try:
-                    data = load_vdf_file(appmanifest_path)
-                    game_name = data.get("AppState", {}).get("name", f"Unknown Game ({appid})")
-                    return game_name
-
-                except Exception as e:
-                    logger.error(f"Failed to parse appmanifest for {appid}: {e}")
+        user_id = await self.get_steam_user_id()
+        index = await self._get_name_index(user_id)
+        return index.get(appid, f"Unknown Game ({appid})")
 
-        # Check non-Steam games in shortcuts.vdf
-        non_steam_games = await self.get_non_steam_games()
-        for game in non_steam_games:
-            if game.get('appid') == appid:
-                return game.get('name', f"Unknown Game ({appid})")
+    async def _get_name_index(self, user_id: Optional[str]) -> Dict[str, str]:
+        """appid -> name for every installed Steam game and non-Steam shortcut
 
-        return f"Unknown Game ({appid})"
+        Rebuilt only when libraryfolders.vdf, a library's steamapps directory
+        (appmanifests added or removed) or shortcuts.vdf changes mtime; only
+        the changed parts are re-parsed.
+        """
+        if (self._name_index_key is not None
+                and time.monotonic() - self._name_index_checked < NAME_INDEX_RECHECK):
+            return self._name_index
+
+        # Checking and re-parsing the files stays off the event loop, and
+        # lookups arriving meanwhile wait for the same rebuild
+        task = self._name_index_task
+        if task is None or task.done():
+            task = asyncio.ensure_future(asyncio.to_thread(self._build_name_index, user_id))
+            # Retrieve a failure even if every waiter was cancelled
+            task.add_done_callback(lambda done: done.cancelled() or done.exception())
+            self._name_index_task = task
+        return await asyncio.shield(task)
+
+    def _build_name_index(self, user_id: Optional[str]) -> Dict[str, str]:
+        """Validate the name index against the files and rebuild what changed"""
+        now = time.monotonic()
+        steamapps_dirs = [library / "steamapps" for library in self._get_library_folders_sync()]
+        shortcuts_path = (self.steam_path / "userdata" / user_id / "config" / "shortcuts.vdf") if user_id else None
+
+        key = (
+            _mtime(self.steam_path / "steamapps" / "libraryfolders.vdf"),
+            tuple((path, _mtime(path)) for path in steamapps_dirs),
+            (shortcuts_path, _mtime(shortcuts_path) if shortcuts_path else None),
+        )
+        self._name_index_checked = now
+        if key == self._name_index_key:
+            return self._name_index
+
+        index: Dict[str, str] = {}
+        manifest_names = {}
+        for path, mtime in key[1]:
+            cached = self._manifest_names.get(path)
+            names = cached[1] if cached and cached[0] == mtime else self._read_manifest_names(path)
+            manifest_names[path] = (mtime, names)
+            for appid, name in names.items():
+                index.setdefault(appid, name)  # Earlier libraries win, as before
+        self._manifest_names = manifest_names
+
+        if shortcuts_path:
+            for game in self._load_shortcuts(shortcuts_path):
+                index.setdefault(game['appid'], game['name'])
+
+        self._name_index = index
+        self._name_index_key = key
+        logger.info(f"Game name index built: {len(index)} games")
+        return index
+
+    def _read_manifest_names(self, steamapps_path: Path) -> Dict[str, str]:
+        """appid -> name from the appmanifests in one steamapps directory"""
+        names = {}
+        if not steamapps_path.exists():
+            return names
+
+        for manifest_path in steamapps_path.glob("appmanifest_*.acf"):
+            appid = manifest_path.stem.replace("appmanifest_", "")
+            try:
+                data = load_vdf_file(manifest_path)
+                names[appid] = data.get("AppState", {}).get("name", f"Unknown Game ({appid})")
+            except Exception as e:
+                logger.error(f"Failed to parse appmanifest for {appid}: {e}")
+        return names
 
     async def get_steam_api_key(self) -> Optional[str]:
         """Get Steam Web API key from settings or environment"""
@@ -315,15 +399,22 @@ class SteamDataService:
 
     async def get_library_folders(self) -> List[Path]:
         """Get all Steam library folder paths"""
+        return self._get_library_folders_sync()
+
+    def _get_library_folders_sync(self) -> List[Path]:
         if not self.steam_path:
             return []
 
-        folders = [self.steam_path]
-
         libraryfolders_path = self.steam_path / "steamapps" / "libraryfolders.vdf"
+        mtime = _mtime(libraryfolders_path)
+        if self._library_folders and self._library_folders[0] == mtime:
+            return list(self._library_folders[1])
 
-        if not libraryfolders_path.exists():
-            return folders
+        folders = [self.steam_path]
+
+        if mtime is None:
+            self._library_folders = (mtime, folders)
+            return list(folders)
 
         try:
             data = load_vdf_file(libraryfolders_path)
@@ -334,18 +425,20 @@ class SteamDataService:
             for key, value in library_data.items():
                 if isinstance(value, dict) and "path" in value:
                     folder_path = Path(value["path"])
-                    if folder_path.exists():
+                    if folder_path.exists() and folder_path not in folders:
                         folders.append(folder_path)
 
         except Exception as e:
             logger.error(f"Failed to parse libraryfolders.vdf: {e}")
 
-        return folders
+        self._library_folders = (mtime, folders)
+        return list(folders)
 
     async def get_all_games(self) -> List[Dict[str, Any]]:
         """Get all games in Steam library"""
         games = []
         library_folders = await self.get_library_folders()
+        playtime_index = await self.get_playtime_index()
 
         for library_path in library_folders:
             steamapps_path = library_path / "steamapps"
@@ -366,13 +459,13 @@ class SteamDataService:
                     app_state = data.get("AppState", {})
                     game_name = app_state.get("name", f"Unknown ({appid})")
 
-                    # Get playtime
-                    playtime = await self.get_game_playtime(appid)
+                    playtime, last_played = playtime_index.get(appid, (0, 0))
 
                     games.append({
                         "appid": appid,
                         "name": game_name,
-                        "playtime_minutes": playtime
+                        "playtime_minutes": playtime,
+                        "rt_last_time_played": last_played or None
                     })
 
                 except Exception as e:
@@ -385,13 +478,14 @@ class SteamDataService:
     async def get_game_stats_full(self, appid: str) -> Dict[str, Any]:
         """Get complete game statistics (name, playtime, achievements)"""
         game_name = await self.get_game_name(appid)
-        playtime = await self.get_game_playtime(appid)
+        playtime, last_played = (await self.get_playtime_index()).get(appid, (0, 0))
         achievements = await self.get_game_achievements(appid)
 
         return {
             "appid": appid,
             "game_name": game_name,
             "playtime_minutes": playtime,
+            "rt_last_time_played": last_played or None,
             "total_achievements": achievements["total"],
             "unlocked_achievements": achievements["unlocked"],
             "achievement_percentage": achievements["percentage"]
@@ -404,19 +498,20 @@ class SteamDataService:
             return []
 
         shortcuts_path = self.steam_path / "userdata" / user_id / "config" / "shortcuts.vdf"
+        return [dict(game) for game in self._load_shortcuts(shortcuts_path)]
 
-        if not shortcuts_path.exists():
+    def _load_shortcuts(self, shortcuts_path: Path) -> List[Dict[str, Any]]:
+        """Decoded shortcuts.vdf entries, re-read only when the file's mtime or size changes"""
+        key = _file_key(shortcuts_path)
+        if key is None:
             return []
+        if self._shortcuts[0] == key:
+            return self._shortcuts[1]
 
         games = []
         try:
-            # shortcuts.vdf is a binary VDF file, need special parsing
-            with open(shortcuts_path, 'rb') as f:
-                content = f.read()
-
-            # Parse binary VDF format for shortcuts
-            # This is a simplified parser that extracts appid and appname
-            games = self._parse_shortcuts_binary(content)
+            # shortcuts.vdf is a binary VDF file
+            games = self._parse_shortcuts_binary(shortcuts_path.read_bytes())
             logger.info(f"Found {len(games)} non-Steam games")
 
         except Exception as e:
@@ -424,66 +519,35 @@ class SteamDataService:
             import traceback
             logger.error(traceback.format_exc())
 
+        self._shortcuts = (key, games)
         return games
 
     def _parse_shortcuts_binary(self, content: bytes) -> List[Dict[str, Any]]:
         """Parse binary shortcuts.vdf format
 
-        Binary VDF format uses:
-        - 0x00 for nested object start
-        - 0x01 for string type (followed by key\x00value\x00)
-        - 0x02 for int32 type (followed by key\x00 + 4 bytes)
-        - 0x08 for end of object
+        The file is a "shortcuts" map of numbered entries, each a map with an
+        int32 appid and an AppName string. Older Steam versions write the
+        keys in other cases ("appname", "AppID"), so keys are matched
+        case-insensitively.
         """
-        games = []
-
-        try:
-            # Find all appname occurrences (lowercase, as seen in actual file)
-            appname_marker = b'\x01appname\x00'
-            appid_marker = b'\x02appid\x00'
-
-            pos = 0
-            while True:
-                # Find next appname
-                name_pos = content.find(appname_marker, pos)
-                if name_pos == -1:
-                    break
-
-                # Extract app name (null-terminated string after marker)
-                name_start = name_pos + len(appname_marker)
-                name_end = content.find(b'\x00', name_start)
-                if name_end == -1:
-                    break
-
-                app_name = content[name_start:name_end].decode('utf-8', errors='ignore')
-
-                # Look for appid before appname (it comes first in each entry)
-                # Search backwards from appname position
-                search_start = max(0, name_pos - 100)
-                search_chunk = content[search_start:name_pos]
-
-                appid = None
-                appid_offset = search_chunk.rfind(appid_marker)  # Find last occurrence before appname
-                if appid_offset != -1:
-                    appid_start = appid_offset + len(appid_marker)
-                    if appid_start + 4 <= len(search_chunk):
-                        appid_bytes = search_chunk[appid_start:appid_start + 4]
-                        # Interpret as unsigned 32-bit integer
-                        appid = int.from_bytes(appid_bytes, 'little', signed=False)
-
-                if app_name and appid:
-                    games.append({
-                        "appid": str(appid),
-                        "name": app_name,
-                        "playtime_minutes": 0,
-                        "is_non_steam": True
-                    })
-
-                pos = name_end + 1
+        data = parse_binary_vdf(content)
+        shortcuts = next((value for key, value in data.items() if key.lower() == "shortcuts"), {})
 
-        except Exception as e:
-            logger.error(f"Error parsing shortcuts binary: {e}")
-            import traceback
-            logger.error(traceback.format_exc())
+        games = []
+        for entry in shortcuts.values():
+            if not isinstance(entry, dict):
+                continue
+            fields = {key.lower(): value for key, value in entry.items()}
+            appid = fields.get("appid")
+            app_name = fields.get("appname")
+            if not app_name or not isinstance(appid, int) or not appid:
+                continue
+            games.append({
+                # Stored as int32; shortcut ids are unsigned (>= 0x80000000)
+                "appid": str(appid & 0xFFFFFFFF),
+                "name": app_name,
+                "playtime_minutes": 0,
+                "is_non_steam": True
+            })
 
         return games
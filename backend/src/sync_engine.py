@@ -0,0 +1,382 @@
+"""
+Library Sync Engine
+Bulk sync path for frontend-provided library data
+Preloads tags, stats, HLTB cache and settings once, computes every tag
+in memory and writes stats and tags back in a single transaction, then
+refines tags as concurrent HLTB lookups complete
+
+Each synced game stores a fingerprint of its inputs, so games that haven't
+changed since the last sync are skipped before any of that work
+"""
+
+import hashlib
+import time
+from typing import Optional, Dict, Any, List, Callable, Awaitable
+
+# Use Decky's built-in logger
+import decky
+logger = decky.logger
+
+from classifier import classify_game, classify_library, ONE_YEAR_SECONDS, TAG_BY_CODE, TAG_SKIP
+from hltb_pipeline import HLTBFetchPipeline
+from records import has_hltb_times
+
+# Non-Steam shortcuts use a CRC32-based appid above this value
+NON_STEAM_APPID_MIN = 2000000000
+
+
+def is_non_steam_appid(appid: str) -> bool:
+    """Check if appid belongs to a non-Steam shortcut"""
+    try:
+        return int(appid) > NON_STEAM_APPID_MIN
+    except (ValueError, TypeError):
+        return False
+
+
+def is_placeholder_name(game_name: Optional[str]) -> bool:
+    """Check if a game name is missing or one of our fallback placeholders"""
+    return not game_name or game_name.startswith('Unknown Game') or game_name.startswith('Game ')
+
+
+def compute_auto_tag(stats: Dict[str, Any], hltb: Optional[Dict[str, Any]],
+                     in_progress_threshold: float, now: Optional[int] = None) -> Optional[str]:
+    """Calculate automatic tag from already loaded stats and HLTB data
+
+    Rules and priority live in classifier.classify_game.
+    """
+    if now is None:
+        now = int(time.time())
+    code = classify_game(
+        stats.get('playtime_minutes'),
+        stats.get('unlocked_achievements'),
+        stats.get('total_achievements'),
+        hltb.get('main_story') if hltb else None,
+        stats.get('rt_last_time_played'),
+        in_progress_threshold,
+        now
+    )
+    return TAG_BY_CODE[code]
+
+
+def sync_fingerprint(entry: Dict[str, Any], main_story: Optional[float], has_hltb: bool,
+                     in_progress_threshold: float, tag: Optional[str], is_manual: bool) -> int:
+    """64-bit hash of everything a sync of this entry depends on
+
+    Covers the frontend data (playtime, achievements, last played, name),
+    the HLTB entry, the in-progress threshold and the tag the sync left, so
+    a manual or refreshed tag forces the game to be synced again.
+    """
+    key = repr((
+        entry.get("playtime_minutes", 0),
+        entry.get("unlocked_achievements"),
+        entry.get("total_achievements"),
+        entry.get("rt_last_time_played"),
+        entry.get("game_name") or "",
+        float(main_story) if main_story else None,
+        has_hltb,
+        in_progress_threshold,
+        tag,
+        bool(is_manual)
+    ))
+    digest = hashlib.blake2b(key.encode("utf-8", errors="replace"), digest_size=8).digest()
+    return int.from_bytes(digest, "little", signed=True)   # Fits an SQLite INTEGER
+
+
+class SyncTimer:
+    """Accumulates wall time per sync phase"""
+
+    def __init__(self):
+        self.timings: Dict[str, float] = {}
+        self._start = time.perf_counter()
+
+    def phase(self, name: str):
+        return _TimedPhase(self, name)
+
+    def report(self) -> Dict[str, float]:
+        """Return phase timings in milliseconds, including the total"""
+        result = {name: round(seconds * 1000, 1) for name, seconds in self.timings.items()}
+        result["total"] = round((time.perf_counter() - self._start) * 1000, 1)
+        return result
+
+
+class _TimedPhase:
+    def __init__(self, timer: SyncTimer, name: str):
+        self.timer = timer
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.started
+        self.timer.timings[self.name] = self.timer.timings.get(self.name, 0.0) + elapsed
+        return False
+
+
+class LibrarySyncEngine:
+    """Bulk sync of many games in a handful of database round trips
+
+    Each entry is a dict with appid, playtime_minutes, rt_last_time_played,
+    total_achievements, unlocked_achievements and game_name. Achievement
+    values of None mean the frontend had no data and the stored values are kept.
+
+    Stats and provisional tags are written before any HLTB lookup. Games
+    without HLTB data are then searched concurrently and their tags refined
+    in small batches as results arrive.
+    """
+
+    def __init__(self, db, hltb_service,
+                 resolve_name: Callable[[str], Awaitable[str]],
+                 hltb_workers: int = 4, refine_batch_size: int = 25):
+        self.db = db
+        self.hltb_service = hltb_service
+        self.resolve_name = resolve_name
+        self.pipeline = HLTBFetchPipeline(hltb_service, workers=hltb_workers)
+        self.refine_batch_size = refine_batch_size
+
+    @staticmethod
+    def _build_stats(entry: Dict[str, Any], game_name: str, stored: Dict[str, Any],
+                     cached_hltb: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        appid = entry["appid"]
+
+        total_achievements = entry.get("total_achievements")
+        if total_achievements is None:
+            total_achievements = stored.get('total_achievements', 0)
+        unlocked_achievements = entry.get("unlocked_achievements")
+        if unlocked_achievements is None:
+            unlocked_achievements = stored.get('unlocked_achievements', 0)
+
+        return {
+            "appid": appid,
+            "game_name": game_name,
+            "playtime_minutes": entry.get("playtime_minutes", 0),
+            "total_achievements": total_achievements,
+            "unlocked_achievements": unlocked_achievements,
+            # Hide non-Steam apps without HLTB data (Discord, Chrome, etc.)
+            "is_hidden": is_non_steam_appid(appid) and not cached_hltb,
+            "rt_last_time_played": entry.get("rt_last_time_played")
+        }
+
+    @staticmethod
+    def _changed_tags(stats_rows: List[Dict[str, Any]], tags: Dict[str, Any],
+                      hltb_cache: Dict[str, Any], in_progress_threshold: int) -> List[Dict[str, Any]]:
+        """Classify stats rows in one call; returns tag rows that differ from the current tags"""
+        main_story = []
+        is_manual = []
+        for stats in stats_rows:
+            cached_hltb = hltb_cache.get(stats["appid"])
+            main_story.append(cached_hltb.get('main_story') if cached_hltb else None)
+            current_tag = tags.get(stats["appid"])
+            is_manual.append(bool(current_tag and current_tag.get('is_manual')))
+
+        codes = classify_library(
+            [stats["playtime_minutes"] for stats in stats_rows],
+            [stats["unlocked_achievements"] for stats in stats_rows],
+            [stats["total_achievements"] for stats in stats_rows],
+            main_story,
+            [stats["rt_last_time_played"] for stats in stats_rows],
+            is_manual,
+            [stats["is_hidden"] for stats in stats_rows],
+            in_progress_threshold
+        )
+
+        tag_rows = []
+        for stats, code in zip(stats_rows, codes):
+            calculated_tag = TAG_BY_CODE.get(code) if code != TAG_SKIP else None
+            if not calculated_tag:
+                continue
+            current_tag = tags.get(stats["appid"])
+            current_tag_value = current_tag.get('tag') if current_tag else None
+            if calculated_tag != current_tag_value:
+                tag_rows.append({"appid": stats["appid"], "tag": calculated_tag, "is_manual": False})
+        return tag_rows
+
+    @staticmethod
+    def _fingerprint(entry: Dict[str, Any], hltb: Optional[Dict[str, Any]],
+                     in_progress_threshold: float, tag: Optional[Dict[str, Any]]) -> int:
+        has_hltb = has_hltb_times(hltb)
+        return sync_fingerprint(
+            entry,
+            hltb.get('main_story') if has_hltb else None,
+            has_hltb,
+            in_progress_threshold,
+            tag.get('tag') if tag else None,
+            bool(tag and tag.get('is_manual'))
+        )
+
+    async def _skip_unchanged(self, entries: List[Dict[str, Any]],
+                              in_progress_threshold: float) -> List[Dict[str, Any]]:
+        """Entries that still need syncing: no stored fingerprint, a different one,
+        or a game whose last play is now old enough to make it dropped"""
+        stored = await self.db.get_sync_fingerprints(
+            [entry["appid"] for entry in entries], int(time.time()) - ONE_YEAR_SECONDS
+        )
+        if not stored:
+            return entries
+
+        remaining = []
+        for entry in entries:
+            state = stored.get(entry["appid"])
+            if state is not None:
+                fingerprint, main_story, has_hltb, tag, is_manual, dropped_due = state
+                if not dropped_due and fingerprint == sync_fingerprint(
+                        entry, main_story, has_hltb, in_progress_threshold, tag, is_manual):
+                    continue
+            remaining.append(entry)
+        return remaining
+
+    async def run(self, entries: List[Dict[str, Any]],
+                  on_progress: Optional[Callable[[int], None]] = None) -> Dict[str, Any]:
+        timer = SyncTimer()
+        total = len(entries)
+        settings = await self.db.get_settings()
+        in_progress_threshold = settings.in_progress_threshold
+
+        # Phase 0: skip games whose fingerprint matches their last sync
+        with timer.phase("fingerprint"):
+            entries = await self._skip_unchanged(entries, in_progress_threshold)
+        skipped = total - len(entries)
+        entries_by_appid = {entry["appid"]: entry for entry in entries}
+
+        # Phase 1: one read each for tags, stats and HLTB cache
+        with timer.phase("preload"):
+            snapshot = await self.db.get_sync_snapshot(list(entries_by_appid))
+        tags = snapshot["tags"]
+        existing_stats = snapshot["stats"]
+        hltb_cache = snapshot["hltb"]
+        hltb_misses = snapshot["hltb_misses"]
+
+        errors = 0
+        error_list = []
+
+        # Phase 2: resolve missing names and build stats rows
+        stats_rows: List[Dict[str, Any]] = []
+
+        with timer.phase("names"):
+            for i, entry in enumerate(entries):
+                appid = entry["appid"]
+                try:
+                    stored = existing_stats.get(appid) or {}
+                    game_name = entry.get("game_name")
+                    if not game_name:
+                        stored_name = stored.get("game_name")
+                        if not is_placeholder_name(stored_name):
+                            game_name = stored_name
+                        else:
+                            game_name = await self.resolve_name(appid)
+
+                    stats_rows.append(self._build_stats(entry, game_name, stored, hltb_cache.get(appid)))
+
+                except Exception as e:
+                    errors += 1
+                    error_list.append({"appid": appid, "error": str(e)})
+                    logger.error(f"[{i+1}/{total}] Failed: {appid} - {e}")
+
+        # Phase 3: provisional tags from the data we already have
+        with timer.phase("compute"):
+            tag_rows = self._changed_tags(stats_rows, tags, hltb_cache, in_progress_threshold)
+            new_tags = {row["appid"]: row for row in tag_rows}
+            for stats in stats_rows:
+                appid = stats["appid"]
+                stats["fingerprint"] = self._fingerprint(
+                    entries_by_appid[appid], hltb_cache.get(appid), in_progress_threshold,
+                    new_tags.get(appid) or tags.get(appid)
+                )
+
+        # Phase 4: write stats and provisional tags without waiting on HLTB
+        with timer.phase("write"):
+            written = await self.db.apply_sync_batch(stats_rows, [], tag_rows)
+
+        if not written:
+            return {
+                "success": False,
+                "error": "Failed to write sync results",
+                "timings": timer.report()
+            }
+
+        changed: Dict[str, str] = {}
+        for row in tag_rows:
+            tags[row["appid"]] = row
+            changed[row["appid"]] = row["tag"]
+
+        # Phase 5: fetch missing HLTB data concurrently and refine tags as it arrives
+        stats_by_appid = {stats["appid"]: stats for stats in stats_rows}
+        # Search games with no cached HLTB data, unless HLTB recently had nothing for them
+        jobs = [
+            (stats["appid"], stats["game_name"]) for stats in stats_rows
+            if stats["appid"] not in hltb_cache and stats["appid"] not in hltb_misses
+        ]
+        done = total - len(jobs)
+        if on_progress:
+            on_progress(done)
+
+        pending: List[tuple] = []
+        pending_misses: List[tuple] = []
+        refined = 0
+
+        async def flush():
+            nonlocal pending, pending_misses, refined, errors
+            if not pending and not pending_misses:
+                return
+            hltb_rows, pending = pending, []
+            miss_rows, pending_misses = pending_misses, []
+            affected = []
+            for appid, _ in hltb_rows:
+                stats = stats_by_appid[appid]
+                stats["is_hidden"] = is_non_steam_appid(appid) and not hltb_cache.get(appid)
+                affected.append(stats)
+            refine_rows = self._changed_tags(affected, tags, hltb_cache, in_progress_threshold)
+            new_tags = {row["appid"]: row for row in refine_rows}
+            for stats in affected:
+                appid = stats["appid"]
+                stats["fingerprint"] = self._fingerprint(
+                    entries_by_appid[appid], hltb_cache.get(appid), in_progress_threshold,
+                    new_tags.get(appid) or tags.get(appid)
+                )
+            if await self.db.apply_sync_batch(affected, hltb_rows, refine_rows, miss_rows):
+                for row in refine_rows:
+                    tags[row["appid"]] = row
+                    changed[row["appid"]] = row["tag"]
+                refined += len(refine_rows)
+            else:
+                failed = hltb_rows + miss_rows
+                errors += len(failed)
+                error_list.append({"appid": failed[0][0], "error": "Failed to write HLTB results"})
+
+        async def on_result(appid: str, hltb_data: Optional[Dict[str, Any]]):
+            nonlocal done
+            done += 1
+            if on_progress:
+                on_progress(done)
+            # Cache partial results too; record misses so they back off
+            if has_hltb_times(hltb_data):
+                hltb_cache[appid] = hltb_data
+                pending.append((appid, hltb_data))
+            else:
+                pending_misses.append((appid, stats_by_appid[appid]["game_name"]))
+            if len(pending) + len(pending_misses) >= self.refine_batch_size:
+                await flush()
+
+        with timer.phase("hltb"):
+            counters = await self.pipeline.run(jobs, on_result)
+            await flush()
+        errors += counters["errors"]
+
+        timings = timer.report()
+        logger.info(f"Bulk sync: {len(stats_rows)}/{total} games ({skipped} unchanged), {len(changed)} tag changes "
+                    f"({refined} refined by HLTB), {counters['requests']} HLTB lookups, timings(ms)={timings}")
+
+        return {
+            "success": True,
+            "total": total,
+            "synced": len(stats_rows),
+            "skipped": skipped,
+            "new_tags": len(changed),
+            "refined_tags": refined,
+            "errors": errors,
+            "error_details": error_list[:10],
+            "changed": changed,
+            "hltb_requests": counters["requests"],
+            "timings": timings
+        }
@@ -0,0 +1,91 @@
+"""
+Tag Cache
+In-memory write-through copy of the game_tags table
+
+Database loads it once and updates it after every committed tag write, so
+tag reads never touch SQLite. Every change bumps a monotonically increasing
+version; clients pass back the last version they saw to get only the tags
+that changed since then.
+"""
+
+import threading
+import time
+from typing import Optional, Dict, Any, List, Iterable
+
+from records import TagRecord
+
+
+class TagCache:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._tags: Dict[str, TagRecord] = {}
+        self._changed_at: Dict[str, int] = {}   # appid -> version of last set
+        self._removed_at: Dict[str, int] = {}   # appid -> version of removal
+        self.version = 0
+        self._base_version = 0                  # version right after the last full load
+        self.loaded = False
+
+    def load(self, records: Iterable[TagRecord]):
+        """Replace the cache contents with a full table read"""
+        with self._lock:
+            # Start from wall-clock milliseconds so versions keep increasing
+            # across plugin reloads and stale client versions are detected
+            self.version = max(self.version + 1, int(time.time() * 1000))
+            self._base_version = self.version
+            self._tags = {record.appid: record for record in records}
+            self._changed_at = {appid: self.version for appid in self._tags}
+            self._removed_at = {}
+            self.loaded = True
+
+    def get(self, appid: str) -> Optional[TagRecord]:
+        return self._tags.get(appid)
+
+    def all(self) -> List[TagRecord]:
+        return list(self._tags.values())
+
+    def __len__(self) -> int:
+        return len(self._tags)
+
+    def put_many(self, records: Iterable[TagRecord]) -> int:
+        """Store committed tags; returns the new version"""
+        with self._lock:
+            self.version += 1
+            for record in records:
+                self._tags[record.appid] = record
+                self._changed_at[record.appid] = self.version
+                self._removed_at.pop(record.appid, None)
+            return self.version
+
+    def put(self, record: TagRecord) -> int:
+        return self.put_many((record,))
+
+    def remove(self, appid: str) -> int:
+        """Apply a committed tag removal; returns the new version"""
+        with self._lock:
+            self.version += 1
+            if self._tags.pop(appid, None) is not None:
+                self._changed_at.pop(appid, None)
+                self._removed_at[appid] = self.version
+            return self.version
+
+    def changes_since(self, since: int) -> Dict[str, Any]:
+        """Tags set or removed after version `since`
+
+        A since from before the last full load (including 0) or newer than
+        the current version returns the full table with full=True, so the
+        client replaces its copy instead of merging.
+        """
+        with self._lock:
+            full = since < self._base_version or since > self.version
+            if full:
+                tags = list(self._tags.values())
+                removed = []
+            else:
+                tags = [self._tags[appid] for appid, version in self._changed_at.items() if version > since]
+                removed = [appid for appid, version in self._removed_at.items() if version > since]
+            return {
+                "version": self.version,
+                "full": full,
+                "tags": tags,
+                "removed": removed
+            }
@@ -0,0 +1,299 @@
+"""
+VDF Parser
+Streaming parser for Steam's text VDF (KeyValues) format
+
+Works directly on bytes, or on an mmap of the file, so a large file is never
+decoded or copied as a whole; strings are decoded only when they are kept.
+An optional path filter, such as
+"UserLocalConfigStore/Software/Valve/Steam/apps/*/Playtime", keeps only the
+matching keys and skips every other subtree without building it.
+
+Quoted strings support the \\n, \\t, \\\\ and \\" escapes. // comments are
+skipped, and conditionals such as [$WIN32] are ignored, so a conditional
+key or value is always kept.
+
+parse_binary_vdf decodes the binary variant used by shortcuts.vdf.
+"""
+
+import mmap
+import re
+import struct
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Tuple, Union, Iterable
+
+# One match per entry: a key with its value or subtree opening, a subtree
+# end, or a comment/conditional to ignore. Matching key and value together
+# halves the matches the Python loop sees.
+_QUOTED = rb'"([^"\\]*(?:\\.[^"\\]*)*)"'
+_TOKEN = re.compile(
+    rb'(?:' + _QUOTED + rb'|([^\s{}"\[/][^\s{}"]*))'     # 1: quoted key, 2: bare key
+    rb'(?:\s*\[[^\]\n]*\])?\s*'                         # optional conditional
+    rb'(?:' + _QUOTED + rb'|(\{)|([^\s{}"]+))'           # 3: quoted value, 4: subtree, 5: bare value
+    rb'|(\})'                                            # 6: end of subtree
+    rb'|\[[^\]\n]*\]|//[^\n]*',                          # conditional or comment
+    re.DOTALL
+)
+_SUBTREE, _END = 4, 6
+
+# Everything up to the next brace outside strings and comments, in one match.
+# Alternatives are mutually exclusive so a malformed file can't backtrack badly.
+_NEXT_BRACE = re.compile(
+    rb'(?:[^{}"/]|"[^"\\]*(?:\\.[^"\\]*)*"|//[^\n]*(?![^\n])|/(?!/))*([{}])',
+    re.DOTALL
+)
+
+_ESCAPES = re.compile(rb'\\(.)', re.DOTALL)
+_ESCAPED = {b'n': b'\n', b't': b'\t', b'\\': b'\\', b'"': b'"'}
+
+PathFilter = Union[str, Iterable[str], None]
+
+
+def _unescape(raw: bytes) -> bytes:
+    if b'\\' in raw:
+        raw = _ESCAPES.sub(lambda m: _ESCAPED.get(m.group(1), m.group(0)), raw)
+    return raw
+
+
+def _decode(raw: bytes) -> str:
+    return _unescape(raw).decode('utf-8', errors='replace')
+
+
+class _FilterNode:
+    """One path segment of a compiled filter"""
+    __slots__ = ("children", "wildcard", "keep_all")
+
+    def __init__(self):
+        self.children: Dict[bytes, "_FilterNode"] = {}  # lower-cased key -> node
+        self.wildcard: Optional["_FilterNode"] = None  # node for a * segment
+        self.keep_all = False                           # a pattern ends here
+
+
+def _compile_filter(path_filter: PathFilter) -> Optional[_FilterNode]:
+    """Merge filter patterns into a trie of lower-cased byte segments"""
+    if path_filter is None:
+        return None
+    if isinstance(path_filter, str):
+        path_filter = [path_filter]
+    root = _FilterNode()
+    for pattern in path_filter:
+        node = root
+        for segment in pattern.strip('/').split('/'):
+            if segment == '*':
+                if node.wildcard is None:
+                    node.wildcard = _FilterNode()
+                node = node.wildcard
+            else:
+                node = node.children.setdefault(segment.lower().encode('utf-8'), _FilterNode())
+        node.keep_all = True
+    return root
+
+
+def _descend(nodes: Tuple[_FilterNode, ...], key: bytes) -> Optional[Tuple[_FilterNode, ...]]:
+    """Filter nodes matching a key: None keeps everything below it, () skips it"""
+    matched = []
+    lowered = None
+    for node in nodes:
+        if node.children:
+            if lowered is None:
+                lowered = _unescape(key).lower()   # Patterns match the decoded key
+            child = node.children.get(lowered)
+            if child is not None:
+                matched.append(child)
+        if node.wildcard is not None:
+            matched.append(node.wildcard)
+    for node in matched:
+        if node.keep_all:
+            return None
+    return tuple(matched)
+
+
+def _skip_subtree(data, pos: int) -> int:
+    """Position just after the brace closing the subtree opened before pos"""
+    # Anchored matches: each one starts where the last ended, and a failed
+    # match means no brace is left. finditer would retry the failed match
+    # at every later position, which is quadratic on a truncated file.
+    depth = 1
+    match = _NEXT_BRACE.match(data, pos)
+    while match:
+        if match.group(1) == b'{':
+            depth += 1
+        else:
+            depth -= 1
+            if depth == 0:
+                return match.end()
+        match = _NEXT_BRACE.match(data, match.end())
+    return len(data)
+
+
+def parse_vdf_bytes(data, path_filter: PathFilter = None) -> Dict[str, Any]:
+    """Parse VDF from a bytes-like object (bytes, bytearray, mmap)
+
+    With a path filter only matching keys are returned, nested as in the
+    file. Segments match keys case-insensitively, * matches any key, and a
+    pattern ending at a subtree keeps that whole subtree. Comments may
+    appear between entries, not between a key and its value.
+    """
+    root = _compile_filter(path_filter)
+    if root is None:
+        return _parse_all(data)
+
+    result: Dict[str, Any] = {}
+    current = result
+    nodes: Tuple[_FilterNode, ...] = (root,)   # Filter nodes matching the current subtree
+    parents: List[Tuple[Dict[str, Any], Any]] = []
+
+    pos = 0
+    while True:
+        for match in _TOKEN.finditer(data, pos):
+            kind = match.lastindex
+            if kind == _END:
+                if parents:
+                    current, nodes = parents.pop()
+                continue
+            if kind is None:
+                continue  # Comment or conditional
+
+            key = match.group(1)
+            if key is None:
+                key = match.group(2)
+            child_nodes = None if nodes is None else _descend(nodes, key)
+
+            if kind == _SUBTREE:
+                if child_nodes == ():
+                    # Unwanted subtree: jump past it without building anything
+                    pos = _skip_subtree(data, match.end())
+                    break
+                child: Dict[str, Any] = {}
+                current[_decode(key)] = child
+                parents.append((current, nodes))
+                current, nodes = child, child_nodes
+            elif child_nodes is None:
+                # Values are kept only where a pattern ends
+                current[_decode(key)] = _decode(match.group(kind))
+        else:
+            return result
+
+
+def _parse_all(data) -> Dict[str, Any]:
+    """parse_vdf_bytes without a filter; the hot loop has no filter checks"""
+    result: Dict[str, Any] = {}
+    current = result
+    parents: List[Dict[str, Any]] = []
+
+    for match in _TOKEN.finditer(data):
+        kind = match.lastindex
+        if kind == _END:
+            if parents:
+                current = parents.pop()
+            continue
+        if kind is None:
+            continue  # Comment or conditional
+
+        key = match.group(1)
+        if key is None:
+            key = match.group(2)
+        key = key.decode('utf-8', errors='replace') if b'\\' not in key else _decode(key)
+
+        if kind == _SUBTREE:
+            child: Dict[str, Any] = {}
+            current[key] = child
+            parents.append(current)
+            current = child
+        else:
+            value = match.group(kind)
+            current[key] = value.decode('utf-8', errors='replace') if b'\\' not in value else _decode(value)
+
+    return result
+
+
+def load_vdf(filepath: Path, path_filter: PathFilter = None) -> Dict[str, Any]:
+    """Parse a VDF file through an mmap; raises OSError if it can't be read"""
+    with open(filepath, 'rb') as f:
+        try:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            return {}  # Empty file
+        try:
+            return parse_vdf_bytes(mapped, path_filter)
+        finally:
+            mapped.close()
+
+
+# Binary VDF (shortcuts.vdf, appinfo-style KeyValues) type bytes
+_BIN_MAP, _BIN_STRING, _BIN_INT32, _BIN_FLOAT32 = 0x00, 0x01, 0x02, 0x03
+_BIN_POINTER, _BIN_WSTRING, _BIN_COLOR, _BIN_UINT64 = 0x04, 0x05, 0x06, 0x07
+_BIN_END, _BIN_INT64, _BIN_END_ALT = 0x08, 0x0A, 0x0B
+
+_INT32 = struct.Struct('<i')
+_FLOAT32 = struct.Struct('<f')
+_UINT64 = struct.Struct('<Q')
+_INT64 = struct.Struct('<q')
+_FIXED = {
+    _BIN_INT32: _INT32, _BIN_POINTER: _INT32, _BIN_COLOR: _INT32,
+    _BIN_FLOAT32: _FLOAT32, _BIN_UINT64: _UINT64, _BIN_INT64: _INT64,
+}
+
+
+def parse_binary_vdf(data) -> Dict[str, Any]:
+    """Parse binary VDF from a bytes-like object in a single pass
+
+    Numbers are read in place with struct.unpack_from and only keys and
+    string values are copied out. Raises ValueError on a truncated or
+    unknown entry, or when the data ends before the root map is closed.
+    """
+    find = data.find
+    size = len(data)
+    result: Dict[str, Any] = {}
+    current = result
+    parents: List[Dict[str, Any]] = []
+    pos = 0
+    closed = not size
+
+    while pos < size:
+        kind = data[pos]
+        pos += 1
+        if kind == _BIN_END or kind == _BIN_END_ALT:
+            if not parents:
+                closed = True
+                break  # End of the root map
+            current = parents.pop()
+            continue
+
+        end = find(b'\x00', pos)
+        if end < 0:
+            raise ValueError(f"Unterminated key at offset {pos}")
+        key = data[pos:end].decode('utf-8', errors='replace')
+        pos = end + 1
+
+        if kind == _BIN_MAP:
+            child: Dict[str, Any] = {}
+            current[key] = child
+            parents.append(current)
+            current = child
+        elif kind == _BIN_STRING:
+            end = find(b'\x00', pos)
+            if end < 0:
+                raise ValueError(f"Unterminated string for {key!r} at offset {pos}")
+            current[key] = data[pos:end].decode('utf-8', errors='replace')
+            pos = end + 1
+        elif kind == _BIN_WSTRING:
+            end = pos
+            while end + 1 < size and (data[end] or data[end + 1]):
+                end += 2
+            if end + 1 >= size:
+                raise ValueError(f"Unterminated wide string for {key!r} at offset {pos}")
+            current[key] = data[pos:end].decode('utf-16-le', errors='replace')
+            pos = end + 2
+        else:
+            fmt = _FIXED.get(kind)
+            if fmt is None:
+                raise ValueError(f"Unknown binary VDF type 0x{kind:02x} at offset {pos}")
+            if pos + fmt.size > size:
+                raise ValueError(f"Truncated value for {key!r} at offset {pos}")
+            current[key] = fmt.unpack_from(data, pos)[0]
+            pos += fmt.size
+
+    if not closed:
+        raise ValueError(f"Truncated binary VDF: {len(parents) + 1} map(s) not closed at offset {pos}")
+    return result
+
@@ -55,7 +55,13 @@ logger.info(f"sys.path: {sys.path[:5]}...")  # First 5 entries
 try:
     from database import Database
     from steam_data import SteamDataService
-    from hltb_service import HLTBService
+    from hltb_service import HLTBService, HLTBSearchError
+    from sync_engine import LibrarySyncEngine, compute_auto_tag, is_placeholder_name
+    from records import has_hltb_times
+    from hltb_refresher import HLTBRefresher
+    from scheduler import JobScheduler
+    from library_snapshot import LibrarySnapshot
+    from hltb_offline import iter_dump_batches
     logger.info("Backend modules imported successfully")
 except ImportError as e:
     logger.error(f"Import failed: {e}")
@@ -70,6 +76,8 @@ except ImportError as e:
         def __init__(self): pass
     class HLTBService:
         def __init__(self): pass
+    class HLTBSearchError(Exception):
+        pass
 
 
 class Plugin:
@@ -90,15 +98,35 @@ class Plugin:
         db_path = os.path.join(self.plugin_dir, "game_tracker.db")
         self.db = Database(db_path)
         await self.db.init_database()
+        await self.db.load_tag_cache()
 
         # Initialize services
         self.steam_service = SteamDataService()
         self.hltb_service = HLTBService()
+        if self.db.capabilities.get("fts5"):
+            # Imported HLTB dumps answer searches before the HLTB API
+            self.hltb_service.offline_lookup = self.db.search_hltb_offline
+
+        # Whole-library model behind get_library_snapshot
+        self.library_snapshot = LibrarySnapshot(self.db)
+
+        self.sync_engine = LibrarySyncEngine(
+            self.db, self.hltb_service,
+            resolve_name=lambda appid: Plugin._resolve_game_name(self, appid)
+        )
 
         # Initialize sync progress tracking
         self.sync_in_progress = False
         self.sync_current = 0
         self.sync_total = 0
+        self.hltb_import_in_progress = False
+
+        # Refreshes aging HLTB cache entries while no sync is running
+        self.hltb_refresher = HLTBRefresher(
+            self.db, self.hltb_service,
+            is_busy=lambda: self.sync_in_progress,
+            retag=lambda appids: Plugin._retag_games(self, appids)
+        )
 
         logger.info("Plugin initialized successfully")
 
@@ -106,100 +134,56 @@ class Plugin:
         # This ensures we use real-time playtime/achievement data from Steam's frontend API.
         logger.info("Plugin ready. Sync will be triggered by frontend with real-time data.")
 
-        # Start background task for daily dropped game check
-        self.dropped_task = asyncio.create_task(self._dropped_games_checker())
-        logger.info("Started background task for dropped games checking")
+        # Background jobs; last runs are persisted, so reloads keep the schedule
+        self.scheduler = JobScheduler(self.db)
+        self.scheduler.register(
+            "dropped_check", lambda: Plugin._check_and_tag_dropped_games(self),
+            interval=24 * 60 * 60, startup_delay=60 * 60
+        )
+        self.scheduler.register(
+            "hltb_refresh", self.hltb_refresher.run_job,
+            interval=self.hltb_refresher.idle_interval, startup_delay=5 * 60, adaptive=True
+        )
+        self.scheduler.register(
+            "db_maintenance", self.db.run_maintenance,
+            interval=7 * 24 * 60 * 60, startup_delay=30 * 60
+        )
+        await self.scheduler.start()
 
     async def _unload(self):
         """Cleanup on plugin unload"""
         logger.info("Unloading plugin...")
 
-        # Cancel background task
-        if hasattr(self, 'dropped_task'):
-            self.dropped_task.cancel()
-            try:
-                await self.dropped_task
-            except asyncio.CancelledError:
-                pass
-            logger.info("Stopped background task for dropped games checking")
+        # Cancel background jobs
+        if hasattr(self, 'scheduler'):
+            await self.scheduler.stop()
+
+        if hasattr(self, 'hltb_service'):
+            self.hltb_service.close()
 
         if hasattr(self, 'db'):
             await self.db.close()
 
-    async def _dropped_games_checker(self):
-        """Background task that runs daily to check and tag dropped games"""
-        logger.info("Dropped games checker task started")
-
-        # Wait 1 hour after plugin load before first check (let things settle)
-        await asyncio.sleep(3600)
-
-        while True:
-            try:
-                logger.info("Running daily dropped games check...")
-                dropped_count = await self._check_and_tag_dropped_games()
-                logger.info(f"Dropped games check complete: {dropped_count} games tagged as dropped")
-
-                # Sleep for 24 hours until next check
-                await asyncio.sleep(24 * 60 * 60)
-
-            except asyncio.CancelledError:
-                logger.info("Dropped games checker task cancelled")
-                break
-            except Exception as e:
-                logger.error(f"Error in dropped games checker: {e}")
-                import traceback
-                logger.error(traceback.format_exc())
-                # Wait 1 hour before retrying on error
-                await asyncio.sleep(3600)
-
     async def _check_and_tag_dropped_games(self, days_threshold: int = 365) -> int:
-        """Check database for games that should be tagged as dropped
+        """Tag games that should now be dropped
 
-        Finds games where:
+        Tags games where:
         - rt_last_time_played exists and is older than days_threshold
         - Game is not hidden
         - Game is not manually tagged
         - Game is not completed/mastered (either no tag or in_progress)
-        - Game is not already dropped
 
-        Returns count of games newly tagged as dropped
+        The whole transition is one statement in the database.
+        Returns count of games newly tagged as dropped. Errors propagate so
+        the scheduler records the failed run and retries it.
         """
         logger.info(f"Checking for games not played in {days_threshold} days...")
 
-        try:
-            # Get eligible games from database
-            eligible_games = await self.db.get_games_eligible_for_dropped(days_threshold)
-            logger.info(f"Found {len(eligible_games)} games eligible for dropped tagging")
-
-            if not eligible_games:
-                return 0
-
-            dropped_count = 0
-            for game in eligible_games:
-                appid = game['appid']
-                game_name = game['game_name']
-                rt_last_time_played = game['rt_last_time_played']
-
-                # Calculate days since played for logging
-                import time
-                current_time = int(time.time())
-                days_since_played = (current_time - rt_last_time_played) / (24 * 60 * 60)
-
-                # Tag as dropped
-                success = await self.db.set_tag(appid, 'dropped', is_manual=False)
-                if success:
-                    dropped_count += 1
-                    logger.info(f"Tagged as dropped: {game_name} (appid={appid}, not played for {days_since_played:.0f} days)")
-                else:
-                    logger.error(f"Failed to tag as dropped: {game_name} (appid={appid})")
-
-            return dropped_count
-
-        except Exception as e:
-            logger.error(f"Error checking dropped games: {e}")
-            import traceback
-            logger.error(traceback.format_exc())
-            return 0
+        appids = await self.db.tag_dropped_games(days_threshold)
+        if appids:
+            logger.info(f"Tagged {len(appids)} games as dropped: {', '.join(appids[:20])}"
+                        + (" ..." if len(appids) > 20 else ""))
+        return len(appids)
 
     # ==================== Tag Calculation Logic ====================
 
@@ -222,46 +206,21 @@ class Plugin:
         # Get HLTB data
         hltb = await self.db.get_hltb_cache(appid)
 
-        # Get settings
-        settings = await self.db.get_all_settings()
-        in_progress_threshold = settings.get('in_progress_threshold', 30)  # Default 30 min
-
-        # Priority 1: Mastered (>=85% achievements)
-        # Calculate percentage from total/unlocked since it's not stored in DB
-        total_achievements = stats.get('total_achievements', 0)
-        unlocked_achievements = stats.get('unlocked_achievements', 0)
-        if total_achievements > 0:
-            achievement_percentage = (unlocked_achievements / total_achievements) * 100
-        else:
-            achievement_percentage = 0
-
-        if achievement_percentage >= 85:
-            return "mastered"
-
-        # Priority 2: Completed (beat main story - playtime >= main_story)
-        if hltb and hltb.get('main_story'):
-            main_story_hours = hltb['main_story']
-            main_story_minutes = main_story_hours * 60
-
-            if stats['playtime_minutes'] >= main_story_minutes:
-                return "completed"
+        settings = await self.db.get_settings()
 
-        # Priority 3: Dropped (not played for over 1 year)
-        # Only check if game was played before (has rt_last_time_played)
-        # Don't override mastered/completed above
-        rt_last_time_played = stats.get('rt_last_time_played')
-        if rt_last_time_played and rt_last_time_played > 0:
-            import time
-            current_time = int(time.time())
-            one_year_seconds = 365 * 24 * 60 * 60
-            if current_time - rt_last_time_played > one_year_seconds:
-                return "dropped"
+        return compute_auto_tag(stats, hltb, settings.in_progress_threshold)
 
-        # Priority 4: In Progress (played >= threshold)
-        if stats['playtime_minutes'] >= in_progress_threshold:
-            return "in_progress"
-
-        return None  # No tag (backlog)
+    async def _retag_games(self, appids: List[str]):
+        """Re-evaluate automatic tags from stored stats (after their HLTB data changed)"""
+        for appid in appids:
+            current_tag = await self.db.get_tag(appid)
+            if current_tag and current_tag.get('is_manual'):
+                continue
+            new_tag = await Plugin.calculate_auto_tag(self, appid)
+            current_tag_value = current_tag.get('tag') if current_tag else None
+            if new_tag and new_tag != current_tag_value:
+                await self.db.set_tag(appid, new_tag, is_manual=False)
+                logger.info(f"  -> Tag set after HLTB refresh: {appid} {new_tag}")
 
     async def sync_game_tags(self, appid: str, force: bool = False) -> Dict[str, Any]:
         """Sync tags for a single game"""
@@ -271,7 +230,7 @@ class Plugin:
 
             # Skip if manual override and not forcing
             if current_tag and current_tag.get('is_manual') and not force:
-                return current_tag
+                return current_tag.to_dict()
 
             # Fetch fresh game stats
             stats = await self.steam_service.get_game_stats_full(appid)
@@ -283,11 +242,18 @@ class Plugin:
 
             # Fetch HLTB data if not cached
             cached_hltb = await self.db.get_hltb_cache(appid)
-            if not cached_hltb:
-                hltb_data = await self.hltb_service.search_game(stats['game_name'])
-                if hltb_data:
-                    await self.db.cache_hltb_data(appid, hltb_data)
-                    cached_hltb = hltb_data
+            if not cached_hltb and not await self.db.is_hltb_miss_active(appid):
+                try:
+                    hltb_data = await self.hltb_service.search_game(stats['game_name'])
+                except HLTBSearchError as e:
+                    # Not a miss: leave it uncached so the next sync retries
+                    logger.warning(f"  HLTB lookup failed: {e}")
+                else:
+                    if has_hltb_times(hltb_data):
+                        await self.db.cache_hltb_data(appid, hltb_data)
+                        cached_hltb = hltb_data
+                    else:
+                        await self.db.record_hltb_miss(appid, stats['game_name'])
 
             # Log HLTB info
             if cached_hltb:
@@ -309,7 +275,8 @@ class Plugin:
                     await self.db.set_tag(appid, new_tag, is_manual=False)
                     logger.info(f"  -> Tag set: {new_tag} (reset_manual={force and is_currently_manual})")
 
-            return await self.db.get_tag(appid) or {}
+            tag = await self.db.get_tag(appid)
+            return tag.to_dict() if tag else {}
 
         except Exception as e:
             logger.error(f"Failed to sync tags for {appid}: {e}")
@@ -341,12 +308,12 @@ class Plugin:
     async def get_game_tag(self, appid) -> Dict[str, Any]:
         """Get tag for a specific game"""
         appid = self._extract_appid(appid)
-        logger.info(f"=== get_game_tag called: appid={appid} ===")
         try:
+            # Called per library tile; served from the tag cache, so keep it quiet
             tag = await self.db.get_tag(appid)
-            logger.info(f"[get_game_tag] appid={appid}, tag={tag}")
+            logger.debug(f"[get_game_tag] appid={appid}, tag={tag}")
             if tag:
-                return {"success": True, "tag": tag}
+                return {"success": True, "tag": tag.to_dict()}
             return {"success": True, "tag": None}
         except Exception as e:
             logger.error(f"Error getting tag for {appid}: {e}")
@@ -354,6 +321,50 @@ class Plugin:
             logger.error(traceback.format_exc())
             return {"success": False, "error": str(e)}
 
+    async def get_tags_since(self, version_or_params=0) -> Dict[str, Any]:
+        """Get tags that changed after a tag cache version
+
+        Pass version 0 for the full table. The response carries the new
+        version to send next time; full=True means replace, not merge.
+        """
+        if isinstance(version_or_params, dict):
+            version = version_or_params.get('version', 0)
+        else:
+            version = version_or_params
+        try:
+            changes = await self.db.get_tags_since(int(version or 0))
+            return {
+                "success": True,
+                "version": changes["version"],
+                "full": changes["full"],
+                "tags": [record.to_dict() for record in changes["tags"]],
+                "removed": changes["removed"]
+            }
+        except Exception as e:
+            logger.error(f"Error getting tags since version {version}: {e}")
+            return {"success": False, "error": str(e)}
+
+    async def get_library_snapshot(self, version_or_params=None) -> Dict[str, Any]:
+        """Get the whole library in one call as parallel columns
+
+        appids, tags (codes, see tag_names), manual (0/1), names and
+        hltb_hours line up by index; stats holds the tag counts. Pass the
+        version from the last response: if nothing changed since, only
+        {"version", "unchanged": True} comes back.
+        """
+        if isinstance(version_or_params, dict):
+            version = version_or_params.get('version')
+        else:
+            version = version_or_params
+        try:
+            snapshot = await self.library_snapshot.get(str(version) if version else None)
+            return {"success": True, **snapshot}
+        except Exception as e:
+            logger.error(f"Error building library snapshot: {e}")
+            import traceback
+            logger.error(traceback.format_exc())
+            return {"success": False, "error": str(e)}
+
     async def set_manual_tag(self, appid_or_params, tag: str = None) -> Dict[str, bool]:
         """Manually set/override tag"""
         # Extract params - Decky may pass {appid, tag} as single dict
@@ -416,6 +427,8 @@ class Plugin:
             # Get stats
             stats = await self.db.get_game_stats(appid)
             logger.info(f"[get_game_details] stats from db: {stats}")
+            if stats:
+                stats = stats.to_dict()
 
             # If no stats, fetch from Steam
             if not stats:
@@ -446,8 +459,8 @@ class Plugin:
                 "success": True,
                 "appid": appid,
                 "stats": stats,
-                "tag": tag,
-                "hltb_data": hltb_data
+                "tag": tag.to_dict() if tag else None,
+                "hltb_data": hltb_data.to_dict() if hltb_data else None
             }
             logger.info(f"[get_game_details] returning: success=True")
             return result
@@ -470,8 +483,8 @@ class Plugin:
     async def update_settings(self, settings: Dict[str, Any]) -> Dict[str, bool]:
         """Update plugin settings"""
         try:
-            for key, value in settings.items():
-                await self.db.set_setting(key, value)
+            if not await self.db.set_settings_many(settings):
+                return {"success": False, "error": "Failed to save settings"}
 
             logger.info(f"Settings updated: {settings}")
             return {"success": True}
@@ -483,42 +496,8 @@ class Plugin:
         """Get counts per tag type"""
         logger.info("=== get_tag_statistics called ===")
         try:
-            all_tags = await self.db.get_all_tags()
-            logger.info(f"[get_tag_statistics] all_tags count: {len(all_tags) if all_tags else 0}")
-            if all_tags:
-                logger.info(f"[get_tag_statistics] all_tags sample (first 3): {all_tags[:3]}")
-
             # Exclude hidden games from statistics (non-Steam apps without HLTB data)
-            all_games = await self.db.get_all_game_stats(include_hidden=False)
-            total_library = len(all_games) if all_games else 0
-            logger.info(f"[get_tag_statistics] total_library (visible games): {total_library}")
-
-            # Count tags only for non-hidden games
-            visible_tags = 0
-            tag_counts = {
-                "completed": 0,
-                "in_progress": 0,
-                "mastered": 0,
-                "dropped": 0,
-            }
-
-            for tag_entry in all_tags:
-                appid = tag_entry.get('appid')
-                # Check if this game is hidden
-                game_stats = await self.db.get_game_stats(appid)
-                if game_stats and game_stats.get('is_hidden'):
-                    continue  # Skip hidden games
-
-                tag_type = tag_entry.get('tag')
-                if tag_type in tag_counts:
-                    tag_counts[tag_type] += 1
-                    visible_tags += 1
-
-            stats = {
-                **tag_counts,
-                "backlog": total_library - visible_tags,
-                "total": total_library
-            }
+            stats = await self.db.get_tag_counts(include_hidden=False)
 
             result = {"success": True, "stats": stats}
             logger.info(f"[get_tag_statistics] returning: {result}")
@@ -577,26 +556,12 @@ class Plugin:
                 self.sync_current = current_index
                 self.sync_total = total_count
 
-            # Extract game data
-            playtime_minutes = int(game_data.get('playtime_minutes', 0))
-            rt_last_time_played = game_data.get('rt_last_time_played')
-
-            # Extract achievement data if present
-            if achievement_data and achievement_data.get('total', 0) > 0:
-                total_achievements = achievement_data.get('total')
-                unlocked_achievements = achievement_data.get('unlocked', 0)
-                achievement_percentage = achievement_data.get('percentage', 0.0)
-            else:
-                total_achievements = None
-                unlocked_achievements = None
-                achievement_percentage = None
-
-            # Process the game
-            result = await Plugin.sync_game_with_playtime(
-                self, appid, playtime_minutes,
-                total_achievements, unlocked_achievements, achievement_percentage,
-                game_name, rt_last_time_played
+            # Same path as a bulk sync of one game, so an unchanged game is
+            # skipped by its fingerprint and a synced one stores a new fingerprint
+            entries = Plugin._build_sync_entries(
+                self, {appid: game_data}, {appid: achievement_data}, {appid: game_name}
             )
+            result = await self.sync_engine.run(entries)
 
             # Clear sync progress if this was the last game
             if is_bulk_sync and current_index >= total_count:
@@ -604,11 +569,20 @@ class Plugin:
                 self.sync_current = 0
                 self.sync_total = 0
 
+            if not result.get("success"):
+                return {"success": False, "error": result.get("error", "Sync failed")}
+
+            tag = result["changed"].get(appid)
+            if tag is None:
+                current_tag = await self.db.get_tag(appid)
+                tag = current_tag.get('tag') if current_tag else None
+
             return {
                 "success": True,
                 "appid": appid,
-                "tag_changed": result.get('tag_changed', False),
-                "tag": result.get('tag')
+                "tag_changed": appid in result["changed"],
+                "tag": tag,
+                "skipped": result["skipped"] > 0
             }
 
         except Exception as e:
@@ -617,14 +591,61 @@ class Plugin:
             logger.error(traceback.format_exc())
             return {"success": False, "error": str(e)}
 
+    async def sync_games_chunk(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Sync one chunk of games for progressive sync
+
+        Takes the same game_data, achievement_data and game_names maps as
+        sync_library_with_playtime for one chunk (about 100 games), plus the
+        chunk's offset and the total_count of the whole sync so
+        get_sync_progress covers every chunk. Returns the bulk sync result;
+        `changed` maps each appid whose tag changed to its new tag.
+        """
+        game_data = params.get('game_data', {})
+        achievement_data = params.get('achievement_data', {})
+        game_names = params.get('game_names', {})
+        offset = int(params.get('offset', 0))
+        total_count = int(params.get('total_count', len(game_data)))
+        is_last_chunk = offset + len(game_data) >= total_count
+
+        logger.info(f"=== sync_games_chunk called: games {offset + 1}-{offset + len(game_data)} of {total_count} ===")
+
+        try:
+            entries = Plugin._build_sync_entries(self, game_data, achievement_data, game_names)
+
+            self.sync_in_progress = True
+            self.sync_current = offset
+            self.sync_total = total_count
+
+            def on_progress(current: int):
+                self.sync_current = offset + current
+
+            result = await self.sync_engine.run(entries, on_progress=on_progress)
+
+            if is_last_chunk:
+                self.sync_in_progress = False
+                self.sync_current = 0
+                self.sync_total = 0
+
+            return result
+
+        except Exception as e:
+            logger.error(f"sync_games_chunk failed at offset {offset}: {e}")
+            import traceback
+            logger.error(traceback.format_exc())
+            if is_last_chunk:
+                self.sync_in_progress = False
+                self.sync_current = 0
+                self.sync_total = 0
+            return {"success": False, "error": str(e)}
+
     async def get_all_games(self) -> Dict[str, Any]:
         """Get list of all games for frontend to fetch playtime"""
         logger.info("=== get_all_games called (frontend requesting game list) ===")
         try:
             # Get source settings
-            settings = await self.db.get_all_settings()
-            source_installed = settings.get('source_installed', True)
-            source_non_steam = settings.get('source_non_steam', False)
+            settings = await self.db.get_settings()
+            source_installed = settings.source_installed
+            source_non_steam = settings.source_non_steam
 
             logger.info(f"Game sources: installed={source_installed}, non_steam={source_non_steam}")
 
@@ -682,100 +703,28 @@ class Plugin:
 
             # Only sync games that were passed in game_data
             # This prevents single-game syncs from overwriting all other games with zeros
-            appids_to_sync = list(game_data.keys())
-            total = len(appids_to_sync)
-            synced = 0
-            new_tags = 0  # Track newly tagged games for notifications
-            errors = 0
-            error_list = []
+            entries = Plugin._build_sync_entries(self, game_data, achievement_data, game_names)
 
             # Set sync progress for universal tracking
             self.sync_in_progress = True
             self.sync_current = 0
-            self.sync_total = total
-
-            hltb_requests = 0  # Track HLTB API requests for rate limiting
-
-            for i, appid in enumerate(appids_to_sync):
-                # Get game name from frontend (works for uninstalled games!)
-                game_name = game_names.get(appid, None)
-
-                # Extract game data from new structure
-                game_info = game_data.get(appid, {})
-                if isinstance(game_info, dict):
-                    playtime_minutes = int(game_info.get('playtime_minutes', 0))
-                    rt_last_time_played = game_info.get('rt_last_time_played')
-                elif isinstance(game_info, (int, float)):
-                    # Backwards compatibility: if old format passes just int/float
-                    playtime_minutes = int(game_info)
-                    rt_last_time_played = None
-                else:
-                    logger.warning(f"Unexpected game_info type for {appid}: {type(game_info)} = {game_info}")
-                    playtime_minutes = 0
-                    rt_last_time_played = None
-
-                # Get achievement data from frontend (None if not available)
-                # We only pass data if we have actual achievement info (total > 0)
-                # Otherwise pass None to preserve existing DB values
-                game_achievements = achievement_data.get(appid)
-                if isinstance(game_achievements, dict) and game_achievements.get('total', 0) > 0:
-                    total_achievements = game_achievements.get('total')
-                    unlocked_achievements = game_achievements.get('unlocked', 0)
-                    achievement_percentage = game_achievements.get('percentage', 0.0)
-                else:
-                    # No achievement data from frontend - pass None to preserve existing
-                    total_achievements = None
-                    unlocked_achievements = None
-                    achievement_percentage = None
-
-                # Log progress every 50 games to reduce log spam
-                if i % 50 == 0 or i == total - 1:
-                    logger.info(f"[{i+1}/{total}] Progress: syncing game {appid} ({game_name or 'unknown'})")
+            self.sync_total = len(entries)
 
-                try:
-                    # Check if we need to fetch HLTB (no cache and has playtime)
-                    cached_hltb = await self.db.get_hltb_cache(appid)
-                    needs_hltb = not cached_hltb and playtime_minutes > 0
-
-                    result = await Plugin.sync_game_with_playtime(self, appid, playtime_minutes, total_achievements, unlocked_achievements, achievement_percentage, game_name, rt_last_time_played)
-                    synced += 1
-
-                    # Update sync progress
-                    self.sync_current = i + 1
-
-                    # Track if this game got a new/changed tag
-                    if result.get('tag_changed'):
-                        new_tags += 1
-
-                    # Only add delay when we actually made an HLTB request
-                    if needs_hltb:
-                        hltb_requests += 1
-                        # Rate limit: delay every 5 HLTB requests
-                        if hltb_requests % 5 == 0:
-                            await asyncio.sleep(1.0)
+            def on_progress(current: int):
+                self.sync_current = current
 
-                except Exception as e:
-                    errors += 1
-                    error_list.append({"appid": appid, "error": str(e)})
-                    logger.error(f"[{i+1}/{total}] Failed: {game_name} - {e}")
-                    # Update progress even on error
-                    self.sync_current = i + 1
+            result = await self.sync_engine.run(entries, on_progress=on_progress)
 
-            logger.info(f"Library sync completed: {synced}/{total} synced, {new_tags} new tags, {errors} errors")
+            logger.info(f"Library sync completed: {result.get('synced', 0)}/{len(entries)} synced, "
+                        f"{result.get('skipped', 0)} unchanged, "
+                        f"{result.get('new_tags', 0)} new tags, {result.get('errors', 0)} errors")
 
             # Clear sync progress
             self.sync_in_progress = False
             self.sync_current = 0
             self.sync_total = 0
 
-            return {
-                "success": True,
-                "total": total,
-                "synced": synced,
-                "new_tags": new_tags,  # New field for notification purposes
-                "errors": errors,
-                "error_details": error_list[:10]
-            }
+            return result
 
         except Exception as e:
             logger.error(f"sync_library_with_playtime failed: {e}")
@@ -787,6 +736,60 @@ class Plugin:
             self.sync_total = 0
             return {"success": False, "error": str(e)}
 
+    def _build_sync_entries(self, game_data: Dict[str, Any], achievement_data: Dict[str, Any],
+                            game_names: Dict[str, str]) -> List[Dict[str, Any]]:
+        """Convert frontend game/achievement/name maps into LibrarySyncEngine entries"""
+        entries = []
+        for appid, game_info in game_data.items():
+            # Extract game data from new structure
+            if isinstance(game_info, dict):
+                playtime_minutes = int(game_info.get('playtime_minutes', 0))
+                rt_last_time_played = game_info.get('rt_last_time_played')
+            elif isinstance(game_info, (int, float)):
+                # Backwards compatibility: if old format passes just int/float
+                playtime_minutes = int(game_info)
+                rt_last_time_played = None
+            else:
+                logger.warning(f"Unexpected game_info type for {appid}: {type(game_info)} = {game_info}")
+                playtime_minutes = 0
+                rt_last_time_played = None
+
+            # Get achievement data from frontend (None if not available)
+            # We only pass data if we have actual achievement info (total > 0)
+            # Otherwise pass None to preserve existing DB values
+            game_achievements = (achievement_data or {}).get(appid)
+            if isinstance(game_achievements, dict) and game_achievements.get('total', 0) > 0:
+                total_achievements = game_achievements.get('total')
+                unlocked_achievements = game_achievements.get('unlocked', 0)
+            else:
+                total_achievements = None
+                unlocked_achievements = None
+
+            entries.append({
+                "appid": str(appid),
+                # Game name from frontend works for uninstalled games!
+                "game_name": (game_names or {}).get(appid),
+                "playtime_minutes": playtime_minutes,
+                "rt_last_time_played": rt_last_time_played,
+                "total_achievements": total_achievements,
+                "unlocked_achievements": unlocked_achievements
+            })
+        return entries
+
+    async def _resolve_game_name(self, appid: str) -> str:
+        """Resolve a game name without frontend data"""
+        # Get game name from steam service (local appmanifest)
+        game_name = await self.steam_service.get_game_name(appid)
+
+        # If still not found locally (uninstalled game), try Steam Store API
+        if not game_name or game_name.startswith('Unknown Game') or game_name.startswith('Game '):
+            store_name = await Plugin._fetch_game_name_from_steam_store(self, appid)
+            if store_name:
+                game_name = store_name
+                logger.info(f"  Got name from Steam Store: {game_name}")
+
+        return game_name
+
     async def _fetch_game_name_from_steam_store(self, appid: str) -> Optional[str]:
         """Fetch game name from Steam's store API (works for uninstalled games)"""
         import urllib.request
@@ -805,205 +808,78 @@ class Plugin:
 
         return None
 
-    async def sync_game_with_playtime(self, appid: str, playtime_minutes: int, total_achievements: int = None, unlocked_achievements: int = None, achievement_percentage: float = None, frontend_game_name: str = None, rt_last_time_played: int = None) -> Dict[str, Any]:
-        """Sync a single game using frontend-provided playtime, achievements, name, and last played timestamp
-
-        NOTE: Achievement params can be None if frontend doesn't have data.
-        In that case, we preserve existing achievement data in DB.
+    def _extract_page_params(self, params) -> Dict[str, Any]:
+        """Extract offset/limit/tags list parameters (all optional)"""
+        params = params if isinstance(params, dict) else {}
+        offset = max(int(params.get('offset') or 0), 0)
+        limit = params.get('limit')
+        limit = int(limit) if limit is not None else None
+        tags = params.get('tags')
+        if isinstance(tags, str):
+            tags = [tags]
+        return {"offset": offset, "limit": limit, "tags": tags or None}
+
+    async def _fill_missing_names(self, games: List[Dict[str, Any]]):
+        """Resolve placeholder names for the rows of one page"""
+        for game in games:
+            if is_placeholder_name(game.get('game_name')):
+                game['game_name'] = await self.steam_service.get_game_name(game['appid'])
+
+    async def get_all_tags_with_names(self, params: Dict[str, Any] = None) -> Dict[str, Any]:
+        """Get tagged games with names for display
+
+        Optional params: offset, limit and tags (list of tag names to include).
+        Sorted by tag type, then by name. Returns the unpaged total as well.
         """
-
-        # Get current tag
-        current_tag = await self.db.get_tag(appid)
-        is_manual = current_tag and current_tag.get('is_manual')
-
-        # Get existing stats to preserve achievement data if frontend doesn't have it
-        existing_stats = await self.db.get_game_stats(appid)
-
-        # Use game name from frontend if provided (works for uninstalled games!)
-        if frontend_game_name:
-            game_name = frontend_game_name
-        else:
-            # Fallback: Get game name from steam service (local appmanifest)
-            game_name = await self.steam_service.get_game_name(appid)
-
-            # If still not found locally (uninstalled game), try Steam Store API
-            if not game_name or game_name.startswith('Unknown Game') or game_name.startswith('Game '):
-                store_name = await self._fetch_game_name_from_steam_store(appid)
-                if store_name:
-                    game_name = store_name
-                    logger.info(f"  Got name from Steam Store: {game_name}")
-
-        # Check if this is a non-Steam game (appid > 2 billion = CRC32 hash)
         try:
-            appid_int = int(appid)
-            is_non_steam = appid_int > 2000000000
-        except (ValueError, TypeError):
-            is_non_steam = False
-
-        # Fetch HLTB if needed (do this before building stats so we can set is_hidden)
-        # Retry HLTB lookup if:
-        # 1. No cache exists at all
-        # 2. Cache exists but has no main_story data (might have failed before)
-        cached_hltb = await self.db.get_hltb_cache(appid)
-        should_fetch_hltb = not cached_hltb or not cached_hltb.get('main_story')
-
-        if should_fetch_hltb:
-            logger.info(f"  Fetching HLTB for: {game_name} (cached={bool(cached_hltb)}, has_main_story={cached_hltb.get('main_story') if cached_hltb else None})")
-            hltb_data = await self.hltb_service.search_game(game_name)
-            if hltb_data and hltb_data.get('main_story'):
-                # Only cache if we got actual completion time data
-                await self.db.cache_hltb_data(appid, hltb_data)
-                cached_hltb = hltb_data
-                logger.info(f"  HLTB cached: main_story={hltb_data.get('main_story')}h")
-
-        # Determine if this game should be hidden from library
-        # Hide non-Steam apps that have no HLTB data (likely not real games: Discord, Chrome, etc.)
-        is_hidden = is_non_steam and not cached_hltb
-
-        # Build stats object with frontend playtime and achievements
-        # If frontend doesn't have achievement data (None), preserve existing DB values
-        final_total_achievements = total_achievements if total_achievements is not None else (existing_stats.get('total_achievements', 0) if existing_stats else 0)
-        final_unlocked_achievements = unlocked_achievements if unlocked_achievements is not None else (existing_stats.get('unlocked_achievements', 0) if existing_stats else 0)
-        final_achievement_percentage = achievement_percentage if achievement_percentage is not None else (existing_stats.get('achievement_percentage', 0.0) if existing_stats else 0.0)
-
-        stats = {
-            "appid": appid,
-            "game_name": game_name,
-            "playtime_minutes": playtime_minutes,  # From frontend!
-            "total_achievements": final_total_achievements,
-            "unlocked_achievements": final_unlocked_achievements,
-            "achievement_percentage": round(final_achievement_percentage, 2),
-            "is_hidden": is_hidden,
-            "rt_last_time_played": rt_last_time_played  # Unix timestamp of last play
-        }
-
-        await self.db.update_game_stats(appid, stats)
+            page = self._extract_page_params(params)
+            result = await self.db.list_tagged_games(page["tags"], page["offset"], page["limit"])
+            await Plugin._fill_missing_names(self, result["games"])
 
-        logger.info(f"  Stats: playtime={playtime_minutes}min, " +
-                    f"achievements={final_unlocked_achievements}/{final_total_achievements}" +
-                    (f", HIDDEN (non-Steam app without HLTB)" if is_hidden else "") +
-                    (f", last_played={rt_last_time_played}" if rt_last_time_played else ""))
-
-        if cached_hltb:
-            logger.info(f"  HLTB: main={cached_hltb.get('main_story')}h, extra={cached_hltb.get('main_extra')}h")
-        else:
-            logger.info(f"  HLTB: no data")
-
-        # Calculate tag (but don't override manual tags or hidden games)
-        tag_changed = False
-
-        if is_manual:
-            logger.info(f"  Skipping tag calculation (manual override)")
-        elif is_hidden:
-            logger.info(f"  Skipping tag calculation (hidden non-Steam app)")
-        else:
-            # Calculate tag using centralized logic
-            calculated_tag = await Plugin.calculate_auto_tag(self, appid)
-            logger.info(f"  Calculated tag: {calculated_tag or 'none'}")
-
-            # Apply calculated tag if it changed
-            if calculated_tag:
-                current_tag_value = current_tag.get('tag') if current_tag else None
-                if calculated_tag != current_tag_value:
-                    await self.db.set_tag(appid, calculated_tag, is_manual=False)
-                    logger.info(f"  -> Tag set: {calculated_tag}")
-                    tag_changed = True
-
-        result = await self.db.get_tag(appid) or {}
-        result['tag_changed'] = tag_changed
-        return result
-
-    async def get_all_tags_with_names(self) -> Dict[str, Any]:
-        """Get all tags with game names for display"""
-        logger.info("=== get_all_tags_with_names called ===")
-        try:
-            all_tags = await self.db.get_all_tags()
-            logger.info(f"[get_all_tags_with_names] all_tags count: {len(all_tags) if all_tags else 0}")
-            if all_tags:
-                logger.info(f"[get_all_tags_with_names] all_tags sample (first 3): {all_tags[:3]}")
-
-            result = []
-            for tag_entry in all_tags:
-                logger.info(f"[get_all_tags_with_names] tag_entry: {tag_entry}")
-                appid = tag_entry['appid']
-                stats = await self.db.get_game_stats(appid)
-                logger.info(f"[get_all_tags_with_names] stats: {stats}")
-
-                # Skip hidden games UNLESS they have a manual tag
-                # (user explicitly tagged them, so they want to see them)
-                is_hidden = stats.get('is_hidden', False) if stats else False
-                is_manual = tag_entry.get('is_manual', False)
-                if is_hidden and not is_manual:
-                    logger.info(f"[get_all_tags_with_names] skipping hidden non-Steam app: {appid}")
-                    continue
-
-                game_name = stats.get('game_name') if stats else None
-                logger.info(f"[get_all_tags_with_names] game_name: {game_name}")
-
-                # If no name in stats, try to get it from Steam/shortcuts
-                if not game_name or game_name.startswith('Unknown Game') or game_name.startswith('Game '):
-                    game_name = await self.steam_service.get_game_name(appid)
-
-                result.append({
-                    'appid': appid,
-                    'game_name': game_name,
-                    'tag': tag_entry['tag'],
-                    'is_manual': is_manual
-                })
-
-            # Sort by tag type, then by name
-            tag_order = {'completed': 0, 'mastered': 1, 'in_progress': 2, 'dropped': 3}
-            result.sort(key=lambda x: (tag_order.get(x['tag'], 99), x['game_name'].lower()))
-
-            logger.info(f"[get_all_tags_with_names] returning {len(result)} games")
-            if result:
-                logger.info(f"[get_all_tags_with_names] result sample (first 3): {result[:3]}")
-            return {'success': True, 'games': result}
+            logger.info(f"[get_all_tags_with_names] returning {len(result['games'])}/{result['total']} games "
+                        f"(offset={page['offset']}, limit={page['limit']}, tags={page['tags']})")
+            return {
+                'success': True,
+                'games': result["games"],
+                'total': result["total"],
+                'offset': page["offset"],
+                'limit': page["limit"]
+            }
         except Exception as e:
             logger.error(f"Error getting all tags with names: {e}")
             import traceback
             logger.error(traceback.format_exc())
             return {'success': False, 'error': str(e)}
 
-    async def get_backlog_games(self) -> Dict[str, Any]:
-        """Get all games without a tag (backlog games)"""
-        logger.info("=== get_backlog_games called ===")
+    async def get_backlog_games(self, params: Dict[str, Any] = None) -> Dict[str, Any]:
+        """Get games without a tag (backlog games)
+
+        Optional params: offset and limit. Sorted by name. Returns the unpaged total as well.
+        """
         try:
-            # Get all tagged appids
-            all_tags = await self.db.get_all_tags()
-            tagged_appids = set(tag['appid'] for tag in all_tags) if all_tags else set()
-            logger.info(f"[get_backlog_games] tagged_appids count: {len(tagged_appids)}")
-
-            # Get all games from stats (excluding hidden games)
-            all_game_stats = await self.db.get_all_game_stats(include_hidden=False)
-            logger.info(f"[get_backlog_games] all_game_stats count (visible only): {len(all_game_stats) if all_game_stats else 0}")
-
-            result = []
-            for game in all_game_stats:
-                appid = game['appid']
-                if appid not in tagged_appids:
-                    # Get game name
-                    stats = await self.db.get_game_stats(appid)
-                    game_name = stats.get('game_name') if stats else None
-
-                    # If no name in stats, try to get from Steam/shortcuts
-                    if not game_name or game_name.startswith('Unknown Game') or game_name.startswith('Game '):
-                        game_name = await self.steam_service.get_game_name(appid)
-
-                    result.append({
-                        'appid': appid,
-                        'game_name': game_name or f'Game {appid}',
-                        'tag': 'backlog',
-                        'is_manual': False
-                    })
-
-            # Sort by name
-            result.sort(key=lambda x: x['game_name'].lower())
-
-            logger.info(f"[get_backlog_games] returning {len(result)} games")
-            if result:
-                logger.info(f"[get_backlog_games] result sample (first 3): {result[:3]}")
-            return {'success': True, 'games': result}
+            page = self._extract_page_params(params)
+            result = await self.db.list_backlog_games(page["offset"], page["limit"])
+            await Plugin._fill_missing_names(self, result["games"])
+
+            games = [
+                {
+                    'appid': game['appid'],
+                    'game_name': game['game_name'] or f"Game {game['appid']}",
+                    'tag': 'backlog',
+                    'is_manual': False
+                }
+                for game in result["games"]
+            ]
+
+            logger.info(f"[get_backlog_games] returning {len(games)}/{result['total']} games "
+                        f"(offset={page['offset']}, limit={page['limit']})")
+            return {
+                'success': True,
+                'games': games,
+                'total': result["total"],
+                'offset': page["offset"],
+                'limit': page["limit"]
+            }
         except Exception as e:
             logger.error(f"Error getting backlog games: {e}")
             import traceback
@@ -1025,3 +901,70 @@ class Plugin:
             import traceback
             logger.error(traceback.format_exc())
             return {"success": False, "error": str(e)}
+
+    async def get_scheduler_status(self) -> Dict[str, Any]:
+        """Get schedule and run-time metrics for every background job"""
+        if not hasattr(self, 'scheduler'):
+            return {"success": False, "error": "Scheduler not running"}
+        return {"success": True, "jobs": self.scheduler.metrics()}
+
+    async def run_scheduled_job(self, name_or_params) -> Dict[str, Any]:
+        """Run a background job now instead of waiting for its next run"""
+        name = name_or_params.get('name') if isinstance(name_or_params, dict) else name_or_params
+        if not hasattr(self, 'scheduler') or not self.scheduler.run_now(name):
+            return {"success": False, "error": f"Unknown or running job: {name}"}
+        return {"success": True}
+
+    async def import_hltb_dump(self, path_or_params) -> Dict[str, Any]:
+        """Import an offline HLTB dump (CSV, JSON array or JSON lines)
+
+        Replaces the previous dump once every batch has been written; until
+        then, and if the import fails, searches use the previous one. The
+        file is streamed in batches, so large dumps are never loaded into
+        memory at once.
+        """
+        if isinstance(path_or_params, dict):
+            path = path_or_params.get('path')
+        else:
+            path = path_or_params
+        logger.info(f"=== import_hltb_dump called: path={path} ===")
+
+        if not path or not os.path.isfile(path):
+            return {"success": False, "error": f"File not found: {path}"}
+        if not self.db.capabilities.get("fts5"):
+            return {"success": False, "error": "SQLite FTS5 is not available"}
+
+        if self.hltb_import_in_progress:
+            return {"success": False, "error": "An HLTB dump import is already running"}
+
+        self.hltb_import_in_progress = True
+        imported = 0
+        try:
+            if not await self.db.begin_hltb_offline_import():
+                return {"success": False, "error": "Failed to start offline HLTB import"}
+
+            batches = iter_dump_batches(path)
+            while True:
+                # File reading and parsing stay off the event loop
+                batch = await asyncio.to_thread(next, batches, None)
+                if batch is None:
+                    break
+                if not await self.db.add_hltb_offline(batch):
+                    await self.db.discard_hltb_offline_import()
+                    return {"success": False, "imported": 0, "error": "Failed to write offline HLTB entries"}
+                imported += len(batch)
+
+            if not await self.db.finish_hltb_offline_import():
+                await self.db.discard_hltb_offline_import()
+                return {"success": False, "imported": 0, "error": "Failed to replace offline HLTB index"}
+
+            logger.info(f"Imported {imported} offline HLTB entries from {path}")
+            return {"success": True, "imported": imported}
+        except Exception as e:
+            logger.error(f"HLTB dump import failed after {imported} entries: {e}")
+            import traceback
+            logger.error(traceback.format_exc())
+            await self.db.discard_hltb_offline_import()
+            return {"success": False, "error": str(e)}
+        finally:
+            self.hltb_import_in_progress = False
@@ -152,8 +152,21 @@ if [ "$SKIP_BUILD" = false ] || [ "$ONLY_MODE" = "package" ]; then
 
     # Copy backend
     cp backend/src/database.py plugin-build/deck-progress-tracker/backend/src/
+    cp backend/src/records.py plugin-build/deck-progress-tracker/backend/src/
+    cp backend/src/tag_cache.py plugin-build/deck-progress-tracker/backend/src/
+    cp backend/src/library_snapshot.py plugin-build/deck-progress-tracker/backend/src/
+    cp backend/src/plugin_settings.py plugin-build/deck-progress-tracker/backend/src/
+    cp backend/src/vdf_parser.py plugin-build/deck-progress-tracker/backend/src/
     cp backend/src/steam_data.py plugin-build/deck-progress-tracker/backend/src/
     cp backend/src/hltb_service.py plugin-build/deck-progress-tracker/backend/src/
+    cp backend/src/hltb_matching.py plugin-build/deck-progress-tracker/backend/src/
+    cp backend/src/http_pool.py plugin-build/deck-progress-tracker/backend/src/
+    cp backend/src/hltb_pipeline.py plugin-build/deck-progress-tracker/backend/src/
+    cp backend/src/hltb_refresher.py plugin-build/deck-progress-tracker/backend/src/
+    cp backend/src/scheduler.py plugin-build/deck-progress-tracker/backend/src/
+    cp backend/src/hltb_offline.py plugin-build/deck-progress-tracker/backend/src/
+    cp backend/src/sync_engine.py plugin-build/deck-progress-tracker/backend/src/
+    cp backend/src/classifier.py plugin-build/deck-progress-tracker/backend/src/
     cp backend/src/__init__.py plugin-build/deck-progress-tracker/backend/src/
     cp backend/__init__.py plugin-build/deck-progress-tracker/backend/
 
@@ -1,9 +1,10 @@
 import React, { FC, useState, useEffect, useRef } from 'react';
 import { call, toaster } from '@decky/api';
 import { PanelSection, PanelSectionRow, ButtonItem, Navigation } from '@decky/ui';
-import { PluginSettings, TagStatistics, TaggedGame } from '../types';
+import { PluginSettings, TagStatistics, TaggedGame, TaggedGamePage } from '../types';
 import { TagIcon, TagType } from './TagIcon';
 import { syncLibraryProgressive } from '../lib/syncUtils';
+import { refreshLibrarySnapshot, taggedGamesFromSnapshot } from '../lib/librarySnapshot';
 
 const TAG_COLORS: Record<string, string> = {
   completed: '#38ef7d',
@@ -21,6 +22,9 @@ const TAG_LABELS: Record<string, string> = {
   dropped: 'Dropped',
 };
 
+// Backlog can hold thousands of games, so it is loaded page by page
+const BACKLOG_PAGE_SIZE = 100;
+
 const TAG_DESCRIPTIONS: Record<string, string> = {
   completed: 'Beat the main story (playtime ≥ HLTB main story time)',
   in_progress: 'Currently playing (playtime ≥ 30 minutes)',
@@ -34,7 +38,7 @@ export const Settings: FC = () => {
     auto_tag_enabled: true,
     mastered_multiplier: 1.5,
     in_progress_threshold: 30,
-    cache_ttl: 7200,
+    cache_ttl: 604800,
     source_installed: true,
     source_non_steam: true,
     source_all_owned: true,
@@ -45,28 +49,21 @@ export const Settings: FC = () => {
   const [message, setMessage] = useState<string | null>(null);
   const [taggedGames, setTaggedGames] = useState<TaggedGame[]>([]);
   const [backlogGames, setBacklogGames] = useState<TaggedGame[]>([]);
+  const [backlogTotal, setBacklogTotal] = useState(0);
   const [expandedSections, setExpandedSections] = useState<Record<string, boolean>>({});
   const [loadingBacklog, setLoadingBacklog] = useState(false);
 
-  const prevStatsRef = useRef<string>('');
-  const prevGamesRef = useRef<string>('');
+  const prevSnapshotRef = useRef<string>('');
   const containerRef = useRef<HTMLDivElement>(null);
 
   const smartUpdateUI = async () => {
     try {
-      const statsResult = await call<[], { success: boolean; stats: TagStatistics }>('get_tag_statistics');
-      if (statsResult.success && JSON.stringify(statsResult.stats) !== prevStatsRef.current) {
-        prevStatsRef.current = JSON.stringify(statsResult.stats);
-        setStats(statsResult.stats);
-      }
-
-      const gamesResult = await call<[], { success: boolean; games: TaggedGame[] }>('get_all_tags_with_names');
-      if (gamesResult.success) {
-        const fingerPrint = JSON.stringify(gamesResult.games.map(g => g.appid).sort());
-        if (fingerPrint !== prevGamesRef.current) {
-          prevGamesRef.current = fingerPrint;
-          setTaggedGames(gamesResult.games);
-        }
+      // One round trip for counts and tagged games; an unchanged library costs nothing
+      const snapshot = await refreshLibrarySnapshot();
+      if (snapshot && snapshot.version !== prevSnapshotRef.current) {
+        prevSnapshotRef.current = snapshot.version;
+        setStats(snapshot.stats);
+        setTaggedGames(taggedGamesFromSnapshot(snapshot));
       }
     } catch (err) {}
   };
@@ -127,13 +124,24 @@ export const Settings: FC = () => {
     setExpandedSections(prev => ({ ...prev, [tagType]: willExpand }));
 
     if (tagType === 'backlog' && willExpand && backlogGames.length === 0) {
-      setLoadingBacklog(true);
-      const res = await call<[], { success: boolean; games: TaggedGame[] }>('get_backlog_games');
-      if (res.success) setBacklogGames(res.games);
-      setLoadingBacklog(false);
+      await loadBacklogPage(0);
     }
   };
 
+  const loadBacklogPage = async (offset: number) => {
+    setLoadingBacklog(true);
+    try {
+      const res = await call<[{ offset: number; limit: number }], TaggedGamePage>(
+        'get_backlog_games', { offset, limit: BACKLOG_PAGE_SIZE }
+      );
+      if (res.success) {
+        setBacklogGames(prev => offset === 0 ? res.games : [...prev, ...res.games]);
+        setBacklogTotal(res.total);
+      }
+    } catch (err) {}
+    setLoadingBacklog(false);
+  };
+
   const syncLibrary = async () => {
     try {
       setSyncing(true);
@@ -153,7 +161,7 @@ export const Settings: FC = () => {
 
       // Sync completed
       smartUpdateUI();
-      const msg = `Sync complete! ${result.synced} games updated${result.new_tags ? `, ${result.new_tags} new tags` : ''}.`;
+      const msg = `Sync complete! ${result.synced} games updated${result.skipped ? `, ${result.skipped} unchanged` : ''}${result.new_tags ? `, ${result.new_tags} new tags` : ''}.`;
       setMessage(msg);
       toaster.toast({ title: 'Deck Progress Tracker', body: msg, duration: 5000 });
 
@@ -222,6 +230,13 @@ export const Settings: FC = () => {
                     </ButtonItem>
                   </PanelSectionRow>
                 ))}
+                {isExpanded && isBacklog && backlogGames.length < backlogTotal && (
+                  <PanelSectionRow>
+                    <ButtonItem layout="below" onClick={() => loadBacklogPage(backlogGames.length)} disabled={loadingBacklog}>
+                      {loadingBacklog ? 'Loading...' : `Show more (${backlogGames.length}/${backlogTotal})`}
+                    </ButtonItem>
+                  </PanelSectionRow>
+                )}
                 {isExpanded && games.length === 0 && !loadingBacklog && <div style={styles.emptySection}>No games found</div>}
               </React.Fragment>
             );
@@ -5,6 +5,7 @@
 import { useState, useEffect } from 'react';
 import { call } from '@decky/api';
 import { GameTag } from '../types';
+import { refreshTags, getCachedTag } from '../lib/tagStore';
 
 export function useGameTag(appid: string) {
   const [tag, setTag] = useState<GameTag | null>(null);
@@ -15,13 +16,14 @@ export function useGameTag(appid: string) {
     fetchTag();
   }, [appid]);
 
-  const fetchTag = async () => {
+  const fetchTag = async (afterWrite: boolean = false) => {
     try {
       setLoading(true);
       setError(null);
 
-      const result = await call<[{ appid: string }], { success: boolean; tag: GameTag | null }>('get_game_tag', { appid });
-      setTag(result.tag);
+      // Only tags changed since the last refresh cross the wire
+      await refreshTags(afterWrite);
+      setTag(getCachedTag(appid));
     } catch (err: any) {
       const errorMsg = err?.message || 'Failed to fetch tag';
       setError(errorMsg);
@@ -38,7 +40,7 @@ export function useGameTag(appid: string) {
       const result = await call<[{ appid: string; tag: string }], { success: boolean; error?: string }>('set_manual_tag', { appid, tag: newTag });
 
       if (result.success) {
-        await fetchTag();
+        await fetchTag(true);
       } else {
         setError(result.error || 'Failed to set tag');
       }
@@ -55,7 +57,7 @@ export function useGameTag(appid: string) {
       const result = await call<[{ appid: string }], { success: boolean; error?: string }>('remove_tag', { appid });
 
       if (result.success) {
-        await fetchTag();
+        await fetchTag(true);
       } else {
         setError(result.error || 'Failed to remove tag');
       }
@@ -72,7 +74,7 @@ export function useGameTag(appid: string) {
       const result = await call<[{ appid: string }], { success: boolean; error?: string }>('reset_to_auto_tag', { appid });
 
       if (result.success) {
-        await fetchTag();
+        await fetchTag(true);
       } else {
         setError(result.error || 'Failed to reset tag');
       }
@@ -86,7 +88,7 @@ export function useGameTag(appid: string) {
     tag,
     loading,
     error,
-    refetch: fetchTag,
+    refetch: () => fetchTag(true),
     setManualTag,
     removeTag,
     resetToAuto
@@ -0,0 +1,74 @@
+/**
+ * Library Snapshot
+ * Whole-library view (tags, names, HLTB hours, tag counts) fetched in one
+ * call from get_library_snapshot and reused until its version changes
+ */
+
+import { call } from '@decky/api';
+import { TagStatistics, TaggedGame } from '../types';
+
+export interface LibrarySnapshot {
+  version: string;
+  count: number;
+  tag_names: Record<string, string>;  // tag code -> tag name; code 0 is untagged
+  stats: TagStatistics;
+  // Parallel columns, one entry per game
+  appids: string[];
+  tags: number[];
+  manual: number[];
+  names: (string | null)[];
+  hltb_hours: (number | null)[];
+}
+
+interface SnapshotResponse extends Partial<LibrarySnapshot> {
+  success: boolean;
+  unchanged?: boolean;
+  error?: string;
+}
+
+let snapshot: LibrarySnapshot | null = null;
+let inFlight: Promise<LibrarySnapshot | null> | null = null;
+
+/**
+ * Fetch the snapshot if it changed since the last call
+ * Passes the known version, so an unchanged library costs a tiny reply.
+ * Concurrent callers share one request.
+ */
+export const refreshLibrarySnapshot = (): Promise<LibrarySnapshot | null> => {
+  if (inFlight) {
+    return inFlight;
+  }
+  inFlight = call<[{ version: string | null }], SnapshotResponse>(
+    'get_library_snapshot', { version: snapshot ? snapshot.version : null }
+  )
+    .then(res => {
+      if (res && res.success && !res.unchanged) {
+        snapshot = res as LibrarySnapshot;
+      }
+      return snapshot;
+    })
+    .finally(() => {
+      inFlight = null;
+    });
+  return inFlight;
+};
+
+/**
+ * Tagged games from a snapshot, in the shape the list endpoints return
+ */
+export const taggedGamesFromSnapshot = (snap: LibrarySnapshot): TaggedGame[] => {
+  const games: TaggedGame[] = [];
+  for (let i = 0; i < snap.count; i++) {
+    const tag = snap.tag_names[String(snap.tags[i])];
+    if (!tag) {
+      continue;
+    }
+    games.push({
+      appid: snap.appids[i],
+      game_name: snap.names[i] || `Game ${snap.appids[i]}`,
+      tag: tag as TaggedGame['tag'],
+      is_manual: snap.manual[i] === 1,
+    });
+  }
+  return games;
+};
@@ -31,11 +31,18 @@ export interface SyncResult {
   success: boolean;
   total?: number;
   synced?: number;
+  skipped?: number;  // Games left alone because nothing changed since their last sync
   new_tags?: number;  // Count of games that got new/changed tags
+  changed?: Record<string, string>;  // appid -> new tag for games whose tag changed
   errors?: number;
   error?: string;
 }
 
+/**
+ * Games sent per sync_games_chunk call during progressive sync
+ */
+const SYNC_CHUNK_SIZE = 100;
+
 /**
  * Get all owned game appids from Steam's frontend API
  * This includes both installed and uninstalled games
@@ -334,8 +341,9 @@ export const syncSingleGameWithFrontendData = async (appid: string): Promise<{ s
 };
 
 /**
- * Progressive sync - process one game at a time completely before moving to next
- * This provides immediate feedback and avoids long waits for achievement fetching
+ * Progressive sync - gather data and sync in chunks of SYNC_CHUNK_SIZE games
+ * Progress is reported per game while data is gathered, and each chunk is
+ * written by the backend in bulk so tags appear chunk by chunk
  */
 export const syncLibraryProgressive = async (
   onProgress?: (current: number, total: number, gameName?: string) => void
@@ -382,46 +390,52 @@ export const syncLibraryProgressive = async (
 
     const total = appids.length;
     let synced = 0;
+    let skipped = 0;
     let errors = 0;
     let newTags = 0;
 
-    for (let i = 0; i < appids.length; i++) {
-      const appid = appids[i];
+    for (let offset = 0; offset < total; offset += SYNC_CHUNK_SIZE) {
+      const chunk = appids.slice(offset, offset + SYNC_CHUNK_SIZE);
 
       try {
-        const gameData = await getPlaytimeData([appid]);
-        const gameInfo = gameData[appid] || { playtime_minutes: 0, rt_last_time_played: null };
-
-        const achievementData = await fetchAchievementsOnDemand(appid);
-
-        const gameNames = await getGameNames([appid]);
-        const gameName = gameNames[appid] || `Game ${appid}`;
+        const gameData = await getPlaytimeData(chunk);
+        const gameNames = await getGameNames(chunk);
+        const achievementData: Record<string, AchievementData> = {};
+
+        for (let i = 0; i < chunk.length; i++) {
+          const appid = chunk[i];
+          gameData[appid] = gameData[appid] || { playtime_minutes: 0, rt_last_time_played: null };
+          gameNames[appid] = gameNames[appid] || `Game ${appid}`;
+
+          const achievements = await fetchAchievementsOnDemand(appid);
+          if (achievements) {
+            achievementData[appid] = achievements;
+          }
 
-        if (onProgress) {
-          onProgress(i + 1, total, gameName);
+          if (onProgress) {
+            onProgress(offset + i + 1, total, gameNames[appid]);
+          }
         }
 
-        const result = await call<[any], any>('sync_single_game_with_data', {
-          appid,
-          game_data: gameInfo,
+        const result = await call<[any], SyncResult>('sync_games_chunk', {
+          game_data: gameData,
           achievement_data: achievementData,
-          game_name: gameName,
-          is_bulk_sync: true,
-          current_index: i + 1,
+          game_names: gameNames,
+          offset,
           total_count: total
         });
 
-        if (result.success) {
-          synced++;
-          if (result.tag_changed) {
-            newTags++;
-          }
+        if (result && result.success) {
+          synced += result.synced || 0;
+          skipped += result.skipped || 0;
+          newTags += result.new_tags || 0;
+          errors += result.errors || 0;
         } else {
-          errors++;
+          errors += chunk.length;
         }
 
       } catch (e: any) {
-        errors++;
+        errors += chunk.length;
       }
     }
 
@@ -429,6 +443,7 @@ export const syncLibraryProgressive = async (
       success: true,
       total,
       synced,
+      skipped,
       new_tags: newTags,
       errors
     };
@@ -0,0 +1,70 @@
+/**
+ * Tag Store
+ * Frontend copy of all game tags, kept current with version-based deltas
+ * from the backend tag cache (get_tags_since)
+ */
+
+import { call } from '@decky/api';
+import { GameTag } from '../types';
+
+interface TagChanges {
+  success: boolean;
+  version: number;
+  full: boolean;
+  tags: GameTag[];
+  removed: string[];
+  error?: string;
+}
+
+const tags = new Map<string, GameTag>();
+let version = 0;
+let inFlight: Promise<void> | null = null;
+
+const applyChanges = (changes: TagChanges) => {
+  if (changes.full) {
+    tags.clear();
+  }
+  for (const tag of changes.tags) {
+    tags.set(tag.appid, tag);
+  }
+  for (const appid of changes.removed) {
+    tags.delete(appid);
+  }
+  version = changes.version;
+};
+
+const fetchChanges = (): Promise<void> => {
+  inFlight = call<[{ version: number }], TagChanges>('get_tags_since', { version })
+    .then(changes => {
+      if (changes && changes.success) {
+        applyChanges(changes);
+      }
+    })
+    .finally(() => {
+      inFlight = null;
+    });
+  return inFlight;
+};
+
+/**
+ * Fetch tags changed since the last refresh
+ * Concurrent callers share one request, so a screen full of badges costs one round trip.
+ * Pass afterWrite=true after changing a tag: a request already in flight may
+ * predate the change, so one follow-up request is made once it finishes.
+ */
+export const refreshTags = (afterWrite: boolean = false): Promise<void> => {
+  if (!inFlight) {
+    return fetchChanges();
+  }
+  if (!afterWrite) {
+    return inFlight;
+  }
+  return inFlight.then(() => inFlight || fetchChanges());
+};
+
+/**
+ * Get a tag from the local copy (call refreshTags first to pick up changes)
+ */
+export const getCachedTag = (appid: string): GameTag | null => {
+  return tags.get(appid) || null;
+};
@@ -65,10 +65,19 @@ export interface TagStatistics {
 export interface TaggedGame {
   appid: string;
   game_name: string;
-  tag: 'completed' | 'in_progress' | 'mastered' | 'dropped';
+  tag: 'completed' | 'in_progress' | 'mastered' | 'dropped' | 'backlog';
   is_manual: boolean;
 }
 
+export interface TaggedGamePage {
+  success: boolean;
+  games: TaggedGame[];
+  total: number;  // Total matching games, ignoring offset/limit
+  offset: number;
+  limit: number | null;
+  error?: string;
+}
+
 export interface SyncResult {
   success: boolean;
   total?: number;
@@ -0,0 +1,83 @@
+"""
+Classifier benchmark
+Times classify_library on a synthetic library against a per-game
+classify_game loop (the shape of the old calculate_auto_tag path)
+
+Usage: python tests/bench_classifier.py [game_count]   (default 100000)
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend", "src"))
+
+import classifier
+from classifier import classify_game, classify_library, ONE_YEAR_SECONDS
+
+NOW = 1_790_000_000
+ROUNDS = 5
+
+
+def make_library(count, seed=0):
+    rng = random.Random(seed)
+    playtime, unlocked, total, story, last_played, manual, hidden = ([] for _ in range(7))
+    for _ in range(count):
+        achievements = rng.choice([0, 0, rng.randint(1, 200)])
+        playtime.append(rng.randint(0, 6000))
+        total.append(achievements)
+        unlocked.append(rng.randint(0, achievements))
+        story.append(rng.choice([None, round(rng.uniform(0.5, 80), 1)]))
+        last_played.append(rng.choice([None, NOW - rng.randint(0, 3 * ONE_YEAR_SECONDS)]))
+        manual.append(rng.random() < 0.02)
+        hidden.append(rng.random() < 0.02)
+    return playtime, unlocked, total, story, last_played, manual, hidden
+
+
+def best_of(fn):
+    best = float("inf")
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, result
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    columns = make_library(count)
+    print(f"{count} games, best of {ROUNDS} runs")
+
+    def per_game():
+        return [
+            classifier.TAG_SKIP if is_manual or is_hidden
+            else classify_game(p, u, t, s, r, 30, NOW)
+            for p, u, t, s, r, is_manual, is_hidden in zip(*columns)
+        ]
+
+    loop_ms, expected = best_of(per_game)
+    print(f"  classify_game loop:          {loop_ms:8.1f} ms")
+
+    list_ms, codes = best_of(lambda: classify_library(*columns, now=NOW, use_numpy=False))
+    assert codes == expected
+    print(f"  classify_library (Python):   {list_ms:8.1f} ms")
+
+    if classifier.np is None:
+        print("  classify_library (NumPy):    skipped, NumPy is not installed")
+        return
+
+    np = classifier.np
+    forced_ms, codes = best_of(lambda: classify_library(*columns, now=NOW, use_numpy=True))
+    assert codes == expected
+    print(f"  classify_library (NumPy):    {forced_ms:8.1f} ms  (from lists)")
+
+    arrays = [np.asarray(column, dtype=np.float64) for column in columns[:5]]
+    arrays += [np.asarray(column, dtype=bool) for column in columns[5:]]
+    array_ms, codes = best_of(lambda: classify_library(*arrays, now=NOW))
+    assert codes == expected
+    print(f"  classify_library (NumPy):    {array_ms:8.1f} ms  (from arrays)")
+
+
+if __name__ == "__main__":
+    main()
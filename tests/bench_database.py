@@ -0,0 +1,99 @@
+"""
+Database batch benchmark
+Times a sync-sized write and read through the batched APIs
+(apply_sync_batch, get_sync_snapshot) against the per-row calls
+
+Usage: python tests/bench_database.py [game_count]   (default 5000)
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+import conftest  # noqa: F401  (backend/src on sys.path, decky stand-in)
+from database import Database
+
+
+def make_rows(count):
+    stats_rows, hltb_rows, tag_rows = [], [], []
+    for index in range(count):
+        appid = str(10_000 + index)
+        stats_rows.append({
+            "appid": appid,
+            "game_name": f"Game {index}",
+            "playtime_minutes": index % 3000,
+            "total_achievements": index % 50,
+            "unlocked_achievements": index % 9,
+            "is_hidden": False,
+            "rt_last_time_played": 1_700_000_000 + index,
+        })
+        if index % 2 == 0:
+            hltb_rows.append((appid, {
+                "game_name": f"Game {index}", "matched_name": f"Game {index}", "similarity": 1.0,
+                "main_story": 10.0, "main_extra": 15.0, "completionist": 30.0, "all_styles": 14.0,
+                "hltb_url": f"https://howlongtobeat.com/game/{index}",
+            }))
+        tag_rows.append({"appid": appid, "tag": "in_progress"})
+    return stats_rows, hltb_rows, tag_rows
+
+
+async def timed(label, coro_fn):
+    start = time.perf_counter()
+    await coro_fn()
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f"  {label:<34}{elapsed:9.1f} ms")
+    return elapsed
+
+
+async def open_db(directory, name):
+    db = Database(os.path.join(directory, name))
+    await db.init_database()
+    return db
+
+
+async def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    stats_rows, hltb_rows, tag_rows = make_rows(count)
+    appids = [row["appid"] for row in stats_rows]
+    print(f"{count} games")
+
+    with tempfile.TemporaryDirectory() as directory:
+        db = await open_db(directory, "per_row.db")
+
+        async def write_per_row():
+            for row in stats_rows:
+                await db.update_game_stats(row["appid"], row)
+            for appid, data in hltb_rows:
+                await db.cache_hltb_data(appid, data)
+            for row in tag_rows:
+                await db.set_tag(row["appid"], row["tag"])
+
+        async def read_per_row():
+            for appid in appids:
+                await db.get_game_stats(appid)
+                await db.get_hltb_cache(appid)
+                await db.get_tag(appid)
+
+        write_row = await timed("write, per-row calls", write_per_row)
+        read_row = await timed("read, per-row calls", read_per_row)
+        await db.close()
+
+        db = await open_db(directory, "batched.db")
+
+        async def write_batched():
+            await db.apply_sync_batch(stats_rows, hltb_rows, tag_rows)
+
+        async def read_batched():
+            await db.get_sync_snapshot(appids)
+
+        write_batch = await timed("write, apply_sync_batch", write_batched)
+        read_batch = await timed("read, get_sync_snapshot", read_batched)
+        await db.close()
+
+    print(f"  speedup: write {write_row / write_batch:.0f}x, read {read_row / read_batch:.0f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
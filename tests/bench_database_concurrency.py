@@ -0,0 +1,76 @@
+"""
+Read latency during a bulk write
+Times get_game_stats and get_game_tag calls while a large stats write runs
+on the writer thread: once through the read-only WAL pool, and once with
+reads queued on the writer (the single shared connection it replaced)
+
+Usage: python tests/bench_database_concurrency.py [game_count]   (default 20000)
+"""
+
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+import conftest  # noqa: F401  (backend/src on sys.path, decky stand-in)
+from database import Database
+
+
+def make_rows(count, playtime):
+    return [{
+        "appid": str(10_000 + index),
+        "game_name": f"Game {index}",
+        "playtime_minutes": playtime + index % 100,
+        "total_achievements": index % 50,
+        "unlocked_achievements": index % 9,
+        "is_hidden": False,
+        "rt_last_time_played": 1_700_000_000 + index,
+    } for index in range(count)]
+
+
+async def measure(db, rows, label):
+    write = asyncio.ensure_future(db.upsert_stats_many(rows))
+    appid = rows[len(rows) // 2]["appid"]
+    samples = {"get_game_stats": [], "get_game_tag": []}
+    # Wait until the write is queued on the writer thread
+    await asyncio.sleep(0)
+    while not write.done():
+        start = time.perf_counter()
+        await db.get_game_stats(appid)
+        samples["get_game_stats"].append((time.perf_counter() - start) * 1000)
+        start = time.perf_counter()
+        await db.get_tag(appid)
+        samples["get_game_tag"].append((time.perf_counter() - start) * 1000)
+    assert await write
+
+    for name, values in samples.items():
+        values.sort()
+        print(f"  {label:<22}{name:<16}n={len(values):<6}p50={statistics.median(values):7.2f} ms  "
+              f"p95={values[int(len(values) * 0.95)]:7.2f} ms  max={values[-1]:7.2f} ms")
+
+
+async def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    print(f"{count}-game bulk stats write")
+
+    with tempfile.TemporaryDirectory() as directory:
+        db = Database(os.path.join(directory, "bench.db"))
+        await db.init_database()
+        await db.load_tag_cache()
+        await db.upsert_stats_many(make_rows(count, 0))
+        await db.set_tag(str(10_000 + count // 2), "in_progress")
+
+        await measure(db, make_rows(count, 1), "WAL reader pool")
+
+        # Route reads through the writer queue, as with one shared connection
+        readers, db.connections._readers = db.connections._readers, None
+        await measure(db, make_rows(count, 2), "reads on the writer")
+        db.connections._readers = readers
+
+        await db.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,66 @@
+"""
+HLTB matching benchmark
+Times best_match against scoring every candidate: the original
+SequenceMatcher scan on lower-cased names, and the same normalization as
+best_match without its pruning
+
+Usage: python tests/bench_hltb_matching.py [query_count]   (default 3000)
+"""
+
+import random
+import sys
+import time
+from difflib import SequenceMatcher
+
+import conftest  # noqa: F401  (backend/src on sys.path, decky stand-in)
+from hltb_matching import best_match, normalize_title, title_similarity
+
+CANDIDATES = 20
+WORDS = ("dark souls legend hero quest war star age empire dragon night city space "
+         "tale lost kingdom shadow rise fall").split()
+SUFFIXES = ("", " 2", " II", ": Remastered", " - Definitive Edition")
+
+
+def original_scan(game_name, candidates, min_similarity):
+    best, best_similarity = None, 0.0
+    for candidate in candidates:
+        similarity = SequenceMatcher(None, game_name.lower(), candidate["game_name"].lower()).ratio()
+        if similarity > best_similarity:
+            best, best_similarity = candidate, similarity
+    return (best if best_similarity >= min_similarity else None), best_similarity
+
+
+def unpruned_scan(game_name, candidates, min_similarity):
+    best, best_similarity = None, 0.0
+    for candidate in candidates:
+        similarity = title_similarity(game_name, candidate["game_name"])
+        if similarity >= min_similarity and similarity > best_similarity:
+            best, best_similarity = candidate, similarity
+    return best, best_similarity
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 3000
+    rng = random.Random(0)
+    titles = [" ".join(rng.sample(WORDS, rng.randint(1, 4))).title() + rng.choice(SUFFIXES)
+              for _ in range(count)]
+    # Each query gets random candidates plus its own title without the edition suffix
+    queries = [(title, [{"game_name": rng.choice(titles)} for _ in range(CANDIDATES - 1)]
+                + [{"game_name": title.split(" - ")[0]}]) for title in titles]
+    print(f"{count} queries x {CANDIDATES} candidates")
+
+    for label, fn in (("original SequenceMatcher scan", original_scan),
+                      ("normalized scan, no pruning", unpruned_scan),
+                      ("best_match (cold caches)", best_match),
+                      ("best_match (warm caches)", best_match)):
+        if label.endswith("(cold caches)"):
+            normalize_title.cache_clear()
+        start = time.perf_counter()
+        for game_name, candidates in queries:
+            fn(game_name, candidates, 0.7)
+        elapsed = time.perf_counter() - start
+        print(f"  {label:<32}{elapsed * 1000:8.1f} ms  {count / elapsed:8.0f} queries/s")
+
+
+if __name__ == "__main__":
+    main()
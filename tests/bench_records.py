@@ -0,0 +1,95 @@
+"""
+Row decoding benchmark
+Times reading game_stats the old way (sqlite3.Row, SELECT *, a dict built
+per row) against constant SQL decoded by StatsRecord.from_row from tuples
+
+Usage: python tests/bench_records.py [game_count]   (default 20000)
+"""
+
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+import conftest  # noqa: F401  (backend/src on sys.path, decky stand-in)
+from database import SELECT_STATS_SQL, STATEMENT_CACHE_SIZE, _tuple_cursor
+from records import StatsRecord
+
+ROUNDS = 5
+LOOKUPS = 5000
+
+
+def best_of(fn):
+    best = float("inf")
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def old_stats_dict(row):
+    return {
+        "appid": row["appid"],
+        "game_name": row["game_name"],
+        "playtime_minutes": row["playtime_minutes"],
+        "total_achievements": row["total_achievements"],
+        "unlocked_achievements": row["unlocked_achievements"],
+        "is_hidden": bool(row["is_hidden"]),
+        "rt_last_time_played": row["rt_last_time_played"],
+        "last_sync": row["last_sync"]
+    }
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    with tempfile.TemporaryDirectory() as directory:
+        conn = sqlite3.connect(os.path.join(directory, "bench.db"), cached_statements=STATEMENT_CACHE_SIZE)
+        conn.execute("""
+            CREATE TABLE game_stats (
+                appid TEXT PRIMARY KEY, game_name TEXT NOT NULL, playtime_minutes INTEGER DEFAULT 0,
+                total_achievements INTEGER DEFAULT 0, unlocked_achievements INTEGER DEFAULT 0,
+                is_hidden BOOLEAN DEFAULT 0, rt_last_time_played INTEGER,
+                last_sync TIMESTAMP DEFAULT CURRENT_TIMESTAMP, fingerprint INTEGER
+            )
+        """)
+        conn.executemany(
+            "INSERT INTO game_stats (appid, game_name, playtime_minutes, rt_last_time_played) VALUES (?, ?, ?, ?)",
+            [(str(i), f"Game {i}", i % 3000, 1_700_000_000 + i) for i in range(count)]
+        )
+        conn.commit()
+        appids = [str(i * 7 % count) for i in range(LOOKUPS)]
+        print(f"{count} rows, {LOOKUPS} single-row lookups, best of {ROUNDS} runs")
+
+        def scan_old():
+            cursor = conn.cursor()
+            cursor.row_factory = sqlite3.Row
+            return [old_stats_dict(row) for row in cursor.execute("SELECT * FROM game_stats")]
+
+        def scan_new():
+            from_row = StatsRecord.from_row
+            sql = f"SELECT {StatsRecord.COLUMNS} FROM game_stats"
+            return [from_row(row) for row in _tuple_cursor(conn).execute(sql)]
+
+        def lookup_old():
+            cursor = conn.cursor()
+            cursor.row_factory = sqlite3.Row
+            for appid in appids:
+                old_stats_dict(cursor.execute("SELECT * FROM game_stats WHERE appid = ?", (appid,)).fetchone())
+
+        def lookup_new():
+            cursor = _tuple_cursor(conn)
+            for appid in appids:
+                StatsRecord.from_row(cursor.execute(SELECT_STATS_SQL, (appid,)).fetchone())
+
+        assert [row["playtime_minutes"] for row in scan_old()] == [rec.playtime_minutes for rec in scan_new()]
+        print(f"  full scan, Row + dict:          {best_of(scan_old):8.1f} ms")
+        print(f"  full scan, tuple + from_row:    {best_of(scan_new):8.1f} ms")
+        print(f"  lookups, Row + dict:            {best_of(lookup_old):8.1f} ms")
+        print(f"  lookups, tuple + from_row:      {best_of(lookup_new):8.1f} ms")
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
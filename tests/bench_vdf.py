@@ -0,0 +1,108 @@
+"""
+Text VDF benchmark
+Times parsing a synthetic localconfig.vdf with the original str-based
+tokenizer, parse_vdf_bytes with and without the playtime filter, and
+load_vdf through an mmap
+
+Usage: python tests/bench_vdf.py [app_count]   (default 5000)
+"""
+
+import os
+import re
+import sys
+import tempfile
+import time
+
+import conftest  # noqa: F401  (backend/src on sys.path, decky stand-in)
+from steam_data import PLAYTIME_FILTER
+from vdf_parser import parse_vdf_bytes, load_vdf
+
+ROUNDS = 5
+
+
+def best_of(fn):
+    best = float("inf")
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def original_parse_vdf(content):
+    """steam_data.parse_vdf before vdf_parser: one regex match per token, on str"""
+    result = {}
+    stack = [result]
+    current_key = None
+    token_pattern = re.compile(r'"([^"\\]*(?:\\.[^"\\]*)*)"|(\{)|(\})|(\S+)')
+
+    for match in token_pattern.finditer(content):
+        quoted, open_brace, close_brace, bare = match.groups()
+        token = quoted if quoted is not None else bare
+        if open_brace:
+            new_dict = {}
+            if current_key is not None:
+                stack[-1][current_key] = new_dict
+                stack.append(new_dict)
+                current_key = None
+        elif close_brace:
+            if len(stack) > 1:
+                stack.pop()
+        elif token is not None:
+            if current_key is None:
+                current_key = token
+            else:
+                stack[-1][current_key] = token
+                current_key = None
+    return result
+
+
+def localconfig(app_count):
+    """A localconfig.vdf shaped like Steam's: apps plus large unrelated sections"""
+    apps = "".join(
+        f'\t\t\t\t\t"{appid}"\n\t\t\t\t\t{{\n'
+        f'\t\t\t\t\t\t"LastPlayed"\t\t"{1700000000 + appid}"\n'
+        f'\t\t\t\t\t\t"Playtime"\t\t"{appid % 997}"\n'
+        f'\t\t\t\t\t\t"cloud"\n\t\t\t\t\t\t{{\n\t\t\t\t\t\t\t"last_sync_state"\t\t"synchronized"\n\t\t\t\t\t\t}}\n'
+        f'\t\t\t\t\t\t"autocloud"\n\t\t\t\t\t\t{{\n\t\t\t\t\t\t\t"lastlaunch"\t\t"{appid}"\n'
+        f'\t\t\t\t\t\t\t"lastexit"\t\t"{appid + 60}"\n\t\t\t\t\t\t}}\n'
+        f'\t\t\t\t\t\t"BadgeData"\t\t"{"0" * 64}"\n'
+        f'\t\t\t\t\t}}\n'
+        for appid in range(10, 10 + app_count))
+    friends = "".join(f'\t\t"{76561197960265728 + i}"\n\t\t{{\n\t\t\t"name"\t\t"Friend {i} {{x}}"\n'
+                      f'\t\t\t"avatar"\t\t"{"ab" * 20}"\n\t\t}}\n' for i in range(app_count))
+    return (
+        '"UserLocalConfigStore"\n{\n'
+        f'\t"friends"\n\t{{\n{friends}\t}}\n'
+        '\t"Software"\n\t{\n\t\t"Valve"\n\t\t{\n\t\t\t"Steam"\n\t\t\t{\n'
+        f'\t\t\t\t"apps"\n\t\t\t\t{{\n{apps}\t\t\t\t}}\n'
+        '\t\t\t}\n\t\t}\n\t}\n}\n'
+    ).encode("utf-8")
+
+
+def main():
+    app_count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    data = localconfig(app_count)
+    print(f"localconfig.vdf with {app_count} apps: {len(data) / 1e6:.1f} MB (best of {ROUNDS})")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "localconfig.vdf")
+        with open(path, "wb") as f:
+            f.write(data)
+
+        kept = parse_vdf_bytes(data, PLAYTIME_FILTER)
+        apps = kept["UserLocalConfigStore"]["Software"]["Valve"]["Steam"]["apps"]
+        assert len(apps) == app_count and set(apps["10"]) == {"LastPlayed", "Playtime"}
+        assert original_parse_vdf(data.decode("utf-8")) == parse_vdf_bytes(data)
+
+        for label, fn in (
+            ("original str tokenizer (read + decode)", lambda: original_parse_vdf(open(path, encoding="utf-8").read())),
+            ("parse_vdf_bytes, no filter", lambda: parse_vdf_bytes(data)),
+            ("parse_vdf_bytes, PLAYTIME_FILTER", lambda: parse_vdf_bytes(data, PLAYTIME_FILTER)),
+            ("load_vdf (mmap), PLAYTIME_FILTER", lambda: load_vdf(path, PLAYTIME_FILTER)),
+        ):
+            print(f"  {label:<42}{best_of(fn):8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
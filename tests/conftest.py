@@ -0,0 +1,23 @@
+"""
+Shared test setup
+Puts backend/src on sys.path and, outside Decky Loader, registers a stand-in
+decky module: the backend only uses decky.logger from it
+
+Benchmark scripts import this module for the same setup.
+"""
+
+import logging
+import os
+import sys
+import types
+
+BACKEND_SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend", "src")
+if BACKEND_SRC not in sys.path:
+    sys.path.insert(0, BACKEND_SRC)
+
+try:
+    import decky  # noqa: F401  (provided by Decky Loader at runtime)
+except ImportError:
+    decky = types.ModuleType("decky")
+    decky.logger = logging.getLogger("decky")
+    sys.modules["decky"] = decky
@@ -0,0 +1,144 @@
+"""
+Classifier equivalence tests
+classify_game and classify_library must tag exactly like the original
+calculate_auto_tag rules, on both the NumPy and the pure-Python path
+"""
+
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend", "src"))
+
+import classifier
+from classifier import (
+    classify_game, classify_library, ONE_YEAR_SECONDS, TAG_BY_CODE, TAG_SKIP
+)
+
+NOW = 1_790_000_000
+SEEDS = range(5)
+
+
+def baseline_auto_tag(stats, hltb, in_progress_threshold, now):
+    """The auto-tag rules as calculate_auto_tag implemented them before the classifier"""
+    total_achievements = stats.get('total_achievements', 0)
+    unlocked_achievements = stats.get('unlocked_achievements', 0)
+    if total_achievements > 0:
+        achievement_percentage = (unlocked_achievements / total_achievements) * 100
+    else:
+        achievement_percentage = 0
+
+    if achievement_percentage >= 85:
+        return "mastered"
+
+    if hltb and hltb.get('main_story'):
+        if stats['playtime_minutes'] >= hltb['main_story'] * 60:
+            return "completed"
+
+    rt_last_time_played = stats.get('rt_last_time_played')
+    if rt_last_time_played and rt_last_time_played > 0:
+        if now - rt_last_time_played > ONE_YEAR_SECONDS:
+            return "dropped"
+
+    if stats['playtime_minutes'] >= in_progress_threshold:
+        return "in_progress"
+
+    return None
+
+
+def random_games(seed, count=2000):
+    """Random games, weighted towards the edges of every rule"""
+    rng = random.Random(seed)
+    games = []
+    for _ in range(count):
+        main_story = rng.choice([None, 0, 0.5, 1.0, 12.3, rng.uniform(0.1, 80)])
+        playtime = rng.choice([
+            0, 29, 30, 31, rng.randint(0, 6000),
+            int(main_story * 60) if main_story else 0,
+            int(main_story * 60) - 1 if main_story else 1,
+        ])
+        total = rng.choice([0, 0, 1, 7, 20, 33, rng.randint(0, 500)])
+        unlocked = rng.choice([0, total, (total * 85 + 99) // 100, (total * 85) // 100, rng.randint(0, total)])
+        last_played = rng.choice([
+            None, 0, NOW, NOW - ONE_YEAR_SECONDS, NOW - ONE_YEAR_SECONDS - 1,
+            NOW - rng.randint(0, 3 * ONE_YEAR_SECONDS),
+        ])
+        games.append({
+            "playtime_minutes": playtime,
+            "unlocked_achievements": unlocked,
+            "total_achievements": total,
+            "main_story": main_story,
+            "rt_last_time_played": last_played,
+            "is_manual": rng.random() < 0.05,
+            "is_hidden": rng.random() < 0.05,
+        })
+    return games
+
+
+def expected_codes(games, threshold):
+    codes = []
+    for game in games:
+        if game["is_manual"] or game["is_hidden"]:
+            codes.append(TAG_SKIP)
+            continue
+        hltb = {"main_story": game["main_story"]} if game["main_story"] is not None else None
+        tag = baseline_auto_tag(game, hltb, threshold, NOW)
+        codes.append(next(code for code, name in TAG_BY_CODE.items() if name == tag))
+    return codes
+
+
+def columns(games):
+    keys = ("playtime_minutes", "unlocked_achievements", "total_achievements",
+            "main_story", "rt_last_time_played", "is_manual", "is_hidden")
+    return [[game[key] for game in games] for key in keys]
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+@pytest.mark.parametrize("threshold", [0, 30, 120])
+def test_classify_game_matches_baseline(seed, threshold):
+    for game in random_games(seed):
+        hltb = {"main_story": game["main_story"]} if game["main_story"] is not None else None
+        expected = baseline_auto_tag(game, hltb, threshold, NOW)
+        code = classify_game(game["playtime_minutes"], game["unlocked_achievements"],
+                             game["total_achievements"], game["main_story"],
+                             game["rt_last_time_played"], threshold, NOW)
+        assert TAG_BY_CODE[code] == expected, game
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+@pytest.mark.parametrize("threshold", [0, 30, 120])
+def test_classify_library_without_numpy(monkeypatch, seed, threshold):
+    monkeypatch.setattr(classifier, "np", None)
+    games = random_games(seed)
+    codes = classify_library(*columns(games), in_progress_threshold=threshold, now=NOW)
+    assert codes == expected_codes(games, threshold)
+
+
+def test_classify_library_requires_numpy_when_forced(monkeypatch):
+    monkeypatch.setattr(classifier, "np", None)
+    with pytest.raises(RuntimeError):
+        classify_library([], [], [], [], [], [], [], now=NOW, use_numpy=True)
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+@pytest.mark.parametrize("threshold", [0, 30, 120])
+def test_classify_library_with_numpy(seed, threshold):
+    np = pytest.importorskip("numpy")
+    games = random_games(seed)
+    expected = expected_codes(games, threshold)
+
+    # Python lists with None values, forced through NumPy
+    codes = classify_library(*columns(games), in_progress_threshold=threshold, now=NOW, use_numpy=True)
+    assert codes == expected
+
+    # Arrays pick the NumPy path on their own
+    arrays = [np.asarray(column, dtype=np.float64) for column in columns(games)[:5]]
+    flags = [np.asarray(column, dtype=bool) for column in columns(games)[5:]]
+    codes = classify_library(*arrays, *flags, in_progress_threshold=threshold, now=NOW)
+    assert codes == expected
+
+
+def test_classify_library_empty():
+    assert classify_library([], [], [], [], [], [], [], now=NOW) == []
@@ -0,0 +1,223 @@
+"""
+Database batch API tests
+Bulk reads and writes must give the same results as the per-row calls,
+including across the SQL_IN_CHUNK_SIZE boundary of IN (...) lists
+"""
+
+import asyncio
+import time
+
+import pytest
+
+import database
+from database import Database, SQL_IN_CHUNK_SIZE
+
+# Crosses two chunk boundaries, with a partial last chunk
+GAME_COUNT = 2 * SQL_IN_CHUNK_SIZE + 7
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def as_dict(record):
+    return record.to_dict() if record is not None else None
+
+
+def as_dicts(records):
+    return {appid: record.to_dict() for appid, record in records.items()}
+
+
+def stats_row(index):
+    return {
+        "appid": str(100 + index),
+        "game_name": f"Game {index}",
+        "playtime_minutes": index * 3,
+        "total_achievements": index % 40,
+        "unlocked_achievements": index % 7,
+        "is_hidden": index % 13 == 0,
+        "rt_last_time_played": 1_700_000_000 + index,
+    }
+
+
+def hltb_data(index):
+    return {
+        "game_name": f"Game {index}",
+        "matched_name": f"Game {index}",
+        "similarity": 1.0,
+        "main_story": round(1 + index / 10, 1),
+        "main_extra": None,
+        "completionist": None,
+        "all_styles": None,
+        "hltb_url": f"https://howlongtobeat.com/game/{index}",
+    }
+
+
+async def open_db(path):
+    db = Database(str(path))
+    await db.init_database()
+    return db
+
+
+def test_apply_sync_batch_across_chunks(tmp_path):
+    async def scenario():
+        db = await open_db(tmp_path / "batch.db")
+        try:
+            rows = [stats_row(i) for i in range(GAME_COUNT)]
+            hltb_rows = [(row["appid"], hltb_data(i)) for i, row in enumerate(rows) if i % 2 == 0]
+            miss_rows = [(row["appid"], row["game_name"]) for i, row in enumerate(rows) if i % 2 == 1]
+            tag_rows = [{"appid": row["appid"], "tag": "in_progress"} for row in rows[::3]]
+            assert await db.apply_sync_batch(rows, hltb_rows, tag_rows, miss_rows)
+
+            appids = [row["appid"] for row in rows] + ["missing"]
+            stats = await db.get_stats_many(appids)
+            hltb = await db.get_hltb_cache_many(appids)
+            tags = await db.get_tags_many(appids)
+            snapshot = await db.get_sync_snapshot(appids)
+
+            assert len(stats) == GAME_COUNT
+            assert len(hltb) == len(hltb_rows)
+            assert len(tags) == len(tag_rows)
+            assert snapshot["stats"].keys() == stats.keys()
+            assert snapshot["hltb"].keys() == hltb.keys()
+            assert snapshot["hltb_misses"] == {appid for appid, _ in miss_rows}
+
+            # Spot-check rows from every chunk against the single-row reads
+            for appid in appids[::SQL_IN_CHUNK_SIZE // 5]:
+                assert as_dict(stats.get(appid)) == as_dict(await db.get_game_stats(appid))
+                assert as_dict(hltb.get(appid)) == as_dict(await db.get_hltb_cache(appid))
+                assert as_dict(tags.get(appid)) == as_dict(await db.get_tag(appid))
+        finally:
+            await db.close()
+
+    run(scenario())
+
+
+def test_bulk_reads_issue_one_statement_per_chunk(tmp_path, monkeypatch):
+    statements = []
+    real_select_in = database._select_in
+
+    def counting_select_in(cursor, sql, appids):
+        statements.extend(database._chunked(appids))
+        return real_select_in(cursor, sql, appids)
+
+    monkeypatch.setattr(database, "_select_in", counting_select_in)
+
+    async def scenario():
+        db = await open_db(tmp_path / "chunks.db")
+        try:
+            rows = [stats_row(i) for i in range(GAME_COUNT)]
+            assert await db.upsert_stats_many(rows)
+            stats = await db.get_stats_many([row["appid"] for row in rows])
+            assert len(stats) == GAME_COUNT
+        finally:
+            await db.close()
+
+    run(scenario())
+    assert [len(chunk) for chunk in statements] == [SQL_IN_CHUNK_SIZE, SQL_IN_CHUNK_SIZE, 7]
+
+
+def test_set_tags_many_updates_cache_and_table(tmp_path):
+    async def scenario():
+        db = await open_db(tmp_path / "tags.db")
+        try:
+            await db.load_tag_cache()
+            tag_rows = [{"appid": str(i), "tag": "completed", "is_manual": i % 2 == 0}
+                        for i in range(SQL_IN_CHUNK_SIZE + 1)]
+            assert await db.set_tags_many(tag_rows)
+
+            cached = await db.get_tags_many([row["appid"] for row in tag_rows])
+            stored = await db.connections.read(db._get_tags_many_sync, [row["appid"] for row in tag_rows])
+            assert as_dicts(cached) == as_dicts(stored)
+            assert all(record.is_manual == (int(appid) % 2 == 0) for appid, record in stored.items())
+        finally:
+            await db.close()
+
+    run(scenario())
+
+
+@pytest.mark.parametrize("count", [0, 1])
+def test_bulk_apis_accept_small_inputs(tmp_path, count):
+    async def scenario():
+        db = await open_db(tmp_path / "small.db")
+        try:
+            rows = [stats_row(i) for i in range(count)]
+            assert await db.apply_sync_batch(rows, [], [])
+            assert len(await db.get_stats_many([row["appid"] for row in rows])) == count
+        finally:
+            await db.close()
+
+    run(scenario())
+
+
+def test_tag_dropped_games(tmp_path):
+    now = int(time.time())
+    old, recent = now - 400 * 86400, now - 30 * 86400
+    # appid -> (is_hidden, rt_last_time_played, tag, is_manual, dropped)
+    cases = {
+        "1": (0, old, None, False, True),
+        "2": (None, old, None, False, True),         # NULL is_hidden counts as visible
+        "3": (0, old, "in_progress", False, True),
+        "4": (1, old, None, False, False),
+        "5": (0, recent, None, False, False),
+        "6": (0, 0, None, False, False),
+        "7": (0, None, None, False, False),
+        "8": (0, old, "in_progress", True, False),
+        "9": (0, old, "completed", False, False),
+    }
+
+    async def scenario():
+        db = await open_db(tmp_path / "dropped.db")
+        try:
+            await db.load_tag_cache()
+            assert await db.upsert_stats_many([
+                {"appid": appid, "game_name": f"Game {appid}", "is_hidden": bool(hidden),
+                 "rt_last_time_played": last_played}
+                for appid, (hidden, last_played, _, _, _) in cases.items()])
+            assert await db.set_tags_many([
+                {"appid": appid, "tag": tag, "is_manual": manual}
+                for appid, (_, _, tag, manual, _) in cases.items() if tag])
+            await db.connections.write(lambda conn: (
+                conn.execute("UPDATE game_stats SET is_hidden = NULL WHERE appid = '2'"), conn.commit()))
+
+            plan = await db.connections.read(lambda conn: " ".join(
+                row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + database.SELECT_DROPPED_CANDIDATES_SQL, (now,))))
+            assert "idx_stats_visible_last_played" in plan
+
+            dropped = await db.tag_dropped_games(365)
+            assert sorted(dropped) == [appid for appid, case in cases.items() if case[4]]
+            for appid, (_, _, tag, _, is_dropped) in cases.items():
+                cached, stored = await db.get_tag(appid), await db.connections.read(db._get_tag_sync, appid)
+                assert as_dict(cached) == as_dict(stored)
+                assert (stored.tag if stored else None) == ("dropped" if is_dropped else tag)
+
+            # The planner picks the index; without it the check still runs
+            await db.connections.write(lambda conn: conn.execute("DROP INDEX idx_stats_visible_last_played"))
+            assert await db.tag_dropped_games(365) == []
+        finally:
+            await db.close()
+
+    run(scenario())
+
+
+def test_old_last_played_index_is_replaced(tmp_path):
+    path = tmp_path / "migrate.db"
+
+    async def scenario():
+        db = await open_db(path)
+        await db.connections.write(lambda conn: (
+            conn.execute("DROP INDEX idx_stats_visible_last_played"),
+            conn.execute("CREATE INDEX idx_stats_last_played ON game_stats(rt_last_time_played) WHERE is_hidden = 0"),
+            conn.commit()))
+        await db.close()
+
+        db = await open_db(path)
+        try:
+            indexes = await db.connections.read(lambda conn: {
+                row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")})
+            assert "idx_stats_visible_last_played" in indexes
+            assert "idx_stats_last_played" not in indexes
+        finally:
+            await db.close()
+
+    run(scenario())
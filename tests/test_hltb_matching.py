@@ -0,0 +1,110 @@
+"""
+HLTB matching tests
+best_match prunes candidates with exact-match shortcuts and SequenceMatcher
+upper bounds; it must pick the same candidate as scoring every candidate
+with title_similarity and the release year adjustment
+"""
+
+import random
+
+import pytest
+
+from hltb_matching import (
+    best_match, normalize_title, sanitize_game_name, title_similarity, YEAR_MATCH_BONUS
+)
+
+SEEDS = range(10)
+WORDS = ("half life portal dark souls legend hero quest war star age empire dragon "
+         "night city space tale lost kingdom shadow rise fall doom").split()
+SUFFIXES = ("", " 2", " II", ": Remastered", " - Definitive Edition", " GOTY", " (2016)", " (1993)", "™")
+YEARS = (None, 1993, 2004, 2016)
+
+
+def full_scan(game_name, candidates, min_similarity):
+    """Reference: score every candidate, no pruning"""
+    year = normalize_title(game_name)[2]
+    best, best_similarity, best_score = None, 0.0, -1.0
+    for candidate in candidates:
+        title = candidate.get("game_name") or ""
+        if not normalize_title(title)[1]:
+            continue
+        similarity = title_similarity(game_name, title)
+        if similarity < min_similarity:
+            continue
+        score = similarity
+        if year is not None and candidate.get("release_world"):
+            score += YEAR_MATCH_BONUS if candidate["release_world"] == year else -YEAR_MATCH_BONUS
+        if score > best_score:
+            best, best_similarity, best_score = candidate, similarity, score
+    return best, best_similarity
+
+
+def random_title(rng):
+    title = " ".join(rng.sample(WORDS, rng.randint(1, 4)))
+    if rng.random() < 0.2:
+        title = title.replace(" ", "", 1)          # "Halflife", "Starwar"
+    title = rng.choice([title, title.title(), title.upper()])
+    return title + rng.choice(SUFFIXES)
+
+
+def random_candidates(rng, game_name):
+    candidates = [{"game_name": random_title(rng), "release_world": rng.choice(YEARS)}
+                  for _ in range(rng.randint(0, 30))]
+    if candidates and rng.random() < 0.5:
+        # Near-duplicates of the query compete on similarity and year
+        base = normalize_title(game_name)[1]
+        for variant in (base, base + " 2", base[:-1], base.replace(" ", "")):
+            candidates.insert(rng.randrange(len(candidates) + 1),
+                              {"game_name": variant, "release_world": rng.choice(YEARS)})
+    return candidates
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+@pytest.mark.parametrize("min_similarity", [0.5, 0.7, 0.9])
+def test_best_match_equals_full_scan(seed, min_similarity):
+    rng = random.Random(seed)
+    for _ in range(100):
+        game_name = random_title(rng)
+        candidates = random_candidates(rng, game_name)
+        expected, expected_similarity = full_scan(game_name, candidates, min_similarity)
+        match, similarity = best_match(game_name, candidates, min_similarity)
+        assert match is expected, (game_name, candidates)
+        if match is not None:
+            assert similarity == expected_similarity
+
+
+@pytest.mark.parametrize("game_name, candidates, expected", [
+    ("The Witcher® 3: Wild Hunt - Game of the Year Edition",
+     ["The Witcher 3: Wild Hunt - Blood and Wine", "The Witcher 3: Wild Hunt", "The Witcher 2"],
+     "The Witcher 3: Wild Hunt"),
+    ("Portal2", ["Portal", "Portal 2"], "Portal 2"),
+    ("Half-Life 2: Episode Two",
+     ["Half-Life 2", "Half-Life 2: Episode One", "Half-Life 2: Episode Two"],
+     "Half-Life 2: Episode Two"),
+    ("Completely Different", ["Portal", "Doom"], None),
+])
+def test_known_titles(game_name, candidates, expected):
+    match, _ = best_match(game_name, [{"game_name": title} for title in candidates], 0.7)
+    assert (match or {}).get("game_name") == expected
+
+
+def test_release_year_breaks_ties():
+    candidates = [{"game_name": "DOOM", "release_world": 1993, "game_id": 1},
+                  {"game_name": "DOOM", "release_world": 2016, "game_id": 2}]
+    assert best_match("DOOM (2016)", candidates, 0.7)[0]["game_id"] == 2
+    assert best_match("DOOM (1993)", candidates, 0.7)[0]["game_id"] == 1
+    # Without a year the first of equal candidates wins
+    assert best_match("DOOM", candidates, 0.7)[0]["game_id"] == 1
+
+
+def test_year_bonus_never_lifts_a_candidate_over_the_threshold():
+    candidates = [{"game_name": "Star Quest Legends", "release_world": 2016},
+                  {"game_name": "Star Quest", "release_world": 1993}]
+    match, similarity = best_match("Star Quest (2016)", candidates, 0.95)
+    assert match["game_name"] == "Star Quest" and similarity == 1.0
+
+
+def test_sanitize_game_name():
+    assert sanitize_game_name("Brothers - A Tale of Two Sons") == "Brothers A Tale of Two Sons"
+    assert sanitize_game_name("DOOM (2016)") == "DOOM"
+    assert sanitize_game_name("Hades™") == "Hades"
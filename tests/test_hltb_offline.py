@@ -0,0 +1,191 @@
+"""
+Offline HLTB dump tests
+The streaming readers for CSV, JSON array and JSON lines dumps, the FTS5
+search behind HLTBService.offline_lookup, and imports replacing the index
+only once they are complete
+"""
+
+import asyncio
+import csv
+import json
+
+import pytest
+
+import hltb_offline
+from database import Database
+from hltb_offline import iter_dump_batches, iter_dump_records
+
+RAW = [
+    {"game_id": 1, "name": "Half-Life 2", "comp_main": 46800, "comp_plus": "", "comp_100": 72000,
+     "comp_all": 50400, "release_world": 2004},
+    {"game_id": "2", "name": "Portal 2", "comp_main": "30600.0", "comp_plus": 0, "comp_100": None,
+     "comp_all": 32400, "release_world": ""},
+    {"game_id": "", "name": "No Id"},
+    {"game_id": 4, "name": ""},
+    {"game_id": 5, "game_name": " Pokémon Legends ", "comp_main": "abc"},
+]
+EXPECTED = [
+    {"game_id": 1, "game_name": "Half-Life 2", "comp_main": 46800.0, "comp_plus": None,
+     "comp_100": 72000.0, "comp_all": 50400.0, "release_world": 2004},
+    {"game_id": 2, "game_name": "Portal 2", "comp_main": 30600.0, "comp_plus": None,
+     "comp_100": None, "comp_all": 32400.0, "release_world": None},
+    {"game_id": 5, "game_name": "Pokémon Legends", "comp_main": None, "comp_plus": None,
+     "comp_100": None, "comp_all": None, "release_world": None},
+]
+
+
+def write_csv(path, rows):
+    fields = ["game_id", "name", "game_name", "comp_main", "comp_plus", "comp_100", "comp_all", "release_world"]
+    with open(path, "w", encoding="utf-8", newline="") as handle:
+        writer = csv.DictWriter(handle, fields)
+        writer.writeheader()
+        for row in rows:
+            writer.writerow({key: "" if value is None else value for key, value in row.items()})
+
+
+def test_csv_dump(tmp_path):
+    path = tmp_path / "dump.csv"
+    write_csv(path, RAW)
+    assert list(iter_dump_records(str(path))) == EXPECTED
+
+
+def test_json_lines_dump(tmp_path):
+    path = tmp_path / "dump.jsonl"
+    path.write_text("\n".join(json.dumps(row) for row in RAW) + "\n\n", encoding="utf-8")
+    assert list(iter_dump_records(str(path))) == EXPECTED
+
+
+def test_json_array_dump(tmp_path):
+    path = tmp_path / "dump.json"
+    path.write_text("  \n" + json.dumps(RAW, indent=2), encoding="utf-8")
+    assert list(iter_dump_records(str(path))) == EXPECTED
+
+
+def test_json_array_across_read_chunks(tmp_path):
+    # Objects straddle the 64 KB read boundaries, and one is bigger than a chunk
+    rows = [{"game_id": i, "name": f"Game {i} " + "x" * (i % 300), "comp_main": i * 60} for i in range(1, 3000)]
+    rows.insert(1500, {"game_id": 9999, "name": "Huge " + "y" * (3 * hltb_offline._READ_CHUNK)})
+    path = tmp_path / "dump.json"
+    path.write_text(json.dumps(rows), encoding="utf-8")
+    assert path.stat().st_size > 5 * hltb_offline._READ_CHUNK
+
+    records = list(iter_dump_records(str(path)))
+    assert [record["game_id"] for record in records] == [row["game_id"] for row in rows]
+    assert records[1500]["game_name"] == rows[1500]["name"]
+    assert records[-1]["comp_main"] == 2999 * 60.0
+
+
+def test_empty_and_invalid_json_arrays(tmp_path):
+    empty = tmp_path / "empty.json"
+    empty.write_text("[ ]", encoding="utf-8")
+    assert list(iter_dump_records(str(empty))) == []
+
+    truncated = tmp_path / "truncated.json"
+    truncated.write_text(json.dumps(RAW)[:-20], encoding="utf-8")
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_dump_records(str(truncated)))
+
+
+def test_batches(tmp_path):
+    path = tmp_path / "dump.jsonl"
+    path.write_text("\n".join(json.dumps({"game_id": i, "name": f"Game {i}"}) for i in range(1, 8)),
+                    encoding="utf-8")
+    assert [len(batch) for batch in iter_dump_batches(str(path), batch_size=3)] == [3, 3, 1]
+
+
+def entries(*names):
+    return [{"game_id": index, "game_name": name, "comp_main": 3600.0, "comp_plus": None,
+             "comp_100": None, "comp_all": None, "release_world": None}
+            for index, name in enumerate(names, start=1)]
+
+
+async def open_database(path):
+    db = Database(str(path))
+    await db.init_database()
+    if not db.capabilities.get("fts5"):
+        await db.close()
+        pytest.skip("SQLite FTS5 is not available")
+    return db
+
+
+async def import_entries(db, *batches):
+    assert await db.begin_hltb_offline_import()
+    for batch in batches:
+        assert await db.add_hltb_offline(batch)
+    assert await db.finish_hltb_offline_import()
+
+
+async def names(db, search_name):
+    return [entry["game_name"] for entry in await db.search_hltb_offline(search_name)]
+
+
+def test_search_prefers_entries_with_every_word(tmp_path):
+    async def scenario():
+        db = await open_database(tmp_path / "search.db")
+        await import_entries(db, entries("Half-Life 2", "Half-Life: Alyx", "Portal 2", "Pokémon Legends: Arceus"))
+        try:
+            # Every word matches one entry, so entries sharing only "2" stay out
+            assert await names(db, "half life 2") == ["Half-Life 2"]
+            # No entry has every word: fall back to any shared word
+            assert sorted(await names(db, "portal 3 deluxe")) == ["Portal 2"]
+            assert sorted(await names(db, "half life 3")) == ["Half-Life 2", "Half-Life: Alyx"]
+            # Diacritics are folded and duplicate words dropped
+            assert await names(db, "pokemon pokemon arceus") == ["Pokémon Legends: Arceus"]
+            # FTS5 syntax is searched as plain words ("or" and "near" match nothing)
+            assert sorted(await names(db, 'portal "2" OR NEAR')) == ["Half-Life 2", "Portal 2"]
+            assert await names(db, "unknown") == []
+            assert await names(db, "   ") == []
+            result = (await db.search_hltb_offline("portal 2"))[0]
+            assert result == {"game_name": "Portal 2", "game_id": 3, "comp_main": 3600.0, "comp_plus": None,
+                              "comp_100": None, "comp_all": None, "release_world": None}
+        finally:
+            await db.close()
+
+    asyncio.run(scenario())
+
+
+def test_import_replaces_index_only_when_complete(tmp_path):
+    async def scenario():
+        db = await open_database(tmp_path / "import.db")
+        try:
+            await import_entries(db, entries("Old Game"))
+
+            # Staged batches stay invisible until the import finishes
+            assert await db.begin_hltb_offline_import()
+            assert await db.add_hltb_offline(entries("New Game"))
+            assert await names(db, "game") == ["Old Game"]
+            assert await db.finish_hltb_offline_import()
+            assert await names(db, "game") == ["New Game"]
+
+            # A failed batch is discarded and the current index kept
+            assert await db.begin_hltb_offline_import()
+            assert await db.add_hltb_offline(entries("Partial Game"))
+            assert not await db.add_hltb_offline([{"game_id": 1, "game_name": ["not", "bindable"]}])
+            assert await db.discard_hltb_offline_import()
+            assert await names(db, "game") == ["New Game"]
+            assert not await db.finish_hltb_offline_import()
+            assert await names(db, "game") == ["New Game"]
+        finally:
+            await db.close()
+
+    asyncio.run(scenario())
+
+
+def test_unfinished_import_is_dropped_on_startup(tmp_path):
+    async def scenario():
+        db = await open_database(tmp_path / "crash.db")
+        await import_entries(db, entries("Kept Game"))
+        assert await db.begin_hltb_offline_import()
+        assert await db.add_hltb_offline(entries("Staged Game"))
+        await db.close()
+
+        db = await open_database(tmp_path / "crash.db")
+        try:
+            assert await names(db, "game") == ["Kept Game"]
+            tables = await db.connections.read(
+                lambda conn: [row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")])
+            assert "hltb_offline_import" not in tables
+        finally:
+            await db.close()
+
+    asyncio.run(scenario())
@@ -0,0 +1,213 @@
+"""
+HLTB pipeline tests
+TokenBucket and HLTBFetchPipeline run against a fake search coroutine and a
+fake clock; the sync engine's HLTB phase runs against a real Database
+"""
+
+import asyncio
+import time
+
+import pytest
+
+import hltb_pipeline
+from database import Database
+from hltb_pipeline import TokenBucket, HLTBFetchPipeline
+from sync_engine import LibrarySyncEngine
+
+
+class FakeClock:
+    """Stands in for time.monotonic and asyncio.sleep: sleeping advances the clock"""
+
+    def __init__(self):
+        self.now = 1000.0
+        self._yield = asyncio.sleep
+
+    def monotonic(self):
+        return self.now
+
+    async def sleep(self, delay):
+        self.now += max(delay, 0)
+        await self._yield(0)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(hltb_pipeline.time, "monotonic", clock.monotonic)
+    monkeypatch.setattr(hltb_pipeline.asyncio, "sleep", clock.sleep)
+    return clock
+
+
+class FakeSearch:
+    """search_game stand-in: takes a bucket token, then answers from a table"""
+
+    def __init__(self, bucket=None, fail=(), clock=None):
+        self.bucket = bucket
+        self.fail = set(fail)
+        self.clock = clock
+        self.started = []
+        self.active = 0
+        self.max_active = 0
+
+    async def search_game(self, name):
+        if self.bucket:
+            await self.bucket.acquire()
+        self.started.append(self.clock.now if self.clock else name)
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(0)
+            if name in self.fail:
+                raise RuntimeError(f"search failed for {name}")
+            if name.startswith("none"):
+                return None
+            return {"game_name": name, "main_story": 1.0}
+        finally:
+            self.active -= 1
+
+
+def test_token_bucket_bursts_then_holds_rate(clock):
+    bucket = TokenBucket(rate=2.0, capacity=5)
+    times = []
+
+    async def scenario():
+        for _ in range(25):
+            await bucket.acquire()
+            times.append(clock.now - 1000.0)
+
+    asyncio.run(scenario())
+    assert times[:5] == [0.0] * 5
+    # Then one token every 1 / rate seconds
+    assert times[-1] == pytest.approx((25 - 5) / 2.0)
+    for earlier, later in zip(times[5:], times[6:]):
+        assert later - earlier == pytest.approx(0.5)
+
+
+def test_token_bucket_refills_while_idle(clock):
+    bucket = TokenBucket(rate=1.0, capacity=3)
+
+    async def scenario():
+        for _ in range(3):
+            await bucket.acquire()
+        clock.now += 10         # Idle long enough to refill, but only up to capacity
+        start = clock.now
+        for _ in range(4):
+            await bucket.acquire()
+        return clock.now - start
+
+    assert asyncio.run(scenario()) == pytest.approx(1.0)
+
+
+def test_pipeline_respects_rate_limit_across_workers(clock):
+    bucket = TokenBucket(rate=4.0, capacity=2)
+    service = FakeSearch(bucket, clock=clock)
+    pipeline = HLTBFetchPipeline(service, workers=8)
+    results = []
+
+    async def on_result(appid, data):
+        results.append(appid)
+
+    jobs = [(str(i), f"game {i}") for i in range(30)]
+    counters = asyncio.run(pipeline.run(jobs, on_result))
+
+    assert counters == {"requests": 30, "errors": 0}
+    assert sorted(results, key=int) == [appid for appid, _ in jobs]
+    starts = [t - 1000.0 for t in service.started]
+    # However many workers, requests never outrun capacity + rate * elapsed
+    for count, started in enumerate(sorted(starts), start=1):
+        assert count <= 2 + 4.0 * started + 1e-9
+    assert max(starts) == pytest.approx((30 - 2) / 4.0)
+
+
+def test_pipeline_bounds_concurrency():
+    service = FakeSearch()
+    pipeline = HLTBFetchPipeline(service, workers=3)
+
+    async def on_result(appid, data):
+        await asyncio.sleep(0)
+
+    counters = asyncio.run(pipeline.run([(str(i), f"game {i}") for i in range(20)], on_result))
+    assert counters["requests"] == 20
+    assert service.max_active == 3
+
+
+def test_pipeline_counts_errors_without_calling_on_result():
+    service = FakeSearch(fail={"game 3", "game 7"})
+    pipeline = HLTBFetchPipeline(service, workers=4)
+    results = {}
+
+    async def on_result(appid, data):
+        if appid == "5":
+            raise ValueError("callback failed")
+        results[appid] = data
+
+    jobs = [(str(i), f"game {i}") for i in range(10)] + [("none", "none found")]
+    counters = asyncio.run(pipeline.run(jobs, on_result))
+
+    assert counters == {"requests": 11, "errors": 3}
+    assert "3" not in results and "7" not in results and "5" not in results
+    assert results["none"] is None                 # A no-match still reaches on_result
+    assert len(results) == 8
+
+
+def test_pipeline_with_no_jobs():
+    pipeline = HLTBFetchPipeline(FakeSearch(), workers=4)
+
+    async def on_result(appid, data):
+        raise AssertionError("no jobs, no results")
+
+    assert asyncio.run(pipeline.run([], on_result)) == {"requests": 0, "errors": 0}
+
+
+def test_sync_engine_refines_tags_every_batch(tmp_path):
+    games = 60
+    batch_size = 25
+    now = int(time.time())
+
+    async def scenario():
+        db = Database(str(tmp_path / "engine.db"))
+        await db.init_database()
+        await db.load_tag_cache()
+        batches = []
+        apply_sync_batch = db.apply_sync_batch
+
+        async def recording_apply(stats_rows, hltb_rows, tag_rows, miss_rows=()):
+            batches.append((len(stats_rows), len(hltb_rows), len(tag_rows), len(list(miss_rows))))
+            return await apply_sync_batch(stats_rows, hltb_rows, tag_rows, miss_rows)
+
+        db.apply_sync_batch = recording_apply
+
+        service = FakeSearch(fail={"Game 13"})
+
+        async def resolve_name(appid):
+            raise AssertionError("names are provided")
+
+        engine = LibrarySyncEngine(db, service, resolve_name, hltb_workers=4, refine_batch_size=batch_size)
+        entries = [{
+            "appid": str(500 + i),
+            "game_name": f"Game {i}" if i % 10 else f"none {i}",   # every tenth has no HLTB match
+            "playtime_minutes": 120,
+            "rt_last_time_played": now,
+            "total_achievements": 0,
+            "unlocked_achievements": 0,
+        } for i in range(games)]
+        result = await engine.run(entries)
+        tags = await db.get_tags_many([entry["appid"] for entry in entries])
+        await db.close()
+        return result, batches, tags
+
+    result, batches, tags = asyncio.run(scenario())
+
+    # One provisional write, then one write per refine_batch_size results
+    assert batches[0] == (games, 0, games, 0)
+    flushed = [hltb + misses for _, hltb, _, misses in batches[1:]]
+    assert flushed == [batch_size, batch_size, games - 1 - 2 * batch_size]
+    assert sum(hltb for _, hltb, _, _ in batches[1:]) == games - 6 - 1
+    assert sum(misses for _, _, _, misses in batches[1:]) == 6
+
+    assert result["errors"] == 1                       # The failed search, which got no miss
+    assert result["refined_tags"] == games - 6 - 1
+    completed = [appid for appid, record in tags.items() if record.tag == "completed"]
+    in_progress = [appid for appid, record in tags.items() if record.tag == "in_progress"]
+    assert len(completed) == games - 6 - 1             # 120 minutes >= 1 hour main story
+    assert len(in_progress) == 6 + 1
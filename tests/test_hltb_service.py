@@ -0,0 +1,127 @@
+"""
+HLTBService search tests
+Coalescing, the negative cache and failure handling of search_game, with
+the HTTP search replaced by a fake _search_sync
+"""
+
+import asyncio
+import gc
+import threading
+
+import pytest
+
+from hltb_service import HLTBService, HLTBSearchError, HLTBRetryableError
+
+
+def make_service(search_sync, **kwargs):
+    service = HLTBService(rate_limit=1000, burst=1000, backoff_base=0.001, **kwargs)
+    service._search_sync = search_sync
+    return service
+
+
+def result_for(name):
+    return {"game_name": name, "matched_name": name, "similarity": 1.0, "main_story": 5.0,
+            "main_extra": None, "completionist": None, "all_styles": None, "hltb_url": "x"}
+
+
+def test_concurrent_searches_share_one_request():
+    calls = []
+    release = threading.Event()
+
+    def search_sync(name):
+        calls.append(name)
+        release.wait(5)
+        return result_for(name)
+
+    service = make_service(search_sync)
+
+    async def scenario():
+        searches = [asyncio.ensure_future(service.search_game(name))
+                    for name in ("Portal 2", "Portal 2", "portal 2")]
+        await asyncio.sleep(0.05)
+        release.set()
+        return await asyncio.gather(*searches)
+
+    results = asyncio.run(scenario())
+    assert len(calls) == 1
+    assert [result["game_name"] for result in results] == ["Portal 2", "Portal 2", "portal 2"]
+    assert service._inflight == {}
+
+
+def test_no_match_is_negative_cached():
+    calls = []
+
+    def search_sync(name):
+        calls.append(name)
+        return None
+
+    service = make_service(search_sync)
+
+    async def scenario():
+        return [await service.search_game("Nothing Here") for _ in range(3)]
+
+    assert asyncio.run(scenario()) == [None, None, None]
+    assert len(calls) == 1
+
+
+def test_failure_raises_and_is_not_cached():
+    calls = []
+
+    def search_sync(name):
+        calls.append(name)
+        raise HLTBRetryableError("HTTP Error 503: Service Unavailable")
+
+    service = make_service(search_sync, max_retries=2)
+
+    async def scenario():
+        for _ in range(2):
+            with pytest.raises(HLTBSearchError):
+                await service.search_game("Flaky Game")
+
+    asyncio.run(scenario())
+    assert len(calls) == 2 * 3          # Retried each time, never negative cached
+    assert service._negative_cache == {}
+
+
+def test_unexpected_error_becomes_search_error():
+    def search_sync(name):
+        raise ValueError("bad JSON")
+
+    service = make_service(search_sync)
+
+    async def scenario():
+        with pytest.raises(HLTBSearchError):
+            await service.search_game("Broken Game")
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_caller_leaves_no_unretrieved_exception():
+    release = threading.Event()
+
+    def search_sync(name):
+        release.wait(5)
+        raise ValueError("failed after the caller left")
+
+    service = make_service(search_sync)
+    unhandled = []
+
+    async def scenario():
+        asyncio.get_running_loop().set_exception_handler(lambda loop, context: unhandled.append(context))
+        caller = asyncio.ensure_future(service.search_game("Lonely Game"))
+        await asyncio.sleep(0.05)
+        task = service._inflight[service._sanitize_game_name("Lonely Game").lower()]
+        caller.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await caller
+        release.set()
+        # Let the shared search finish with nobody awaiting it
+        await asyncio.wait([task])
+        del task, caller
+        gc.collect()
+        await asyncio.sleep(0)
+
+    asyncio.run(scenario())
+    gc.collect()
+    assert service._inflight == {}
+    assert unhandled == []
@@ -0,0 +1,153 @@
+"""
+ConnectionPool tests
+Runs the pool against a local threaded http.server that counts accepted
+connections
+"""
+
+import http.server
+import threading
+
+import pytest
+
+from http_pool import ConnectionPool, HTTPStatusError
+
+
+class CountingServer(http.server.ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), Handler)
+        self.accepted = 0
+        self.requests = 0
+        self.dropped = threading.Event()
+
+    def get_request(self):
+        request = super().get_request()
+        self.accepted += 1
+        return request
+
+
+class Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"   # keep-alive unless told otherwise
+    wbufsize = 64 * 1024            # one write per response (flushed after each request)
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self.server.requests += 1
+        if self.path.startswith("/status/"):
+            status = int(self.path.rsplit("/", 1)[1])
+            self._reply(status, b"error", {"Retry-After": "3"})
+        elif self.path == "/drop":
+            # Answer as keep-alive, then close the socket anyway, the way a
+            # server drops an idle connection
+            self._reply(200, b"dropped")
+            self.close_connection = True
+        else:
+            self._reply(200, f"ok {self.path}".encode())
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        self.server.requests += 1
+        self._reply(200, self.rfile.read(length))
+
+    def _reply(self, status, body, headers=None):
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def finish(self):
+        super().finish()
+        if self.close_connection:
+            self.server.dropped.set()
+
+
+@pytest.fixture
+def server():
+    server = CountingServer()
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def pool(server):
+    pool = ConnectionPool(f"http://127.0.0.1:{server.server_address[1]}", timeout=5)
+    yield pool
+    pool.close()
+
+
+def test_sequential_requests_reuse_one_connection(server, pool):
+    for index in range(20):
+        status, body = pool.request("GET", f"/item/{index}")
+        assert (status, body) == (200, f"ok /item/{index}".encode())
+
+    assert server.accepted == 1
+    assert pool.connections_opened == 1
+    assert pool.requests_sent == 20
+
+
+def test_post_body_round_trips(server, pool):
+    assert pool.request("POST", "/echo", body=b'{"a": 1}',
+                        headers={"Content-Type": "application/json"}) == (200, b'{"a": 1}')
+    assert pool.request("GET", "/after") == (200, b"ok /after")
+    assert server.accepted == 1
+
+
+def test_retries_once_after_stale_reused_connection(server, pool):
+    assert pool.request("GET", "/drop") == (200, b"dropped")
+    assert server.dropped.wait(5)
+
+    # The idle connection is dead; the pool retries on a fresh one
+    assert pool.request("GET", "/after-drop") == (200, b"ok /after-drop")
+    assert server.accepted == 2
+    assert pool.connections_opened == 2
+    assert server.requests == 2
+
+
+def test_non_2xx_raises_status_error(server, pool):
+    with pytest.raises(HTTPStatusError) as error:
+        pool.request("GET", "/status/429")
+    assert error.value.status == 429
+    assert error.value.retry_after == "3"
+
+    with pytest.raises(HTTPStatusError) as error:
+        pool.request("GET", "/status/503")
+    assert error.value.status == 503
+
+    # Error responses with a body keep the connection usable
+    assert pool.request("GET", "/fine") == (200, b"ok /fine")
+    assert server.accepted == 1
+
+
+def test_concurrent_requests_open_at_most_one_connection_each(server, pool):
+    results = []
+
+    def worker(index):
+        for request in range(10):
+            results.append(pool.request("GET", f"/w{index}/{request}")[0])
+
+    threads = [threading.Thread(target=worker, args=(index,)) for index in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == [200] * 40
+    assert server.accepted == pool.connections_opened <= 4
+
+
+def test_fresh_connection_failure_is_not_retried(server):
+    port = server.server_address[1]
+    server.shutdown()
+    server.server_close()
+    pool = ConnectionPool(f"http://127.0.0.1:{port}", timeout=1)
+    with pytest.raises(OSError):
+        pool.request("GET", "/")
+    assert pool.connections_opened == 1
@@ -0,0 +1,129 @@
+"""
+Record decoding tests
+TagRecord, StatsRecord and HLTBRecord must carry the same keys, values and
+types as the dicts Database returned before records replaced them
+"""
+
+import asyncio
+import sqlite3
+
+import pytest
+
+from database import Database
+from records import TagRecord, StatsRecord, HLTBRecord, has_hltb_times
+
+
+def old_tag_dict(row):
+    return {
+        "appid": row["appid"],
+        "tag": row["tag"],
+        "is_manual": bool(row["is_manual"]),
+        "last_updated": row["last_updated"]
+    }
+
+
+def old_stats_dict(row):
+    return {
+        "appid": row["appid"],
+        "game_name": row["game_name"],
+        "playtime_minutes": row["playtime_minutes"],
+        "total_achievements": row["total_achievements"],
+        "unlocked_achievements": row["unlocked_achievements"],
+        "is_hidden": bool(row["is_hidden"]),
+        "rt_last_time_played": row["rt_last_time_played"],
+        "last_sync": row["last_sync"]
+    }
+
+
+def old_hltb_dict(row):
+    return {
+        "appid": row["appid"],
+        "game_name": row["game_name"],
+        "matched_name": row["matched_name"],
+        "similarity": row["similarity_score"],
+        "main_story": row["main_story"],
+        "main_extra": row["main_extra"],
+        "completionist": row["completionist"],
+        "all_styles": row["all_styles"],
+        "hltb_url": row["hltb_url"]
+    }
+
+
+def assert_same_shape(record, old):
+    new = record.to_dict()
+    for key, value in old.items():
+        assert new[key] == value, key
+        assert type(new[key]) is type(value), key
+        assert record[key] == value and record.get(key) == value and key in record
+
+
+@pytest.fixture
+def populated_db(tmp_path):
+    path = tmp_path / "records.db"
+
+    async def populate():
+        db = Database(str(path))
+        await db.init_database()
+        await db.set_tag("10", "completed", is_manual=True)
+        await db.set_tag("11", "in_progress")
+        await db.update_game_stats("10", {"game_name": "Ten", "playtime_minutes": 600,
+                                          "total_achievements": 20, "unlocked_achievements": 3,
+                                          "is_hidden": True, "rt_last_time_played": 1_700_000_000})
+        await db.update_game_stats("11", {"game_name": "Eleven"})
+        await db.cache_hltb_data("10", {"game_name": "Ten", "matched_name": "Ten!", "similarity": 0.93,
+                                        "main_story": 9.5, "main_extra": None, "completionist": 40.0,
+                                        "all_styles": 12.0, "hltb_url": "https://howlongtobeat.com/game/10"})
+        await db.record_hltb_miss("11", "Eleven")
+        return db
+
+    db = asyncio.run(populate())
+    yield db, path
+    asyncio.run(db.close())
+
+
+def test_records_match_old_dicts(populated_db):
+    db, path = populated_db
+    raw = sqlite3.connect(path)
+    raw.row_factory = sqlite3.Row
+    try:
+        for appid in ("10", "11"):
+            tag = asyncio.run(db.get_tag(appid))
+            stats = asyncio.run(db.get_game_stats(appid))
+            hltb = asyncio.run(db.get_hltb_cache(appid))
+            assert_same_shape(tag, old_tag_dict(
+                raw.execute("SELECT * FROM game_tags WHERE appid = ?", (appid,)).fetchone()))
+            assert_same_shape(stats, old_stats_dict(
+                raw.execute("SELECT * FROM game_stats WHERE appid = ?", (appid,)).fetchone()))
+            if hltb is not None:
+                assert_same_shape(hltb, old_hltb_dict(
+                    raw.execute("SELECT * FROM hltb_cache WHERE appid = ?", (appid,)).fetchone()))
+    finally:
+        raw.close()
+
+
+def test_miss_entries_have_no_times(populated_db):
+    db, _ = populated_db
+    assert has_hltb_times(asyncio.run(db.get_hltb_cache("10")))
+    assert not has_hltb_times(asyncio.run(db.get_hltb_cache("11")))
+
+
+@pytest.mark.parametrize("record_class", [TagRecord, StatsRecord, HLTBRecord])
+def test_from_row_follows_columns(record_class):
+    columns = [name.strip() for name in record_class.COLUMNS.split(",")]
+    assert len(columns) == len(record_class.__slots__)
+    row = tuple(range(len(columns)))
+    record = record_class.from_row(row)
+    for position, name in enumerate(record_class.__slots__):
+        value = record[name]
+        assert value == (bool(row[position]) if isinstance(value, bool) else row[position])
+
+
+def test_record_dict_access():
+    record = TagRecord.from_row(("1", "mastered", 0, "2024-01-01 00:00:00"))
+    assert record.is_manual is False
+    assert record.get("missing", "default") == "default"
+    assert "missing" not in record
+    with pytest.raises(KeyError):
+        record["missing"]
+    assert record.to_dict() == {"appid": "1", "tag": "mastered", "is_manual": False,
+                                "last_updated": "2024-01-01 00:00:00"}
@@ -0,0 +1,135 @@
+"""
+JobScheduler tests
+Runs jobs against a real Database with a fake wall clock, across restarts
+of the scheduler
+"""
+
+import asyncio
+
+import pytest
+
+import scheduler
+from database import Database
+from scheduler import JobScheduler
+
+INTERVAL = 24 * 60 * 60
+RETRY_DELAY = 10 * 60
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_700_000_000.0
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(scheduler.time, "time", clock.time)
+    return clock
+
+
+class FlakyJob:
+    def __init__(self):
+        self.fail = True
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        if self.fail:
+            raise RuntimeError("HLTB unreachable")
+
+
+async def start_scheduler(db, job_fn, startup_delay=0):
+    jobs = JobScheduler(db)
+    jobs.register("refresh", job_fn, INTERVAL, startup_delay=startup_delay, jitter=0, retry_delay=RETRY_DELAY)
+    await jobs.start()
+    return jobs, jobs.jobs["refresh"]
+
+
+async def wait_for_run(job, run_count):
+    for _ in range(500):
+        if job.run_count >= run_count and job.task is None:
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError(f"{job.name} did not run")
+
+
+def test_failed_run_is_retried_after_retry_delay_across_restarts(tmp_path, clock):
+    async def scenario():
+        db = Database(str(tmp_path / "scheduler.db"))
+        await db.init_database()
+        job_fn = FlakyJob()
+        try:
+            # Never run before: due right away, then fails
+            jobs, job = await start_scheduler(db, job_fn)
+            await wait_for_run(job, 1)
+            failed_at = clock.now
+            assert job.last_error == "HLTB unreachable"
+            assert job.next_run == failed_at + RETRY_DELAY
+            await jobs.stop()
+
+            # Restarted a minute later: still the retry, not a day away
+            clock.now += 60
+            jobs, job = await start_scheduler(db, job_fn)
+            assert (job.last_run, job.failure_count) == (int(failed_at), 1)
+            assert job.next_run == int(failed_at) + RETRY_DELAY
+            await jobs.stop()
+
+            # startup_delay still applies on top
+            jobs, job = await start_scheduler(db, job_fn, startup_delay=RETRY_DELAY)
+            assert job.next_run == clock.now + RETRY_DELAY
+            await jobs.stop()
+
+            # Restarted after the retry is due: the retry runs and succeeds
+            clock.now = failed_at + RETRY_DELAY + 5
+            job_fn.fail = False
+            jobs, job = await start_scheduler(db, job_fn)
+            await wait_for_run(job, 2)
+            succeeded_at = clock.now
+            assert job.last_error is None
+            assert job.next_run == succeeded_at + INTERVAL
+            await jobs.stop()
+
+            # After a success a restart waits the full interval again
+            clock.now += 60
+            jobs, job = await start_scheduler(db, job_fn)
+            assert job.next_run == int(succeeded_at) + INTERVAL
+            await jobs.stop()
+
+            assert job_fn.calls == 2
+            assert (job.run_count, job.failure_count) == (2, 1)
+        finally:
+            await db.close()
+
+    asyncio.run(scenario())
+
+
+def test_failed_run_reschedules_without_restart(tmp_path, clock):
+    async def scenario():
+        db = Database(str(tmp_path / "scheduler.db"))
+        await db.init_database()
+        job_fn = FlakyJob()
+        jobs, job = await start_scheduler(db, job_fn)
+        try:
+            await wait_for_run(job, 1)
+            assert job.next_run == clock.now + RETRY_DELAY
+
+            # Nothing runs before the retry is due
+            clock.now += RETRY_DELAY - 1
+            jobs._wake.set()
+            await asyncio.sleep(0.05)
+            assert job_fn.calls == 1
+
+            clock.now += 1
+            job_fn.fail = False
+            jobs._wake.set()
+            await wait_for_run(job, 2)
+            assert job.next_run == clock.now + INTERVAL
+        finally:
+            await jobs.stop()
+            await db.close()
+
+    asyncio.run(scenario())
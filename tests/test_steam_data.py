@@ -0,0 +1,80 @@
+"""
+SteamDataService name index tests
+Runs against a fake Steam directory with appmanifest files
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+import steam_data
+from steam_data import SteamDataService
+
+
+def write_manifest(steamapps, appid, name):
+    (steamapps / f"appmanifest_{appid}.acf").write_text(
+        f'"AppState"\n{{\n\t"appid"\t\t"{appid}"\n\t"name"\t\t"{name}"\n}}\n', encoding="utf-8")
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch):
+    steamapps = tmp_path / "steamapps"
+    steamapps.mkdir()
+    for appid, name in ((10, "Counter-Strike"), (220, "Half-Life 2"), (400, "Portal")):
+        write_manifest(steamapps, appid, name)
+    monkeypatch.setattr(SteamDataService, "_find_steam_path", lambda self: tmp_path)
+    return SteamDataService()
+
+
+def test_concurrent_lookups_share_one_rebuild_off_the_loop(service, monkeypatch):
+    threads = []
+    read_manifest_names = service._read_manifest_names
+
+    def slow_read(path):
+        threads.append(threading.get_ident())
+        time.sleep(0.05)
+        return read_manifest_names(path)
+
+    monkeypatch.setattr(service, "_read_manifest_names", slow_read)
+
+    async def scenario():
+        return await asyncio.gather(*(service.get_game_name(appid) for appid in ("10", "220", "400", "999")))
+
+    assert asyncio.run(scenario()) == ["Counter-Strike", "Half-Life 2", "Portal", "Unknown Game (999)"]
+    assert len(threads) == 1
+    assert threads[0] != threading.get_ident()
+
+
+def test_index_rebuilds_when_manifests_change(service, tmp_path, monkeypatch):
+    async def scenario():
+        assert await service.get_game_name("620") == "Unknown Game (620)"
+        write_manifest(tmp_path / "steamapps", 620, "Portal 2")
+        # Within the recheck window the cached index is trusted
+        assert await service.get_game_name("620") == "Unknown Game (620)"
+        monkeypatch.setattr(steam_data, "NAME_INDEX_RECHECK", 0)
+        assert await service.get_game_name("620") == "Portal 2"
+
+    asyncio.run(scenario())
+
+
+def test_failed_rebuild_reaches_every_waiter_and_is_retried(service, monkeypatch):
+    failing = [True]
+    read_manifest_names = service._read_manifest_names
+
+    def flaky_read(path):
+        if failing:
+            raise OSError("disk went away")
+        return read_manifest_names(path)
+
+    monkeypatch.setattr(service, "_read_manifest_names", flaky_read)
+
+    async def scenario():
+        results = await asyncio.gather(service.get_game_name("10"), service.get_game_name("220"),
+                                       return_exceptions=True)
+        assert [type(result) for result in results] == [OSError, OSError]
+        failing.clear()
+        assert await service.get_game_name("10") == "Counter-Strike"
+
+    asyncio.run(scenario())
@@ -0,0 +1,129 @@
+"""
+Binary VDF fuzz tests
+Random documents written with a small binary VDF writer must parse back to
+the same value, and every truncation of them must raise ValueError
+"""
+
+import os
+import random
+import struct
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend", "src"))
+
+from vdf_parser import parse_binary_vdf
+
+MAP, STRING, INT32, WSTRING, UINT64, END = 0x00, 0x01, 0x02, 0x05, 0x07, 0x08
+
+SEEDS = range(50)
+ALPHABET = "abcXYZ 019_-.:/\\é漢🎮"
+
+
+class WString(str):
+    """A string the writer encodes as UTF-16 (type 0x05) instead of UTF-8"""
+
+
+def write_binary_vdf(document) -> bytes:
+    """Encode a dict of dicts, str, WString and int values as binary VDF"""
+    out = bytearray()
+
+    def write_map(mapping):
+        for key, value in mapping.items():
+            name = key.encode("utf-8") + b"\x00"
+            if isinstance(value, dict):
+                out.append(MAP)
+                out.extend(name)
+                write_map(value)
+            elif isinstance(value, WString):
+                out.append(WSTRING)
+                out.extend(name)
+                out.extend(value.encode("utf-16-le") + b"\x00\x00")
+            elif isinstance(value, str):
+                out.append(STRING)
+                out.extend(name)
+                out.extend(value.encode("utf-8") + b"\x00")
+            elif -2 ** 31 <= value < 2 ** 31:
+                out.append(INT32)
+                out.extend(name)
+                out.extend(struct.pack("<i", value))
+            else:
+                out.append(UINT64)
+                out.extend(name)
+                out.extend(struct.pack("<Q", value))
+        out.append(END)
+
+    write_map(document)
+    return bytes(out)
+
+
+def random_text(rng, max_length=12):
+    return "".join(rng.choice(ALPHABET) for _ in range(rng.randint(0, max_length)))
+
+
+def random_value(rng, depth):
+    choice = rng.random()
+    if choice < 0.2 and depth < 4:
+        return random_map(rng, depth + 1)
+    if choice < 0.45:
+        return random_text(rng)
+    if choice < 0.6:
+        return WString(random_text(rng))
+    if choice < 0.85:
+        return rng.randint(-2 ** 31, 2 ** 31 - 1)
+    return rng.randint(2 ** 31, 2 ** 64 - 1)
+
+
+def random_map(rng, depth=0):
+    mapping = {}
+    for _ in range(rng.randint(0, 5)):
+        mapping[random_text(rng) or "k"] = random_value(rng, depth)
+    return mapping
+
+
+def random_shortcuts(rng):
+    """A shortcuts.vdf-like document with the key casings Steam has used"""
+    entries = {}
+    for index in range(rng.randint(0, 6)):
+        appid = rng.randint(-2 ** 31, -1)
+        entries[str(index)] = {
+            rng.choice(["appid", "AppID", "appId"]): appid,
+            rng.choice(["AppName", "appname", "APPNAME"]): random_text(rng) or "Game",
+            "Exe": '"/usr/bin/' + random_text(rng) + '"',
+            "LastPlayTime": rng.randint(0, 2 ** 31 - 1),
+            "tags": {str(i): random_text(rng) for i in range(rng.randint(0, 3))},
+        }
+    return {"shortcuts": entries}
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_round_trip(seed):
+    rng = random.Random(seed)
+    for document in (random_map(rng), random_shortcuts(rng)):
+        assert parse_binary_vdf(write_binary_vdf(document)) == document
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_round_trip_from_bytearray(seed):
+    document = random_shortcuts(random.Random(seed))
+    assert parse_binary_vdf(bytearray(write_binary_vdf(document))) == document
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_truncation_raises(seed):
+    rng = random.Random(seed)
+    document = rng.choice([random_map, random_shortcuts])(rng)
+    data = write_binary_vdf(document)
+    for length in range(1, len(data)):
+        with pytest.raises(ValueError):
+            parse_binary_vdf(data[:length])
+
+
+def test_empty_input():
+    assert parse_binary_vdf(b"") == {}
+
+
+def test_unknown_type_raises():
+    with pytest.raises(ValueError):
+        parse_binary_vdf(b"\x09key\x00\x08")
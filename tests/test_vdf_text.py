@@ -0,0 +1,200 @@
+"""
+Text VDF tests
+parse_vdf_bytes on escapes, comments and conditionals; random documents
+parsed with a path filter must equal the unfiltered parse filtered
+afterwards, and skipped subtrees must end at the right brace
+"""
+
+import random
+import time
+
+import pytest
+
+from vdf_parser import parse_vdf_bytes, load_vdf, _skip_subtree
+
+SEEDS = range(30)
+KEYS = ["apps", "Apps", "APPS", "Playtime", "playtime", "LastPlayed", "name", "cloud", "420", "7",
+        "Software", "valve", "Steam", "key with space", "{brace}", "// not a comment", 'quo"te',
+        "back\\slash", "tab\there", "line\nbreak", "é漢", "[$WIN32]"]
+VALUES = ["", "0", "1234", "plain", "http://example.com/{x}", "} {", "// in a value", 'say "hi"',
+          "C:\\Games\\", "two\nlines", "a\tb", "漢字 🎮", "[$OSX]"]
+CONDITIONALS = ["[$WIN32]", "[!$OSX]", "[$WIN32||$LINUX]"]
+COMMENTS = ["// comment", "// } unbalanced { \" quote", "//", "// \"key\" \"value\""]
+BARE = set("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_.")
+
+
+def quote(text):
+    escaped = text.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n").replace("\t", "\\t")
+    return f'"{escaped}"'
+
+
+def token(rng, text):
+    """Quoted, or bare when the text allows it"""
+    if text and set(text) <= BARE and rng.random() < 0.3:
+        return text
+    return quote(text)
+
+
+def random_tree(rng, depth=0):
+    # Keys are unique per subtree: with duplicates the last entry wins, and a
+    # filter may keep an earlier subtree in place of a later plain value
+    keys = rng.sample(KEYS, rng.randint(0, 6))
+    return {key: random_tree(rng, depth + 1) if depth < 4 and rng.random() < 0.4 else rng.choice(VALUES)
+            for key in keys}
+
+
+def write_text_vdf(rng, tree, indent=0):
+    """Serialize with random whitespace, comments and conditionals"""
+    pad = "\t" * indent
+    out = []
+    for key, value in tree.items():
+        if rng.random() < 0.2:
+            out.append(f"{pad}{rng.choice(COMMENTS)}\n")
+        key_token = token(rng, key)
+        if isinstance(value, dict):
+            cond = f" {rng.choice(CONDITIONALS)}" if rng.random() < 0.2 else ""
+            brace_sep = rng.choice(["\n" + pad, " ", ""])
+            out.append(f"{pad}{key_token}{cond}{brace_sep}{{\n")
+            out.append(write_text_vdf(rng, value, indent + 1))
+            out.append(f"{pad}}}\n")
+        else:
+            sep = rng.choice(["\t\t", " ", "\n" + pad])
+            line = f"{pad}{key_token}{sep}{token(rng, value)}"
+            if rng.random() < 0.2:
+                line += f" {rng.choice(CONDITIONALS)}"
+            out.append(line + "\n")
+    return "".join(out)
+
+
+def reference_filter(tree, patterns):
+    """Apply path filter semantics to an already parsed tree"""
+    result = {}
+    for key, value in tree.items():
+        rest = [pattern[1:] for pattern in patterns
+                if pattern and (pattern[0] == "*" or pattern[0].lower() == key.lower())]
+        if any(not segments for segments in rest):
+            result[key] = value                     # A pattern ends here: keep it all
+        elif rest and isinstance(value, dict):
+            result[key] = reference_filter(value, rest)
+    return result
+
+
+def random_patterns(rng, tree):
+    """Patterns following real paths (with random case and * segments), plus misses"""
+    patterns = []
+    for _ in range(rng.randint(1, 3)):
+        node, segments = tree, []
+        while isinstance(node, dict) and node and rng.random() < 0.8:
+            key = rng.choice(list(node))
+            # A key containing / can only be matched by *
+            segments.append("*" if "/" in key else rng.choice(["*", key, key.upper(), key.lower()]))
+            node = node[key]
+        if rng.random() < 0.2:
+            segments.append(rng.choice(["missing", "*"]))
+        if segments:
+            patterns.append(segments)
+    return patterns or [["missing"]]
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_round_trip(seed):
+    rng = random.Random(seed)
+    for _ in range(20):
+        tree = random_tree(rng)
+        assert parse_vdf_bytes(write_text_vdf(rng, tree).encode("utf-8")) == tree
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_filtered_parse_equals_filtering_the_full_parse(seed):
+    rng = random.Random(seed)
+    for _ in range(20):
+        tree = {"Root": random_tree(rng)}
+        data = write_text_vdf(rng, tree).encode("utf-8")
+        full = parse_vdf_bytes(data)
+        for _ in range(5):
+            patterns = [["Root"] + segments for segments in random_patterns(rng, tree["Root"])]
+            path_filter = ["/".join(segments) for segments in patterns]
+            assert parse_vdf_bytes(data, path_filter) == reference_filter(full, patterns), path_filter
+
+
+def test_escapes_comments_and_conditionals():
+    data = rb'''
+    // Header comment with "quotes" and { braces
+    "UserLocalConfigStore"
+    {
+        "path"      "C:\\Program Files\\Steam"
+        "quote"     "say \"hi\"\tthen\nleave"
+        "unknown"   "keeps \q as is"
+        "windows"   "1"     [$WIN32]
+        "linux" [$LINUX] "2"
+        bare_key    bare_value
+        "cond" [!$OSX]
+        {
+            "inner"     "x" // trailing comment }
+        }
+    }
+    '''
+    assert parse_vdf_bytes(data) == {"UserLocalConfigStore": {
+        "path": "C:\\Program Files\\Steam",
+        "quote": 'say "hi"\tthen\nleave',
+        "unknown": "keeps \\q as is",
+        "windows": "1",
+        "linux": "2",
+        "bare_key": "bare_value",
+        "cond": {"inner": "x"},
+    }}
+
+
+def test_filter_segments_are_case_insensitive_and_support_wildcards():
+    data = b'''"UserLocalConfigStore" { "Software" { "Valve" { "Steam" { "apps" {
+        "10" { "Playtime" "5" "LastPlayed" "100" "cloud" { "quota" "1" } }
+        "20" { "playtime" "7" "name" "x" }
+    } "other" { "Playtime" "9" } } } } }'''
+    kept = parse_vdf_bytes(data, ["*/software/VALVE/steam/Apps/*/playtime", "*/*/*/*/apps/10/Cloud"])
+    assert kept == {"UserLocalConfigStore": {"Software": {"Valve": {"Steam": {"apps": {
+        "10": {"Playtime": "5", "cloud": {"quota": "1"}},
+        "20": {"playtime": "7"},
+    }}}}}}
+
+
+@pytest.mark.parametrize("body, after", [
+    (b'"a" "}" }', b' "next"'),
+    (b'"a" "{" "b" { "c" "}}" } }', b'"next"'),
+    (b'"a" "x" // } not the end\n "b" "y" }', b'"next"'),
+    (b'"url" "http://x/{y}" // {{{\n}', b'"next"'),
+    (b'"esc" "\\"}\\\\" "b" { } }', b'"next"'),
+    (b'"half" "a/b" "c" "d" }', b'"next"'),
+])
+def test_skip_subtree_ignores_braces_in_strings_and_comments(body, after):
+    data = b'"skipped" {' + body + after
+    start = data.index(b"{") + 1
+    assert _skip_subtree(data, start) == len(data) - len(after)
+    # And the filtered parse resumes right after it
+    assert parse_vdf_bytes(data + b' "x"', "next") == {"next": "x"}
+
+
+def test_skip_subtree_unterminated():
+    data = b'"skipped" { "a" { "b" "c" }'
+    assert _skip_subtree(data, data.index(b"{") + 1) == len(data)
+    assert parse_vdf_bytes(data, "other") == {}
+
+    # A truncated file is scanned once, not once per position (about 40 s)
+    data = b'"skipped" {' + b'"a" "b" / x / ' * 2000
+    start = time.perf_counter()
+    assert parse_vdf_bytes(data, "other") == {}
+    assert time.perf_counter() - start < 1
+
+
+def test_load_vdf(tmp_path):
+    empty = tmp_path / "empty.vdf"
+    empty.write_bytes(b"")
+    assert load_vdf(empty) == {}
+    assert load_vdf(empty, "a/*") == {}
+
+    path = tmp_path / "config.vdf"
+    path.write_bytes(b'"a" { "b" "1" "c" { "d" "2" } }')
+    assert load_vdf(path) == {"a": {"b": "1", "c": {"d": "2"}}}
+    assert load_vdf(path, "A/C") == {"a": {"c": {"d": "2"}}}
+
+    with pytest.raises(OSError):
+        load_vdf(tmp_path / "missing.vdf")